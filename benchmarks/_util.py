@@ -0,0 +1,75 @@
+"""Helpers shared by the benchmark scripts."""
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_service_module(service_dir: str, module: str = "service"):
+    """
+    Import ``app.<module>`` from a service directory.
+
+    Every service ships its code as a top-level ``app`` package, so a
+    benchmark process can only load one service at a time.
+
+    Args:
+        service_dir: Service path relative to the repository root
+        module: Module name inside the service's ``app`` package
+    """
+    path = str(ROOT / service_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+    return importlib.import_module(f"app.{module}")
+
+
+def unload_service_modules() -> None:
+    """
+    Forget the currently loaded service's ``app`` package.
+
+    Lets one benchmark process load another service afterwards; modules
+    already imported by the caller keep working.
+    """
+    for name in [n for n in sys.modules if n == "app" or n.startswith("app.")]:
+        module = sys.modules.pop(name)
+        service_dir = str(Path(module.__file__).resolve().parent.parent) if name == "app" else None
+        if service_dir in sys.path:
+            sys.path.remove(service_dir)
+
+
+async def measure(fn: Callable[[], Awaitable[object]], repeat: int) -> List[float]:
+    """Run ``fn`` ``repeat`` times and return per-run latencies in ms."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Reduce latency samples to p50/p95/p99/mean."""
+    ordered = sorted(samples)
+
+    def percentile(fraction: float) -> float:
+        return ordered[max(0, int(round(len(ordered) * fraction)) - 1)]
+
+    return {
+        "p50": statistics.median(ordered),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def print_table(headers: List[str], rows: List[List[object]]) -> None:
+    """Print rows as a fixed-width table."""
+    cells = [[str(c) for c in row] for row in [headers, *rows]]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for index, row in enumerate(cells):
+        print("  ".join(cell.rjust(widths[i]) for i, cell in enumerate(row)))
+        if index == 0:
+            print("  ".join("-" * w for w in widths))
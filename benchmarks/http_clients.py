@@ -0,0 +1,145 @@
+"""
+Benchmark outbound HTTP with a client per call against the pooled registry.
+
+Sends the same concurrent GET workload twice: once opening a fresh
+httpx.AsyncClient for every request (what resolvers and the orchestrator
+used to do) and once through a client from shared.http_clients. Reports
+latency percentiles and how many TCP connections each approach opened.
+
+Without --url a stub upstream is started on a thread of this process, with
+its own event loop so it does not compete with the clients; point --url at
+a running service (e.g. http://localhost:10002/telemetry/robot-001/latest)
+to include real handler time.
+
+Usage:
+    python -m benchmarks.http_clients [--url URL] [--requests 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import socket
+import threading
+import time
+from typing import Awaitable, Callable, List, Optional
+
+import httpx
+import uvicorn
+from prometheus_client import REGISTRY
+
+from benchmarks._util import print_table, summarize
+from shared.http_clients import http_clients
+
+STUB_BODY = b'{"robot_id":"robot-001","battery_level":87.5,"cpu_usage":41.2,' \
+    b'"temperature":36.9,"timestamp":"2024-01-01T00:00:00"}'
+
+
+async def stub_app(scope, receive, send):
+    """Minimal ASGI upstream answering every request with a small JSON body."""
+    if scope["type"] != "http":
+        return
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": STUB_BODY})
+
+
+async def start_stub() -> "tuple[uvicorn.Server, threading.Thread, str]":
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, thread, f"http://127.0.0.1:{port}/telemetry/robot-001/latest"
+
+
+async def run_load(
+    send: Callable[[], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> "tuple[List[float], float]":
+    """Issue ``requests`` calls from ``concurrency`` workers; returns (latencies ms, seconds)."""
+    samples: List[float] = []
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            response = await send()
+            response.raise_for_status()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - started
+
+
+def connections_opened() -> float:
+    value = REGISTRY.get_sample_value(
+        "http_client_connections_opened_total", {"upstream": "benchmark"}
+    )
+    return value or 0.0
+
+
+async def main(url: Optional[str], requests: int, concurrency: int) -> None:
+    stub = None
+    if url is None:
+        stub = await start_stub()
+        url = stub[2]
+    print(f"{requests} GETs of {url}, {concurrency} concurrent")
+
+    per_call_connections = 0
+
+    async def count_connects(event_name: str, info: dict) -> None:
+        nonlocal per_call_connections
+        if event_name == "connection.connect_tcp.complete":
+            per_call_connections += 1
+
+    async def per_call() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            return await client.get(url, extensions={"trace": count_connects})
+
+    client = http_clients.register("benchmark", url)
+
+    async def pooled() -> httpx.Response:
+        return await client.get("")
+
+    rows = []
+    try:
+        for label, send, opened in (
+            ("client per call", per_call, lambda: per_call_connections),
+            ("pooled registry", pooled, connections_opened),
+        ):
+            await run_load(send, min(requests, concurrency * 2), concurrency)  # warm up
+            before = opened()
+            samples, seconds = await run_load(send, requests, concurrency)
+            stats = summarize(samples)
+            rows.append([
+                label,
+                f"{requests / seconds:,.0f}",
+                f"{stats['p50']:.2f}",
+                f"{stats['p95']:.2f}",
+                f"{stats['p99']:.2f}",
+                f"{opened() - before:,.0f}",
+            ])
+    finally:
+        await http_clients.aclose()
+        if stub is not None:
+            stub[0].should_exit = True
+            await asyncio.to_thread(stub[1].join)
+
+    print_table(["client", "req/s", "p50 ms", "p95 ms", "p99 ms", "connections opened"], rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="Upstream URL; defaults to an in-process stub")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.requests, args.concurrency))
@@ -0,0 +1,92 @@
+"""
+Benchmark the hot lookups through SQLAlchemy vs raw asyncpg.
+
+Runs each single-row lookup (robot by id, latest telemetry from state and
+from history, first page of alerts by robot) through app.service with a
+fresh session per call, as a request would, and through app.pg_repository
+with its prepared statements, and reports per-call latency.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.repository [--calls 2000]
+"""
+import argparse
+import asyncio
+import random
+
+from sqlalchemy import select
+
+from benchmarks._util import (
+    load_service_module,
+    measure,
+    print_table,
+    summarize,
+    unload_service_modules,
+)
+from shared.db.database import async_session, engine
+from shared.db.models import Robot
+from shared.db.raw import close_raw_pool, get_raw_pool
+
+LOOKUPS = [
+    ("services/data/robot-service", "get_robot_by_id", ()),
+    ("services/data/telemetry-service", "get_latest_state", ()),
+    ("services/data/telemetry-service", "get_latest_telemetry", ()),
+    ("services/data/alert-service", "get_alerts_by_robot", (20,)),
+]
+
+
+async def run(calls: int) -> None:
+    async with async_session() as session:
+        robot_ids = list((await session.execute(select(Robot.id))).scalars())
+    if not robot_ids:
+        raise SystemExit("No robots found; seed the database first")
+    await get_raw_pool()
+
+    rows = []
+    loaded_dir = None
+    for service_dir, name, extra in LOOKUPS:
+        if service_dir != loaded_dir:
+            unload_service_modules()
+            service = load_service_module(service_dir)
+            repository = load_service_module(service_dir, "pg_repository")
+            loaded_dir = service_dir
+        orm_lookup = getattr(service, name)
+        raw_lookup = getattr(repository, name)
+        ids = iter(random.choices(robot_ids, k=calls * 2 + 2))
+
+        async def orm():
+            async with async_session() as session:
+                await orm_lookup(session, next(ids), *extra)
+
+        async def raw():
+            await raw_lookup(None, next(ids), *extra)
+
+        # Warm both paths so prepared statements and compiled caches exist
+        await orm()
+        await raw()
+        orm_stats = summarize(await measure(orm, calls))
+        raw_stats = summarize(await measure(raw, calls))
+        rows.append([
+            name,
+            f"{orm_stats['p50']:.3f}",
+            f"{orm_stats['p95']:.3f}",
+            f"{raw_stats['p50']:.3f}",
+            f"{raw_stats['p95']:.3f}",
+            f"{orm_stats['mean'] / raw_stats['mean']:.1f}x",
+        ])
+
+    print_table(
+        ["lookup", "sqlalchemy p50 ms", "p95 ms", "asyncpg p50 ms", "p95 ms", "speedup"], rows
+    )
+    await close_raw_pool()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.calls))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark per-row CPU cost of building and encoding list responses.
+
+For each list endpoint compares the previous path (ORM entities, a
+validating pydantic constructor, FastAPI's response_model re-validation
+and stdlib JSON) against the current one (projected rows, model_construct
+and a single orjson pass via FastJSONResponse). Both read the same rows
+from the database; process CPU time is reported per row, so time spent
+inside Postgres is excluded.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.serialization [--repeat 20] [--limit 1000]
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import TypeAdapter
+from sqlalchemy import desc, select
+
+from benchmarks._util import load_service_module, print_table, summarize, unload_service_modules
+from shared.db.database import async_session, engine
+from shared.db.models import Alert, Robot
+from shared.responses import FastJSONResponse
+from shared.schemas.alert import AlertResponse
+from shared.schemas.robot import RobotResponse
+from shared.schemas.telemetry import TelemetryResponse
+
+
+def _fastapi_encode(adapter: TypeAdapter, content) -> bytes:
+    # What FastAPI does with a returned value when response_model is set
+    validated = adapter.validate_python(content, from_attributes=True)
+    payload = adapter.dump_python(validated, mode="json")
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+async def measure_cpu(fn: Callable[[], Awaitable[int]], repeat: int) -> List[float]:
+    """Run ``fn`` ``repeat`` times and return process CPU microseconds per row."""
+    samples = []
+    for _ in range(repeat):
+        start = time.process_time()
+        rows = await fn()
+        samples.append((time.process_time() - start) * 1e6 / max(rows, 1))
+    return samples
+
+
+async def robots_before() -> int:
+    async with async_session() as session:
+        robots = (await session.execute(select(Robot).order_by(Robot.id))).scalars().all()
+        content = [
+            RobotResponse(
+                id=r.id, name=r.name, model=r.model, location=r.location, status=r.status
+            )
+            for r in robots
+        ]
+    _fastapi_encode(TypeAdapter(List[RobotResponse]), content)
+    return len(content)
+
+
+def build_cases(limit: int) -> Dict[str, Dict[str, Callable[[], Awaitable[int]]]]:
+    cases = {}
+
+    robot_service = load_service_module("services/data/robot-service")
+
+    async def robots_after() -> int:
+        async with async_session() as session:
+            content = await robot_service.get_all_robots(session)
+        FastJSONResponse(content)
+        return len(content)
+
+    cases["GET /robots"] = {"before": robots_before, "after": robots_after}
+    unload_service_modules()
+
+    telemetry_service = load_service_module("services/data/telemetry-service")
+    telemetry_adapter = TypeAdapter(Dict[str, Optional[TelemetryResponse]])
+
+    async def robot_ids() -> List[str]:
+        async with async_session() as session:
+            return list((await session.execute(select(Robot.id))).scalars())
+
+    async def telemetry_before() -> int:
+        ids = await robot_ids()
+        async with async_session() as session:
+            rows = await session.execute(
+                telemetry_service._latest_per_robot_stmt(), {"robot_ids": ids}
+            )
+            content = {
+                row.robot_id: TelemetryResponse(
+                    robot_id=row.robot_id,
+                    battery_level=row.battery_level,
+                    cpu_usage=row.cpu_usage,
+                    temperature=row.temperature,
+                    timestamp=row.timestamp,
+                )
+                for row in rows
+            }
+        _fastapi_encode(telemetry_adapter, content)
+        return len(content)
+
+    async def telemetry_after() -> int:
+        ids = await robot_ids()
+        async with async_session() as session:
+            content = await telemetry_service.get_batch_telemetry(session, ids)
+        FastJSONResponse(content)
+        return len(content)
+
+    cases["POST /telemetry/batch"] = {"before": telemetry_before, "after": telemetry_after}
+    unload_service_modules()
+
+    alert_service = load_service_module("services/data/alert-service")
+    alert_adapter = TypeAdapter(List[AlertResponse])
+
+    async def alerts_before() -> int:
+        async with async_session() as session:
+            stmt = (
+                select(Alert)
+                .where(Alert.severity == "critical")
+                .order_by(desc(Alert.created_at), desc(Alert.id))
+                .limit(limit)
+            )
+            alerts = (await session.execute(stmt)).scalars().all()
+            content = [
+                AlertResponse(
+                    id=a.id,
+                    robot_id=a.robot_id,
+                    severity=a.severity,
+                    message=a.message,
+                    created_at=a.created_at,
+                )
+                for a in alerts
+            ]
+        _fastapi_encode(alert_adapter, content)
+        return len(content)
+
+    async def alerts_after() -> int:
+        async with async_session() as session:
+            page = await alert_service.get_critical_alerts(session, limit)
+        FastJSONResponse(page.items)
+        return len(page.items)
+
+    cases["GET /alerts/critical"] = {"before": alerts_before, "after": alerts_after}
+    unload_service_modules()
+    return cases
+
+
+async def run(repeat: int, limit: int) -> None:
+    rows = []
+    for endpoint, paths in build_cases(limit).items():
+        rows_returned = await paths["after"]()
+        before = summarize(await measure_cpu(paths["before"], repeat))
+        after = summarize(await measure_cpu(paths["after"], repeat))
+        rows.append([
+            endpoint,
+            rows_returned,
+            f"{before['p50']:.1f}",
+            f"{after['p50']:.1f}",
+            f"{before['p50'] / after['p50']:.1f}x",
+        ])
+
+    print_table(["endpoint", "rows", "before us/row", "after us/row", "speedup"], rows)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=1000, help="Alert page size")
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark POST /telemetry/batch's DB path as the batch grows.
+
+Compares the per-robot loop (one get_latest_telemetry round trip per ID)
+against the set-based get_batch_telemetry query for 10 to 10k robots.
+IDs beyond the seeded fleet are padded with unknown robots, which still
+cost one index probe each.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.telemetry_batch [--repeat 5]
+"""
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from benchmarks._util import load_service_module, measure, print_table, summarize
+from shared.db.database import async_session, engine
+from shared.db.models import Robot
+
+SIZES = [10, 100, 1000, 10000]
+
+
+async def run(repeat: int, skip_loop_above: int) -> None:
+    service = load_service_module("services/data/telemetry-service")
+
+    async with async_session() as session:
+        known_ids = list((await session.execute(select(Robot.id))).scalars())
+
+    rows = []
+    for size in SIZES:
+        robot_ids = known_ids[:size] + [
+            f"bench-{i:05d}" for i in range(max(0, size - len(known_ids)))
+        ]
+
+        async def loop():
+            async with async_session() as session:
+                for robot_id in robot_ids:
+                    await service.get_latest_telemetry(session, robot_id)
+
+        async def batch():
+            async with async_session() as session:
+                await service.get_batch_telemetry(session, robot_ids)
+
+        batch_stats = summarize(await measure(batch, repeat))
+        if size <= skip_loop_above:
+            loop_stats = summarize(await measure(loop, repeat))
+            speedup = f"{loop_stats['p50'] / batch_stats['p50']:.1f}x"
+            loop_p50 = f"{loop_stats['p50']:.1f}"
+        else:
+            loop_p50, speedup = "-", "-"
+
+        rows.append([size, loop_p50, f"{batch_stats['p50']:.1f}", f"{batch_stats['p95']:.1f}", speedup])
+
+    print_table(["robots", "loop p50 ms", "batch p50 ms", "batch p95 ms", "speedup"], rows)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--skip-loop-above", type=int, default=10000,
+        help="Skip the per-robot loop for batches larger than this",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.repeat, args.skip_loop_above))
+
+
+if __name__ == "__main__":
+    main()
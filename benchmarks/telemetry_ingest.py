@@ -0,0 +1,111 @@
+"""
+Benchmark sustained throughput of POST /telemetry/ingest.
+
+Several concurrent senders post NDJSON batches for the seeded robots to a
+running telemetry-service for a fixed duration. Reports rows accepted
+per second, 429 rejections, and rows per second that actually reached
+telemetry_data once the ingest buffer has drained.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.telemetry_ingest \\
+        [--url http://localhost:10002] [--duration 10] [--concurrency 8] [--batch 1000]
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+from sqlalchemy import func, select, text
+
+from benchmarks._util import print_table
+from shared.db.database import async_session, engine
+from shared.db.models import Robot, TelemetryData
+
+
+def build_body(robot_ids: list[str], size: int) -> bytes:
+    lines = (
+        json.dumps({
+            "robot_id": random.choice(robot_ids),
+            "battery_level": round(random.uniform(10.0, 100.0), 1),
+            "cpu_usage": round(random.uniform(5.0, 95.0), 1),
+            "temperature": round(random.uniform(25.0, 75.0), 1),
+        })
+        for _ in range(size)
+    )
+    return "\n".join(lines).encode()
+
+
+async def count_rows() -> int:
+    async with async_session() as session:
+        # A full count of a seeded large profile outlasts DB_STATEMENT_TIMEOUT
+        await session.execute(text("SET LOCAL statement_timeout = 0"))
+        return (await session.execute(select(func.count(TelemetryData.id)))).scalar_one()
+
+
+async def run(url: str, duration: float, concurrency: int, batch: int) -> None:
+    async with async_session() as session:
+        robot_ids = list((await session.execute(select(Robot.id))).scalars())
+    bodies = [build_body(robot_ids, batch) for _ in range(16)]
+    rows_before = await count_rows()
+
+    accepted = 0
+    rejected = 0
+    deadline = time.perf_counter() + duration
+
+    async def sender(client: httpx.AsyncClient) -> None:
+        nonlocal accepted, rejected
+        while time.perf_counter() < deadline:
+            response = await client.post(
+                f"{url}/telemetry/ingest",
+                content=random.choice(bodies),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            if response.status_code == 202:
+                accepted += response.json()["accepted"]
+            elif response.status_code == 429:
+                rejected += batch
+                await asyncio.sleep(0.05)
+            else:
+                response.raise_for_status()
+
+    start = time.perf_counter()
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        await asyncio.gather(*(sender(client) for _ in range(concurrency)))
+    send_elapsed = time.perf_counter() - start
+
+    # Wait for the buffer to drain so written rows/s covers the whole run
+    written = 0
+    while written < accepted:
+        written = await count_rows() - rows_before
+        if time.perf_counter() - start > send_elapsed + 60:
+            break
+        await asyncio.sleep(0.2)
+    drain_elapsed = time.perf_counter() - start
+
+    print_table(
+        ["accepted rows", "rejected rows", "accepted rows/s", "written rows", "written rows/s"],
+        [[
+            accepted,
+            rejected,
+            f"{accepted / send_elapsed:.0f}",
+            written,
+            f"{written / drain_elapsed:.0f}",
+        ]],
+    )
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:10002")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.duration, args.concurrency, args.batch))
+
+
+if __name__ == "__main__":
+    main()
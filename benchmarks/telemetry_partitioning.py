@@ -0,0 +1,161 @@
+"""
+Benchmark latest-telemetry lookups on partitioned vs unpartitioned tables.
+
+Builds two scratch tables with identical synthetic data (10M rows by
+default), one plain and one range-partitioned by day, both indexed on
+(robot_id, timestamp desc). Times the latest-point lookup on each, then
+compares expiring the oldest day with DELETE against dropping its
+partition.
+
+Usage:
+    DATABASE_URL=... python -m benchmarks.telemetry_partitioning \\
+        [--rows 10000000] [--robots 1000] [--days 30] [--lookups 2000] [--keep]
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from benchmarks._util import print_table, summarize
+from shared.db.database import engine
+from shared.db.partitions import ensure_partitions, list_partitions, partition_start
+
+PLAIN = "bench_telemetry_plain"
+PARTITIONED = "bench_telemetry_part"
+
+COLUMNS = """
+    id BIGSERIAL,
+    robot_id VARCHAR(20) NOT NULL,
+    battery_level FLOAT NOT NULL,
+    cpu_usage FLOAT NOT NULL,
+    temperature FLOAT NOT NULL,
+    timestamp TIMESTAMP NOT NULL
+"""
+
+
+async def build(rows: int, robots: int, days: int) -> datetime:
+    end = partition_start(datetime.utcnow(), "daily") + timedelta(days=1)
+    start = end - timedelta(days=days)
+    points = rows // robots
+    step = (end - start).total_seconds() / points
+
+    async with engine.begin() as conn:
+        for table in (PLAIN, PARTITIONED):
+            await conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+        await conn.execute(text(f"CREATE TABLE {PLAIN} ({COLUMNS}, PRIMARY KEY (id))"))
+        await conn.execute(text(
+            f"CREATE TABLE {PARTITIONED} ({COLUMNS}, PRIMARY KEY (id, timestamp)) "
+            "PARTITION BY RANGE (timestamp)"
+        ))
+        await ensure_partitions(conn, start, end - timedelta(seconds=1), "daily", PARTITIONED)
+
+    began = time.perf_counter()
+    async with engine.begin() as conn:
+        # The load and index builds outlast DB_STATEMENT_TIMEOUT at the default size
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        await conn.execute(
+            text(
+                f"INSERT INTO {PLAIN} (robot_id, battery_level, cpu_usage, temperature, timestamp) "
+                "SELECT 'robot-' || lpad((g % CAST(:robots AS int))::text, 5, '0'), "
+                "random() * 90 + 10, random() * 90 + 5, random() * 50 + 25, "
+                "CAST(:end AS timestamp) - make_interval("
+                "secs => (g / CAST(:robots AS int) + 1) * CAST(:step AS float8)) "
+                "FROM generate_series(0, CAST(:rows AS int) - 1) AS g"
+            ),
+            {"robots": robots, "end": end, "step": step, "rows": points * robots},
+        )
+        await conn.execute(text(f"INSERT INTO {PARTITIONED} SELECT * FROM {PLAIN}"))
+        for table in (PLAIN, PARTITIONED):
+            await conn.execute(text(
+                f"CREATE INDEX {table}_robot_ts ON {table} (robot_id, timestamp DESC)"
+            ))
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        # VACUUM cannot run in a transaction, so lift the timeout for the session
+        await conn.execute(text("SET statement_timeout = 0"))
+        for table in (PLAIN, PARTITIONED):
+            await conn.execute(text(f"VACUUM ANALYZE {table}"))
+        await conn.execute(text("RESET statement_timeout"))
+    print(f"Loaded {points * robots} rows per table in {time.perf_counter() - began:.1f}s")
+    return start
+
+
+async def lookup_latencies(table: str, robots: int, lookups: int) -> list[float]:
+    stmt = text(
+        f"SELECT robot_id, battery_level, cpu_usage, temperature, timestamp FROM {table} "
+        "WHERE robot_id = :robot_id ORDER BY timestamp DESC LIMIT 1"
+    )
+    samples = []
+    async with engine.connect() as conn:
+        for _ in range(lookups):
+            robot_id = f"robot-{random.randrange(robots):05d}"
+            began = time.perf_counter()
+            (await conn.execute(stmt, {"robot_id": robot_id})).first()
+            samples.append((time.perf_counter() - began) * 1000)
+    return samples
+
+
+async def table_size(table: str) -> str:
+    async with engine.connect() as conn:
+        size = await conn.execute(text(
+            "SELECT pg_size_pretty(sum(pg_total_relation_size(relid))) "
+            "FROM pg_partition_tree(:table)"
+        ), {"table": table})
+        return size.scalar_one()
+
+
+async def expire_oldest_day(start: datetime) -> tuple[float, float]:
+    cutoff = start + timedelta(days=1)
+    async with engine.begin() as conn:
+        # Deleting a day of rows is the slow path being measured
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        began = time.perf_counter()
+        await conn.execute(text(f"DELETE FROM {PLAIN} WHERE timestamp < :cutoff"), {"cutoff": cutoff})
+        delete_ms = (time.perf_counter() - began) * 1000
+    async with engine.begin() as conn:
+        oldest, _ = (await list_partitions(conn, "daily", PARTITIONED))[0]
+        began = time.perf_counter()
+        await conn.execute(text(f'DROP TABLE "{oldest}"'))
+        drop_ms = (time.perf_counter() - began) * 1000
+    return delete_ms, drop_ms
+
+
+async def run(rows: int, robots: int, days: int, lookups: int, keep: bool) -> None:
+    start = await build(rows, robots, days)
+
+    results = []
+    for label, table in (("unpartitioned", PLAIN), ("partitioned (daily)", PARTITIONED)):
+        await lookup_latencies(table, robots, min(lookups, 200))  # warm caches
+        stats = summarize(await lookup_latencies(table, robots, lookups))
+        results.append([
+            label, await table_size(table),
+            f"{stats['p50']:.3f}", f"{stats['p95']:.3f}", f"{stats['mean']:.3f}",
+        ])
+    print_table(["layout", "size", "latest p50 ms", "latest p95 ms", "mean ms"], results)
+
+    delete_ms, drop_ms = await expire_oldest_day(start)
+    print(f"\nExpire oldest day: DELETE {delete_ms:.0f} ms vs DROP PARTITION {drop_ms:.1f} ms")
+
+    if not keep:
+        async with engine.begin() as conn:
+            for table in (PLAIN, PARTITIONED):
+                await conn.execute(text(f"DROP TABLE IF EXISTS {table} CASCADE"))
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--robots", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch tables")
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.robots, args.days, args.lookups, args.keep))
+
+
+if __name__ == "__main__":
+    main()
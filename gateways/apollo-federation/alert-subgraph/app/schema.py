@@ -1,12 +1,28 @@
+from datetime import datetime
 from typing import Any
 
 import httpx
 import strawberry
+from graphql import GraphQLError
 from strawberry.dataloader import DataLoader
 from strawberry.federation import Schema
 from strawberry.types import Info
 
-from .config import ALERT_SERVICE_URL
+from shared.http_clients import http_clients
+from shared.paging import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor
+from shared.resilience import mark_degraded
+
+
+def client_error(response: httpx.Response) -> GraphQLError:
+    """GraphQL error for a request the upstream rejected with a 4xx, carrying its detail."""
+    try:
+        detail = response.json().get("detail")
+    except (ValueError, AttributeError):
+        detail = None
+    if isinstance(detail, list):
+        # Request validation errors: one {"loc", "msg", ...} per problem
+        detail = "; ".join(str(error.get("msg")) for error in detail if isinstance(error, dict))
+    return GraphQLError(str(detail or f"{response.status_code} {response.reason_phrase}"))
 
 
 @strawberry.type
@@ -17,19 +33,32 @@ class Alert:
     message: str
     created_at: str
 
+    @strawberry.field
+    def cursor(self) -> str:
+        """Opaque position of this alert, accepted by criticalAlerts and activeAlerts."""
+        return encode_cursor(datetime.fromisoformat(self.created_at), self.id)
+
 
 @strawberry.federation.type(keys=["id"])
 class Robot:
     id: strawberry.ID = strawberry.federation.field(external=True)
 
     @strawberry.field
-    async def active_alerts(self, info: Info) -> list[Alert]:
+    async def active_alerts(
+        self,
+        info: Info,
+        limit: int = DEFAULT_PAGE_SIZE,
+        since: str | None = None,
+        cursor: str | None = None,
+    ) -> list[Alert]:
         """
-        Extend Robot with active alerts.
+        Extend Robot with a page of its newest alerts since `since`, at most
+        MAX_PAGE_SIZE. Pass the last alert's cursor to continue.
         Use DataLoader for batching.
         """
         alert_loader = info.context["alert_loader"]
-        alerts = await alert_loader.load(str(self.id))
+        limit = min(limit, MAX_PAGE_SIZE)
+        alerts = await alert_loader.load((str(self.id), limit, since, cursor))
         return [
             Alert(
                 id=alert["id"],
@@ -50,22 +79,49 @@ class Robot:
         return Robot(id=id)
 
 
-async def load_alerts_batch(keys: list[str]) -> list[list[dict[str, Any]]]:
-    """DataLoader batch function for alerts."""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+# (robot_id, limit_per_robot, since, cursor)
+AlertKey = tuple[str, int | None, str | None, str | None]
+
+
+async def load_alerts_batch(
+    keys: list[AlertKey],
+) -> list[list[dict[str, Any]] | GraphQLError]:
+    """DataLoader batch function for alerts, one call per (limit, since, cursor) group."""
+    groups: dict[tuple[int | None, str | None, str | None], list[str]] = {}
+    for robot_id, limit, since, cursor in keys:
+        groups.setdefault((limit, since, cursor), []).append(robot_id)
+
+    results: dict[AlertKey, list[dict[str, Any]] | GraphQLError] = {}
+    client = http_clients.get("alert")
+    for (limit, since, cursor), robot_ids in groups.items():
         try:
             response = await client.post(
-                f"{ALERT_SERVICE_URL}/alerts/batch",
-                json={"robot_ids": keys},
+                "/alerts/batch",
+                json={
+                    "robot_ids": robot_ids,
+                    "limit_per_robot": limit,
+                    "since": since,
+                    "cursor": cursor,
+                },
             )
+            if response.is_client_error:
+                # Bad paging arguments fail the field rather than degrading it
+                error = client_error(response)
+                for robot_id in robot_ids:
+                    results[(robot_id, limit, since, cursor)] = error
+                continue
             response.raise_for_status()
             data = response.json()
-            return [data.get(robot_id, []) for robot_id in keys]
         except Exception:
-            return [[] for _ in keys]
+            mark_degraded("alert")
+            data = {}
+        for robot_id in robot_ids:
+            results[(robot_id, limit, since, cursor)] = data.get(robot_id, [])
+
+    return [results[key] for key in keys]
 
 
-def create_alert_loader() -> DataLoader[str, list[dict[str, Any]]]:
+def create_alert_loader() -> DataLoader[AlertKey, list[dict[str, Any]]]:
     """Create request-scoped alert DataLoader."""
     return DataLoader(load_fn=load_alerts_batch)
 
@@ -73,15 +129,35 @@ def create_alert_loader() -> DataLoader[str, list[dict[str, Any]]]:
 @strawberry.type
 class Query:
     @strawberry.field
-    async def critical_alerts(self, info: Info) -> list[Alert]:
+    async def critical_alerts(
+        self,
+        info: Info,
+        limit: int | None = None,
+        since: str | None = None,
+        cursor: str | None = None,
+    ) -> list[Alert]:
         """
-        Fetch critical alerts from alert service.
+        Fetch a page of critical alerts from alert service.
         This is a root query in the alert subgraph.
+        Pass the last alert's cursor to continue. An unavailable alert
+        service (error status, transport failure, open circuit breaker or
+        exhausted deadline) yields an empty, degraded page.
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{ALERT_SERVICE_URL}/alerts/critical")
-            response.raise_for_status()
-            alerts_data = response.json()
+        params = {"limit": limit, "since": since, "cursor": cursor}
+        try:
+            response = await http_clients.get("alert").get(
+                "/alerts/critical",
+                params={k: v for k, v in params.items() if v is not None},
+            )
+        except httpx.RequestError:
+            mark_degraded("alert")
+            return []
+        if response.status_code >= 500:
+            mark_degraded("alert")
+            return []
+        if response.is_client_error:
+            raise client_error(response)
+        alerts_data = response.json()
 
         return [
             Alert(
@@ -1,28 +1,35 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 from strawberry.fastapi import GraphQLRouter
 
-from .schema import schema
-
-http_client: httpx.AsyncClient | None = None
+from shared.http_clients import http_clients
+from shared.resilience import RequestDeadlineMiddleware
 
+from .config import ROBOT_SERVICE_URL
+from .schema import create_robot_loader, schema
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global http_client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    http_clients.register("robot", ROBOT_SERVICE_URL)
     yield
-    await http_client.aclose()
+    await http_clients.aclose()
 
 
 app = FastAPI(title="Robot Subgraph", lifespan=lifespan)
 
+app.add_middleware(RequestDeadlineMiddleware)
 Instrumentator().instrument(app).expose(app)
 
-graphql_app = GraphQLRouter(schema)
+async def get_context():
+    """Create request-scoped DataLoader."""
+    return {
+        "robot_loader": create_robot_loader(),
+    }
+
+
+graphql_app = GraphQLRouter(schema, context_getter=get_context)
 app.include_router(graphql_app, prefix="/graphql")
 
 
@@ -1,9 +1,12 @@
-import httpx
+from typing import Any
+
 import strawberry
+from strawberry.dataloader import DataLoader
 from strawberry.federation import Schema
 from strawberry.types import Info
 
-from .config import ROBOT_SERVICE_URL
+from shared.http_clients import http_clients
+from shared.resilience import mark_degraded
 
 
 @strawberry.federation.type(keys=["id"])
@@ -18,33 +21,48 @@ class Robot:
     async def resolve_reference(cls, info: Info, id: strawberry.ID) -> "Robot | None":
         """
         Resolve Robot entity from reference.
-        Called when other subgraphs need Robot data via _entities query.
+        Called when other subgraphs need Robot data via _entities query;
+        all references in one _entities query share a DataLoader batch.
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(f"{ROBOT_SERVICE_URL}/robots/{id}")
-                response.raise_for_status()
-                data = response.json()
-                return Robot(
-                    id=strawberry.ID(data["id"]),
-                    name=data["name"],
-                    model=data["model"],
-                    location=data["location"],
-                    status=data["status"],
-                )
-            except Exception:
-                return None
+        robot_loader = info.context["robot_loader"]
+        data = await robot_loader.load(str(id))
+        if data is None:
+            return None
+        return Robot(
+            id=strawberry.ID(data["id"]),
+            name=data["name"],
+            model=data["model"],
+            location=data["location"],
+            status=data["status"],
+        )
+
+
+async def load_robots_batch(keys: list[str]) -> list[dict[str, Any] | None]:
+    """DataLoader batch function for robots, one POST /robots/batch call."""
+    try:
+        response = await http_clients.get("robot").post(
+            "/robots/batch",
+            json={"robot_ids": keys},
+        )
+        response.raise_for_status()
+        data = response.json()
+        return [data.get(robot_id) for robot_id in keys]
+    except Exception:
+        mark_degraded("robot")
+        return [None] * len(keys)
+
+
+def create_robot_loader() -> DataLoader[str, dict[str, Any] | None]:
+    """Create request-scoped robot DataLoader."""
+    return DataLoader(load_fn=load_robots_batch)
 
 
 @strawberry.type
 class Query:
     @strawberry.field
     async def robots(self, info: Info) -> list[Robot]:
-        """Fetch all robots from the robot service."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{ROBOT_SERVICE_URL}/robots")
-            response.raise_for_status()
-            robots_data = response.json()
+        """Fetch all robots from the robot service, revalidating the last copy."""
+        robots_data = await http_clients.revalidated_json("robot", "/robots")
 
         return [
             Robot(
@@ -60,20 +78,19 @@ class Query:
     @strawberry.field
     async def robot(self, info: Info, id: strawberry.ID) -> Robot | None:
         """Fetch a single robot by ID."""
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                response = await client.get(f"{ROBOT_SERVICE_URL}/robots/{id}")
-                response.raise_for_status()
-                data = response.json()
-                return Robot(
-                    id=strawberry.ID(data["id"]),
-                    name=data["name"],
-                    model=data["model"],
-                    location=data["location"],
-                    status=data["status"],
-                )
-            except Exception:
-                return None
+        try:
+            response = await http_clients.get("robot").get(f"/robots/{id}")
+            response.raise_for_status()
+            data = response.json()
+            return Robot(
+                id=strawberry.ID(data["id"]),
+                name=data["name"],
+                model=data["model"],
+                location=data["location"],
+                status=data["status"],
+            )
+        except Exception:
+            return None
 
 
 schema = Schema(query=Query, enable_federation_2=True)
@@ -1,25 +1,25 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 from strawberry.fastapi import GraphQLRouter
 
-from .schema import create_telemetry_loader, schema
-
-http_client: httpx.AsyncClient | None = None
+from shared.http_clients import http_clients
+from shared.resilience import RequestDeadlineMiddleware
 
+from .config import TELEMETRY_SERVICE_URL
+from .schema import create_telemetry_loader, schema
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global http_client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    http_clients.register("telemetry", TELEMETRY_SERVICE_URL)
     yield
-    await http_client.aclose()
+    await http_clients.aclose()
 
 
 app = FastAPI(title="Telemetry Subgraph", lifespan=lifespan)
 
+app.add_middleware(RequestDeadlineMiddleware)
 Instrumentator().instrument(app).expose(app)
 
 
@@ -1,12 +1,12 @@
 from typing import Any
 
-import httpx
 import strawberry
 from strawberry.dataloader import DataLoader
 from strawberry.federation import Schema
 from strawberry.types import Info
 
-from .config import TELEMETRY_SERVICE_URL
+from shared.http_clients import http_clients
+from shared.resilience import mark_degraded
 
 
 @strawberry.type
@@ -51,17 +51,17 @@ class Robot:
 
 async def load_telemetry_batch(keys: list[str]) -> list[dict[str, Any] | None]:
     """DataLoader batch function for telemetry."""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(
-                f"{TELEMETRY_SERVICE_URL}/telemetry/batch",
-                json={"robot_ids": keys},
-            )
-            response.raise_for_status()
-            data = response.json()
-            return [data.get(robot_id) for robot_id in keys]
-        except Exception:
-            return [None] * len(keys)
+    try:
+        response = await http_clients.get("telemetry").post(
+            "/telemetry/batch",
+            json={"robot_ids": keys},
+        )
+        response.raise_for_status()
+        data = response.json()
+        return [data.get(robot_id) for robot_id in keys]
+    except Exception:
+        mark_degraded("telemetry")
+        return [None] * len(keys)
 
 
 def create_telemetry_loader() -> DataLoader[str, dict[str, Any] | None]:
@@ -0,0 +1,196 @@
+"""
+In-memory response cache for expensive proxied routes.
+
+Each route has a TTL during which cached bodies are served without
+touching the upstream, and a stale-while-revalidate window after it in
+which the stale body is still served while one background task per key
+refreshes it. Refreshes send If-None-Match when the upstream gave an ETag,
+so an unchanged upstream answers 304 and the stored body is kept.
+
+Entries are evicted least recently used once either the entry or the byte
+budget is exceeded.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+import httpx
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# Upstream headers stored with the body and replayed on every hit
+STORED_HEADERS = (
+    "content-type", "content-encoding", "cache-control", "etag", "x-next-cursor", "x-degraded",
+)
+
+CACHE_REQUESTS = Counter(
+    "gateway_cache_requests_total",
+    "Cacheable requests by route and cache status",
+    ["route", "status"],
+)
+CACHE_REFRESHES = Counter(
+    "gateway_cache_refreshes_total",
+    "Upstream fetches made by the cache, by route and outcome (updated, not_modified, error)",
+    ["route", "outcome"],
+)
+CACHE_EVICTIONS = Counter(
+    "gateway_cache_evictions_total", "Entries evicted to stay within the cache budget"
+)
+CACHE_ENTRIES = Gauge("gateway_cache_entries", "Entries currently held in the cache")
+CACHE_BYTES = Gauge("gateway_cache_bytes", "Body bytes currently held in the cache")
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    route: str
+    ttl: float
+    stale_while_revalidate: float
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    headers: Dict[str, str]
+    stored_at: float
+
+    def age(self, now: float) -> float:
+        return now - self.stored_at
+
+
+# Fetches the upstream response; receives extra request headers (If-None-Match)
+Fetch = Callable[[Dict[str, str]], Awaitable[httpx.Response]]
+
+
+class ResponseCache:
+    """
+    LRU response cache with per-route TTL and stale-while-revalidate.
+
+    Only complete 200 responses are stored; degraded ones (X-Degraded,
+    missing an upstream's data) are returned to the caller but not kept.
+    Non-2xx upstream responses raise httpx.HTTPStatusError to the caller
+    on a miss and are counted and ignored during a background refresh.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def get(
+        self, policy: CachePolicy, key: str, fetch: Fetch
+    ) -> Tuple[CachedResponse, str]:
+        """
+        Return the cached response for key, fetching it when needed.
+
+        Args:
+            policy: TTL and stale window of the route
+            key: Cache key, unique per route and query
+            fetch: Performs the upstream request
+
+        Returns:
+            (response, status) where status is HIT, STALE, MISS or REVALIDATED
+
+        Raises:
+            httpx.HTTPStatusError: Upstream answered a miss with an error status
+            httpx.RequestError: Upstream unreachable on a miss
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = entry.age(now)
+            if age < policy.ttl:
+                status = "HIT"
+            elif age < policy.ttl + policy.stale_while_revalidate:
+                status = "STALE"
+                self._refresh_in_background(policy, key, fetch)
+            else:
+                entry, status = await self._fetch(policy, key, fetch, entry)
+        else:
+            entry, status = await self._fetch(policy, key, fetch, None)
+
+        CACHE_REQUESTS.labels(policy.route, status).inc()
+        return entry, status
+
+    async def _fetch(
+        self,
+        policy: CachePolicy,
+        key: str,
+        fetch: Fetch,
+        previous: Optional[CachedResponse],
+    ) -> Tuple[CachedResponse, str]:
+        headers = {}
+        if previous is not None and "etag" in previous.headers:
+            headers["If-None-Match"] = previous.headers["etag"]
+        try:
+            upstream = await fetch(headers)
+            if upstream.status_code == 304 and previous is not None:
+                entry = CachedResponse(previous.body, previous.headers, time.monotonic())
+                status = "REVALIDATED"
+            else:
+                upstream.raise_for_status()
+                entry = CachedResponse(
+                    upstream.content,
+                    {h: upstream.headers[h] for h in STORED_HEADERS if h in upstream.headers},
+                    time.monotonic(),
+                )
+                status = "MISS"
+        except Exception:
+            CACHE_REFRESHES.labels(policy.route, "error").inc()
+            raise
+        outcome = "not_modified" if status == "REVALIDATED" else "updated"
+        CACHE_REFRESHES.labels(policy.route, outcome).inc()
+        if upstream.status_code in (200, 304) and "x-degraded" not in entry.headers:
+            self._store(key, entry)
+        return entry, status
+
+    def _refresh_in_background(self, policy: CachePolicy, key: str, fetch: Fetch) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                # Re-read: the entry may have been refreshed or evicted meanwhile
+                await self._fetch(policy, key, fetch, self._entries.get(key))
+            except Exception as e:
+                logger.warning("Background refresh of %s failed: %s", key, e)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.body)
+        if len(entry.body) > self.max_bytes:
+            self._update_gauges()
+            return
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            CACHE_EVICTIONS.inc()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        CACHE_ENTRIES.set(len(self._entries))
+        CACHE_BYTES.set(self._bytes)
+
+    async def close(self) -> None:
+        """Cancel outstanding background refreshes."""
+        tasks = list(self._refreshing.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
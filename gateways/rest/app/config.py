@@ -1,3 +1,17 @@
 import os
 
 ROBOT_SERVICE_URL = os.getenv("ROBOT_SERVICE_URL", "http://robot-service:10001")
+
+# Response cache: seconds a cached body is served as fresh, per route (0 disables)
+CACHE_TTL_DASHBOARD = float(os.getenv("CACHE_TTL_DASHBOARD", "2"))
+CACHE_TTL_CRITICAL_ALERTS = float(os.getenv("CACHE_TTL_CRITICAL_ALERTS", "2"))
+# Seconds after the TTL during which the stale body is served while it refreshes
+CACHE_STALE_WHILE_REVALIDATE = float(os.getenv("CACHE_STALE_WHILE_REVALIDATE", "10"))
+# LRU bounds; the first one exceeded triggers eviction
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Single-flight: identical concurrent requests share one upstream call, per route
+COALESCE_DASHBOARD = os.getenv("COALESCE_DASHBOARD", "true").lower() == "true"
+COALESCE_ROBOT_MONITOR = os.getenv("COALESCE_ROBOT_MONITOR", "true").lower() == "true"
+COALESCE_CRITICAL_ALERTS = os.getenv("COALESCE_CRITICAL_ALERTS", "true").lower() == "true"
@@ -1,25 +1,73 @@
 from contextlib import asynccontextmanager
-from typing import Any
 
 import httpx
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from prometheus_fastapi_instrumentator import Instrumentator
 
-from .config import ROBOT_SERVICE_URL
-
-http_client: httpx.AsyncClient | None = None
+from shared.http_clients import http_clients
+from shared.resilience import RequestDeadlineMiddleware
+from shared.singleflight import SingleFlight
+
+from .cache import CachePolicy, ResponseCache
+from .config import (
+    CACHE_MAX_BYTES,
+    CACHE_MAX_ENTRIES,
+    CACHE_STALE_WHILE_REVALIDATE,
+    CACHE_TTL_CRITICAL_ALERTS,
+    CACHE_TTL_DASHBOARD,
+    COALESCE_CRITICAL_ALERTS,
+    COALESCE_DASHBOARD,
+    COALESCE_ROBOT_MONITOR,
+    ROBOT_SERVICE_URL,
+)
+from .proxy import ProxyRoute, proxy_get
+
+response_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES)
+
+
+def _single_flight(group: str, enabled: bool) -> SingleFlight | None:
+    return SingleFlight(group) if enabled else None
+
+
+# Gateway routes and the Robot Service endpoints they pass through to.
+# The Robot Service does the orchestration (and its N+1 calls); the
+# gateway only relays bytes, optionally through the response cache and
+# with identical concurrent requests coalesced into one upstream call.
+ROUTES = [
+    ProxyRoute(
+        "/api/fleet/dashboard",
+        "/robots/dashboard",
+        cache=CachePolicy("dashboard", CACHE_TTL_DASHBOARD, CACHE_STALE_WHILE_REVALIDATE),
+        coalesce=_single_flight("dashboard", COALESCE_DASHBOARD),
+    ),
+    ProxyRoute(
+        "/api/robots/{robot_id}/monitor",
+        "/robots/{robot_id}/monitor",
+        coalesce=_single_flight("robot_monitor", COALESCE_ROBOT_MONITOR),
+    ),
+    ProxyRoute(
+        "/api/alerts/critical",
+        "/robots/alerts/critical",
+        params=("limit", "since", "cursor"),
+        cache=CachePolicy(
+            "critical_alerts", CACHE_TTL_CRITICAL_ALERTS, CACHE_STALE_WHILE_REVALIDATE
+        ),
+        coalesce=_single_flight("critical_alerts", COALESCE_CRITICAL_ALERTS),
+    ),
+]
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global http_client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    http_clients.register("robot", ROBOT_SERVICE_URL)
     yield
-    await http_client.aclose()
+    await response_cache.close()
+    await http_clients.aclose()
 
 
 app = FastAPI(title="REST Gateway", lifespan=lifespan)
 
+app.add_middleware(RequestDeadlineMiddleware)
 Instrumentator().instrument(app).expose(app)
 
 
@@ -28,60 +76,15 @@ async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.get("/api/fleet/dashboard")
-async def fleet_dashboard() -> Any:
-    """
-    Proxy to Robot Service orchestration endpoint.
-    Robot Service will handle N+1 calls to other services.
-    """
-    if http_client is None:
-        raise HTTPException(status_code=500, detail="HTTP client not initialized")
-
-    try:
-        response = await http_client.get(f"{ROBOT_SERVICE_URL}/robots/dashboard")
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
-
-
-@app.get("/api/robots/{robot_id}/monitor")
-async def robot_monitor(robot_id: str) -> Any:
-    """
-    Proxy to Robot Service monitor endpoint.
-    Robot Service will fetch telemetry and alerts.
-    """
-    if http_client is None:
-        raise HTTPException(status_code=500, detail="HTTP client not initialized")
-
-    try:
-        response = await http_client.get(
-            f"{ROBOT_SERVICE_URL}/robots/{robot_id}/monitor"
-        )
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
-
-
-@app.get("/api/alerts/critical")
-async def critical_alerts() -> Any:
-    """
-    Proxy to Robot Service critical alerts endpoint.
-    Robot Service will orchestrate data from alert and telemetry services.
-    """
-    if http_client is None:
-        raise HTTPException(status_code=500, detail="HTTP client not initialized")
-
-    try:
-        response = await http_client.get(f"{ROBOT_SERVICE_URL}/robots/alerts/critical")
-        response.raise_for_status()
-        return response.json()
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=str(e))
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
+def _proxy_endpoint(route: ProxyRoute):
+    async def endpoint(request: Request) -> Response:
+        try:
+            return await proxy_get(route, request, "robot", response_cache)
+        except httpx.RequestError as e:
+            raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
+
+    return endpoint
+
+
+for route in ROUTES:
+    app.add_api_route(route.path, _proxy_endpoint(route), methods=["GET"])
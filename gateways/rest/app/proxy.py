@@ -0,0 +1,131 @@
+"""
+Byte passthrough proxy from gateway routes to the Robot Service.
+
+Every route is a row in a table: the gateway path, the upstream path it
+maps to, which query parameters are forwarded and, optionally, a cache
+policy and single-flight group. Upstream bodies are never parsed;
+uncached routes stream the raw bytes through as they arrive and cached
+routes replay the stored bytes, so the gateway's work per request does not
+grow with the payload. Coalesced routes buffer the body once and hand the
+same bytes to every request that shared the upstream call.
+
+Only headers in the allowlists below cross the proxy in either direction.
+"""
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from shared.http_clients import http_clients
+from shared.etag import etag_matches
+from shared.singleflight import SingleFlight, request_key
+
+from .cache import STORED_HEADERS, CachePolicy, ResponseCache
+
+# Client request headers forwarded upstream on uncached routes
+FORWARDED_REQUEST_HEADERS = ("if-none-match",)
+# Upstream response headers returned to the client; the cache stores the same set
+FORWARDED_RESPONSE_HEADERS = STORED_HEADERS
+
+
+@dataclass(frozen=True)
+class ProxyRoute:
+    path: str
+    upstream_path: str
+    # Query parameters passed on; anything else the client sends is dropped
+    params: Tuple[str, ...] = ()
+    cache: Optional[CachePolicy] = None
+    # Identical concurrent requests share one upstream call when set
+    coalesce: Optional[SingleFlight] = None
+
+
+def _forwarded(headers, names) -> dict:
+    return {name: headers[name] for name in names if name in headers}
+
+
+async def proxy_get(
+    route: ProxyRoute, request: Request, upstream_name: str, cache: ResponseCache
+) -> Response:
+    """
+    Forward a GET to the upstream and return its bytes unchanged.
+
+    Upstream status codes, including errors and 304, are passed through
+    with their bodies. On coalesced routes, upstream fetches (cache misses
+    and refreshes included) are keyed by path, normalized query and
+    forwarded request headers. Cached routes add X-Cache (HIT, STALE, MISS or
+    REVALIDATED) and Age, and answer 304 themselves when If-None-Match
+    matches the stored ETag; uncached routes add X-Cache: BYPASS.
+
+    Args:
+        route: The matched route
+        request: The incoming request; supplies path and query parameters
+        upstream_name: Registered shared.http_clients upstream to call
+        cache: Response cache used when the route has an enabled policy
+
+    Returns:
+        The upstream response, streamed or replayed from the cache
+
+    Raises:
+        httpx.RequestError: If the upstream is unreachable
+    """
+    path = route.upstream_path.format(
+        **{name: quote(value, safe="") for name, value in request.path_params.items()}
+    )
+    query = httpx.QueryParams(
+        [(k, v) for k, v in request.query_params.multi_items() if k in route.params]
+    )
+
+    async def fetch(headers: dict) -> httpx.Response:
+        return await http_clients.hedged_get(upstream_name, path, params=query, headers=headers)
+
+    if route.coalesce is not None:
+        fetch_once = fetch
+
+        async def fetch(headers: dict) -> httpx.Response:
+            key = (request_key("GET", path, query.multi_items()), tuple(sorted(headers.items())))
+            return await route.coalesce.do(key, lambda: fetch_once(headers))
+
+    if route.cache is not None and route.cache.enabled:
+        key = f"{path}?{httpx.QueryParams(sorted(query.multi_items()))}"
+        try:
+            entry, status = await cache.get(route.cache, key, fetch)
+        except httpx.HTTPStatusError as e:
+            return Response(
+                e.response.content,
+                status_code=e.response.status_code,
+                headers=_forwarded(e.response.headers, FORWARDED_RESPONSE_HEADERS),
+            )
+        headers = _forwarded(entry.headers, FORWARDED_RESPONSE_HEADERS)
+        headers["X-Cache"] = status
+        headers["Age"] = str(int(entry.age(time.monotonic())))
+        etag = entry.headers.get("etag")
+        if etag is not None and etag_matches(request.headers.get("if-none-match"), etag):
+            headers.pop("content-type", None)
+            headers.pop("content-encoding", None)
+            return Response(status_code=304, headers=headers)
+        return Response(entry.body, headers=headers)
+
+    forwarded = _forwarded(request.headers, FORWARDED_REQUEST_HEADERS)
+    if route.coalesce is not None:
+        upstream = await fetch(forwarded)
+        headers = _forwarded(upstream.headers, FORWARDED_RESPONSE_HEADERS)
+        headers["X-Cache"] = "BYPASS"
+        return Response(upstream.content, status_code=upstream.status_code, headers=headers)
+
+    client = http_clients.get(upstream_name)
+    upstream = await client.send(
+        client.build_request("GET", path, params=query, headers=forwarded), stream=True
+    )
+    headers = _forwarded(upstream.headers, FORWARDED_RESPONSE_HEADERS)
+    headers["X-Cache"] = "BYPASS"
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
@@ -5,3 +5,6 @@ TELEMETRY_SERVICE_URL = os.getenv(
     "TELEMETRY_SERVICE_URL", "http://telemetry-service:10002"
 )
 ALERT_SERVICE_URL = os.getenv("ALERT_SERVICE_URL", "http://alert-service:10003")
+
+# Identical concurrent root-field fetches (e.g. GET /robots) share one call
+COALESCE_ROOT_FETCHES = os.getenv("COALESCE_ROOT_FETCHES", "true").lower() == "true"
@@ -1,9 +1,23 @@
 from typing import Any
 
 import httpx
+from graphql import GraphQLError
 from strawberry.dataloader import DataLoader
 
-from .config import ALERT_SERVICE_URL, ROBOT_SERVICE_URL, TELEMETRY_SERVICE_URL
+from shared.http_clients import http_clients
+from shared.resilience import mark_degraded
+
+
+def client_error(response: httpx.Response) -> GraphQLError:
+    """GraphQL error for a request the upstream rejected with a 4xx, carrying its detail."""
+    try:
+        detail = response.json().get("detail")
+    except (ValueError, AttributeError):
+        detail = None
+    if isinstance(detail, list):
+        # Request validation errors: one {"loc", "msg", ...} per problem
+        detail = "; ".join(str(error.get("msg")) for error in detail if isinstance(error, dict))
+    return GraphQLError(str(detail or f"{response.status_code} {response.reason_phrase}"))
 
 
 async def load_telemetry_batch(keys: list[str]) -> list[dict[str, Any] | None]:
@@ -11,55 +25,82 @@ async def load_telemetry_batch(keys: list[str]) -> list[dict[str, Any] | None]:
     DataLoader for telemetry data.
     Batches multiple robot_id requests into a single POST /telemetry/batch call.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(
-                f"{TELEMETRY_SERVICE_URL}/telemetry/batch",
-                json={"robot_ids": keys},
-            )
-            response.raise_for_status()
-            data = response.json()
+    try:
+        response = await http_clients.get("telemetry").post(
+            "/telemetry/batch",
+            json={"robot_ids": keys},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return [data.get(robot_id) for robot_id in keys]
+    except Exception:
+        mark_degraded("telemetry")
+        return [None] * len(keys)
 
-            return [data.get(robot_id) for robot_id in keys]
-        except Exception:
-            return [None] * len(keys)
 
+# (robot_id, limit_per_robot, since, cursor)
+AlertKey = tuple[str, int | None, str | None, str | None]
 
-async def load_alerts_batch(keys: list[str]) -> list[list[dict[str, Any]]]:
+
+async def load_alerts_batch(keys: list[AlertKey]) -> list[list[dict[str, Any]] | GraphQLError]:
     """
     DataLoader for alerts.
-    Batches multiple robot_id requests into a single POST /alerts/batch call.
+    Batches multiple robot_id requests into a single POST /alerts/batch call
+    per distinct (limit, since, cursor) paging combination. Arguments the
+    alert service rejects become errors on the affected fields.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    groups: dict[tuple[int | None, str | None, str | None], list[str]] = {}
+    for robot_id, limit, since, cursor in keys:
+        groups.setdefault((limit, since, cursor), []).append(robot_id)
+
+    results: dict[AlertKey, list[dict[str, Any]] | GraphQLError] = {}
+    client = http_clients.get("alert")
+    for (limit, since, cursor), robot_ids in groups.items():
         try:
             response = await client.post(
-                f"{ALERT_SERVICE_URL}/alerts/batch",
-                json={"robot_ids": keys},
+                "/alerts/batch",
+                json={
+                    "robot_ids": robot_ids,
+                    "limit_per_robot": limit,
+                    "since": since,
+                    "cursor": cursor,
+                },
             )
+            if response.is_client_error:
+                # Bad paging arguments fail the field rather than degrading it
+                error = client_error(response)
+                for robot_id in robot_ids:
+                    results[(robot_id, limit, since, cursor)] = error
+                continue
             response.raise_for_status()
             data = response.json()
-
-            return [data.get(robot_id, []) for robot_id in keys]
         except Exception:
-            return [[] for _ in keys]
+            mark_degraded("alert")
+            data = {}
+        for robot_id in robot_ids:
+            results[(robot_id, limit, since, cursor)] = data.get(robot_id, [])
+
+    return [results[key] for key in keys]
 
 
 async def load_robots_batch(keys: list[str]) -> list[dict[str, Any] | None]:
     """
     DataLoader for robots.
-    Fetches individual robots. For better performance, could fetch all robots
-    and filter, but this demonstrates individual fetching with batching.
+    Batches multiple robot_id requests into a single POST /robots/batch call.
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        results = []
-        for robot_id in keys:
-            try:
-                response = await client.get(f"{ROBOT_SERVICE_URL}/robots/{robot_id}")
-                response.raise_for_status()
-                results.append(response.json())
-            except Exception:
-                results.append(None)
-        return results
+    try:
+        response = await http_clients.get("robot").post(
+            "/robots/batch",
+            json={"robot_ids": keys},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return [data.get(robot_id) for robot_id in keys]
+    except Exception:
+        mark_degraded("robot")
+        return [None] * len(keys)
 
 
 def create_telemetry_loader() -> DataLoader[str, dict[str, Any] | None]:
@@ -67,7 +108,7 @@ def create_telemetry_loader() -> DataLoader[str, dict[str, Any] | None]:
     return DataLoader(load_fn=load_telemetry_batch)
 
 
-def create_alert_loader() -> DataLoader[str, list[dict[str, Any]]]:
+def create_alert_loader() -> DataLoader[AlertKey, list[dict[str, Any]]]:
     """Create a new alert DataLoader instance (request-scoped)."""
     return DataLoader(load_fn=load_alerts_batch)
 
@@ -1,10 +1,13 @@
 from contextlib import asynccontextmanager
 
-import httpx
 from fastapi import FastAPI
 from prometheus_fastapi_instrumentator import Instrumentator
 from strawberry.fastapi import GraphQLRouter
 
+from shared.http_clients import http_clients
+from shared.resilience import RequestDeadlineMiddleware
+
+from .config import ALERT_SERVICE_URL, ROBOT_SERVICE_URL, TELEMETRY_SERVICE_URL
 from .dataloaders import (
     create_alert_loader,
     create_robot_loader,
@@ -12,19 +15,18 @@ from .dataloaders import (
 )
 from .schema import schema
 
-http_client: httpx.AsyncClient | None = None
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global http_client
-    http_client = httpx.AsyncClient(timeout=30.0)
+    http_clients.register("robot", ROBOT_SERVICE_URL)
+    http_clients.register("telemetry", TELEMETRY_SERVICE_URL)
+    http_clients.register("alert", ALERT_SERVICE_URL)
     yield
-    await http_client.aclose()
+    await http_clients.aclose()
 
 
 app = FastAPI(title="Strawberry GraphQL Gateway", lifespan=lifespan)
 
+app.add_middleware(RequestDeadlineMiddleware)
 Instrumentator().instrument(app).expose(app)
 
 
@@ -1,10 +1,67 @@
+import asyncio
+from datetime import datetime
 from typing import Any
 
 import httpx
 import strawberry
 from strawberry.types import Info
 
-from .config import ALERT_SERVICE_URL, ROBOT_SERVICE_URL, TELEMETRY_SERVICE_URL
+from shared.http_clients import http_clients
+from shared.paging import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor
+from shared.resilience import mark_degraded
+from shared.singleflight import SingleFlight, request_key
+
+from .config import COALESCE_ROOT_FETCHES
+from .dataloaders import client_error
+
+root_fetches = SingleFlight("strawberry_root")
+
+
+async def get_root_json(upstream: str, path: str, params: dict[str, Any] | None = None) -> Any:
+    """
+    GET a root field's data, sharing the call with identical concurrent queries.
+
+    The last copy of each resource is revalidated with If-None-Match, so an
+    unchanged catalog costs the upstream a 304. The parsed JSON is shared
+    between queries, so resolvers must not modify it.
+
+    Raises:
+        httpx.HTTPStatusError: If the upstream answers with an error status
+    """
+    query = {k: v for k, v in (params or {}).items() if v is not None}
+
+    async def fetch() -> Any:
+        return await http_clients.revalidated_json(upstream, path, params=query)
+
+    if not COALESCE_ROOT_FETCHES:
+        return await fetch()
+    return await root_fetches.do((upstream, request_key("GET", path, query.items())), fetch)
+
+
+async def get_optional_json(upstream: str, path: str, default: Any) -> Any:
+    """
+    GET data a field can be answered without, falling back to `default`.
+
+    A 404 is simply missing data. Error statuses, transport failures, open
+    circuit breakers and an exhausted request deadline (the last two are
+    httpx.RequestError subclasses) mark the response degraded instead of
+    failing the query.
+    """
+    try:
+        response = await http_clients.get(upstream).get(path)
+    except httpx.RequestError:
+        mark_degraded(upstream)
+        return default
+    if response.status_code == 200:
+        return response.json()
+    if response.status_code >= 500:
+        mark_degraded(upstream)
+    return default
+
+
+def alert_cursor(created_at: str, id: int) -> str:
+    """Cursor continuing after an alert, from its created_at as the alert service sends it."""
+    return encode_cursor(datetime.fromisoformat(created_at), id)
 
 
 @strawberry.type
@@ -24,6 +81,11 @@ class AlertType:
     message: str
     created_at: str
 
+    @strawberry.field
+    def cursor(self) -> str:
+        """Opaque position of this alert, accepted by criticalAlerts and activeAlerts."""
+        return alert_cursor(self.created_at, self.id)
+
 
 @strawberry.type
 class RobotType:
@@ -49,10 +111,20 @@ class RobotType:
         )
 
     @strawberry.field
-    async def active_alerts(self, info: Info) -> list[AlertType]:
-        """Use DataLoader to batch fetch alerts."""
+    async def active_alerts(
+        self,
+        info: Info,
+        limit: int = DEFAULT_PAGE_SIZE,
+        since: str | None = None,
+        cursor: str | None = None,
+    ) -> list[AlertType]:
+        """
+        Use DataLoader to batch fetch a page of the newest alerts since
+        `since`, at most MAX_PAGE_SIZE. Pass the last alert's cursor to continue.
+        """
         alert_loader = info.context["alert_loader"]
-        alerts = await alert_loader.load(self.id)
+        limit = min(limit, MAX_PAGE_SIZE)
+        alerts = await alert_loader.load((self.id, limit, since, cursor))
         return [
             AlertType(
                 id=alert["id"],
@@ -81,6 +153,7 @@ class RobotMonitorType:
 class CriticalAlertType:
     id: int
     message: str
+    cursor: str
     robot: RobotType | None
     telemetry_snapshot: TelemetryType | None
 
@@ -93,10 +166,7 @@ class Query:
         Fetch all robots and use DataLoader to automatically batch
         telemetry and alerts requests.
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{ROBOT_SERVICE_URL}/robots")
-            response.raise_for_status()
-            robots_data = response.json()
+        robots_data = await get_root_json("robot", "/robots")
 
         robots = [
             RobotType(
@@ -115,87 +185,95 @@ class Query:
     async def robot_monitor(self, info: Info, id: str) -> RobotMonitorType | None:
         """
         Fetch a single robot with its telemetry and alerts.
-        No N+1 issue here as it's 1:1 relationship.
+        No N+1 issue here as it's 1:1 relationship. Telemetry and alerts
+        are left out, and the response marked degraded, when their
+        upstream is unavailable.
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            try:
-                robot_response = await client.get(f"{ROBOT_SERVICE_URL}/robots/{id}")
-                robot_response.raise_for_status()
-                robot_data = robot_response.json()
-
-                telemetry_response = await client.get(
-                    f"{TELEMETRY_SERVICE_URL}/telemetry/{id}/latest"
-                )
-                telemetry_data = (
-                    telemetry_response.json()
-                    if telemetry_response.status_code == 200
-                    else None
-                )
+        try:
+            robot_response = await http_clients.get("robot").get(f"/robots/{id}")
+            robot_response.raise_for_status()
+            robot_data = robot_response.json()
 
-                alerts_response = await client.get(f"{ALERT_SERVICE_URL}/alerts/{id}")
-                alerts_data = (
-                    alerts_response.json()
-                    if alerts_response.status_code == 200
-                    else []
-                )
+            telemetry_data = await get_optional_json(
+                "telemetry", f"/telemetry/{id}/latest", None
+            )
+            alerts_data = await get_optional_json("alert", f"/alerts/{id}", [])
+
+            robot = RobotType(
+                id=robot_data["id"],
+                name=robot_data["name"],
+                model=robot_data["model"],
+                location=robot_data["location"],
+                status=robot_data["status"],
+            )
 
-                robot = RobotType(
-                    id=robot_data["id"],
-                    name=robot_data["name"],
-                    model=robot_data["model"],
-                    location=robot_data["location"],
-                    status=robot_data["status"],
+            telemetry = (
+                TelemetryType(
+                    robot_id=telemetry_data["robot_id"],
+                    battery_level=telemetry_data["battery_level"],
+                    cpu_usage=telemetry_data["cpu_usage"],
+                    temperature=telemetry_data["temperature"],
+                    timestamp=telemetry_data["timestamp"],
                 )
+                if telemetry_data
+                else None
+            )
 
-                telemetry = (
-                    TelemetryType(
-                        robot_id=telemetry_data["robot_id"],
-                        battery_level=telemetry_data["battery_level"],
-                        cpu_usage=telemetry_data["cpu_usage"],
-                        temperature=telemetry_data["temperature"],
-                        timestamp=telemetry_data["timestamp"],
-                    )
-                    if telemetry_data
-                    else None
+            alerts = [
+                AlertType(
+                    id=a["id"],
+                    robot_id=a["robot_id"],
+                    severity=a["severity"],
+                    message=a["message"],
+                    created_at=a["created_at"],
                 )
+                for a in alerts_data
+            ]
 
-                alerts = [
-                    AlertType(
-                        id=a["id"],
-                        robot_id=a["robot_id"],
-                        severity=a["severity"],
-                        message=a["message"],
-                        created_at=a["created_at"],
-                    )
-                    for a in alerts_data
-                ]
-
-                return RobotMonitorType(
-                    robot=robot, telemetry=telemetry, recent_alerts=alerts
-                )
-            except httpx.HTTPStatusError:
-                return None
+            return RobotMonitorType(
+                robot=robot, telemetry=telemetry, recent_alerts=alerts
+            )
+        except httpx.HTTPStatusError:
+            return None
 
     @strawberry.field
-    async def critical_alerts(self, info: Info) -> list[CriticalAlertType]:
+    async def critical_alerts(
+        self,
+        info: Info,
+        limit: int | None = None,
+        since: str | None = None,
+        cursor: str | None = None,
+    ) -> list[CriticalAlertType]:
         """
-        Fetch critical alerts and use DataLoader to batch fetch
-        robot and telemetry data.
+        Fetch a page of critical alerts and use DataLoader to batch fetch
+        robot and telemetry data. Pass the last alert's cursor to continue.
+        An unavailable alert service yields an empty, degraded page.
         """
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{ALERT_SERVICE_URL}/alerts/critical")
-            response.raise_for_status()
-            alerts_data = response.json()
+        params = {"limit": limit, "since": since, "cursor": cursor}
+        try:
+            alerts_data = await get_root_json("alert", "/alerts/critical", params)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code < 500:
+                raise client_error(e.response)
+            mark_degraded("alert")
+            return []
+        except httpx.RequestError:
+            mark_degraded("alert")
+            return []
 
         robot_loader = info.context["robot_loader"]
         telemetry_loader = info.context["telemetry_loader"]
 
-        results = []
-        for alert_data in alerts_data:
-            robot_id = alert_data["robot_id"]
+        # Queue every key before awaiting so each loader dispatches one batch
+        robot_ids = [alert_data["robot_id"] for alert_data in alerts_data]
+        robots_data, telemetries_data = await asyncio.gather(
+            robot_loader.load_many(robot_ids), telemetry_loader.load_many(robot_ids)
+        )
 
-            robot_data = await robot_loader.load(robot_id)
-            telemetry_data = await telemetry_loader.load(robot_id)
+        results = []
+        for alert_data, robot_data, telemetry_data in zip(
+            alerts_data, robots_data, telemetries_data
+        ):
 
             robot = (
                 RobotType(
@@ -225,6 +303,7 @@ class Query:
                 CriticalAlertType(
                     id=alert_data["id"],
                     message=alert_data["message"],
+                    cursor=alert_cursor(alert_data["created_at"], alert_data["id"]),
                     robot=robot,
                     telemetry_snapshot=telemetry,
                 )
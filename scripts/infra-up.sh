@@ -27,7 +27,7 @@ docker run --rm \
   -v "$PROJECT_ROOT/shared:/app/shared" \
   -w /app \
   python:3.11-slim \
-  bash -c "pip install -q sqlalchemy asyncpg && python -m shared.db.seed"
+  bash -c "pip install -q sqlalchemy asyncpg fastapi prometheus-client && python -m shared.db.seed"
 
 echo ""
 echo "✓ Infrastructure ready!"
@@ -25,6 +25,6 @@ docker run --rm \
   -v "$PROJECT_ROOT/shared:/app/shared" \
   -w /app \
   python:3.11-slim \
-  bash -c "pip install -q sqlalchemy asyncpg && python -m shared.db.seed"
+  bash -c "pip install -q sqlalchemy asyncpg fastapi prometheus-client && python -m shared.db.seed $*"
 
 echo "✓ Seed data complete!"
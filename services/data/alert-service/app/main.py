@@ -1,22 +1,49 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from datetime import datetime
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from prometheus_fastapi_instrumentator import Instrumentator
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from shared.config import DB_REPOSITORY
+from shared.db.database import get_session, get_read_session, pins_primary, stop_replica_lag_monitor
+from shared.db.statement_metrics import StatementStatsMiddleware
+from shared.resilience import RequestDeadlineMiddleware
+from shared.db.models import Alert
+from shared.db.raw import close_raw_pool
+from shared.db.startup import WARMUP_ROBOT_ID, mark_ready, prepare_database, startup_report
+from shared.db.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    to_naive_utc,
+)
+from shared.ndjson import ndjson_response, wants_ndjson
+from shared.responses import FastJSONResponse, conditional_response
+from shared.schemas.alert import AlertPage, AlertResponse, AlertBatchRequest
+from app.service import get_critical_alerts, get_batch_alerts, stream_alerts
 
-from shared.db.database import get_session, create_tables
-from shared.schemas.alert import AlertResponse, AlertBatchRequest
-from app.service import get_alerts_by_robot, get_critical_alerts, get_batch_alerts
+if DB_REPOSITORY == "asyncpg":
+    from app.pg_repository import get_alerts_by_robot
+else:
+    from app.service import get_alerts_by_robot
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
-    Creates database tables on startup.
+    Creates or verifies the schema and warms the connection pool on startup.
     """
-    await create_tables()
+    await prepare_database(prime=[
+        lambda session: get_alerts_by_robot(session, WARMUP_ROBOT_ID, 1),
+        lambda session: get_critical_alerts(session, 1),
+    ])
+    mark_ready()
     yield
+    await close_raw_pool()
+    await stop_replica_lag_monitor()
 
 
 app = FastAPI(
@@ -28,37 +55,100 @@ app = FastAPI(
 
 # Initialize Prometheus metrics
 Instrumentator().instrument(app).expose(app)
+app.add_middleware(StatementStatsMiddleware)
+app.add_middleware(RequestDeadlineMiddleware)
 
 
 @app.get("/health")
 async def health_check():
     """
     Health check endpoint.
+    Includes startup timing: schema and warmup phases, lifespan duration
+    and time from process start to ready.
+    """
+    return {"status": "ok", "startup": startup_report}
+
+
+def _page_response(request: Request, page: AlertPage) -> Response:
     """
-    return {"status": "ok"}
+    Encode a page's items, advertising the next page in a response header.
+
+    The ETag hashes the encoded page, so an unchanged page yields 304.
+    """
+    headers = {}
+    if page.next_cursor is not None:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return conditional_response(request, page.items, headers=headers)
+
+
+def _stream_alerts(request: Request, condition, limit, since, cursor):
+    """Stream matching alerts as NDJSON; limit is optional in this mode."""
+    if cursor is not None:
+        try:
+            decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return ndjson_response(
+        stream_alerts, condition, limit, since, cursor, primary=pins_primary(request)
+    )
 
 
 # Static routes MUST come before parameterized routes
 @app.get("/alerts/critical", response_model=List[AlertResponse])
-async def get_critical_alerts_list(session: AsyncSession = Depends(get_session)):
+async def get_critical_alerts_list(
+    request: Request,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    accept: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
+):
     """
-    Retrieve all critical severity alerts.
+    Retrieve a page of critical severity alerts, newest first.
+
+    With Accept: application/x-ndjson every matching alert is streamed,
+    one JSON object per line, unless limit is given.
+
+    Args:
+        limit: Page size (defaults to DEFAULT_PAGE_SIZE for JSON)
+        since: Only include alerts created at or after this time
+        cursor: Value of a previous response's X-Next-Cursor header
 
     Returns:
-        List of critical alerts
+        List of critical alerts; X-Next-Cursor is set when more remain
     """
+    since = to_naive_utc(since)
+    if wants_ndjson(accept):
+        return _stream_alerts(request, Alert.severity == "critical", limit, since, cursor)
     try:
-        alerts = await get_critical_alerts(session)
-        return alerts
+        page = await get_critical_alerts(session, limit or DEFAULT_PAGE_SIZE, since, cursor)
+        return _page_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @app.get("/alerts/{robot_id}", response_model=List[AlertResponse])
-async def get_robot_alerts(robot_id: str, session: AsyncSession = Depends(get_session)):
+async def get_robot_alerts(
+    robot_id: str,
+    request: Request,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    accept: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_read_session),
+):
+    since = to_naive_utc(since)
+    if wants_ndjson(accept):
+        return _stream_alerts(request, Alert.robot_id == robot_id, limit, since, cursor)
     try:
-        alerts = await get_alerts_by_robot(session, robot_id)
-        return alerts
+        page = await get_alerts_by_robot(
+            session, robot_id, limit or DEFAULT_PAGE_SIZE, since, cursor
+        )
+        return _page_response(request, page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -71,13 +161,23 @@ async def get_batch_alerts_data(
     Retrieve alerts for multiple robots in batch.
 
     Args:
-        request: Batch request containing list of robot IDs
+        request: Batch request containing list of robot IDs, an optional
+            per-robot cap on returned alerts, an optional since filter and
+            an optional cursor to continue after
 
     Returns:
         Dictionary mapping robot_id to list of alerts
     """
     try:
-        alerts_data = await get_batch_alerts(session, request.robot_ids)
-        return alerts_data
+        alerts_data = await get_batch_alerts(
+            session,
+            request.robot_ids,
+            request.limit_per_robot,
+            to_naive_utc(request.since),
+            request.cursor,
+        )
+        return FastJSONResponse(alerts_data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
@@ -1,83 +1,209 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 from shared.db.models import Alert
-from shared.schemas.alert import AlertResponse
-from typing import List, Dict
+from shared.db.pagination import DEFAULT_PAGE_SIZE, after_cursor, encode_cursor
+from shared.ndjson import STREAM_YIELD_PER
+from shared.responses import dumps_line
+from shared.schemas.alert import AlertPage, AlertResponse
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, Optional
 
+ALERT_COLUMNS = (Alert.id, Alert.robot_id, Alert.severity, Alert.message, Alert.created_at)
 
-async def get_alerts_by_robot(session: AsyncSession, robot_id: str) -> List[AlertResponse]:
+
+def _to_response(row) -> AlertResponse:
+    """Build an AlertResponse from a projected row without re-validating it."""
+    return AlertResponse.model_construct(
+        id=row.id,
+        robot_id=row.robot_id,
+        severity=row.severity,
+        message=row.message,
+        created_at=row.created_at,
+    )
+
+
+async def _fetch_page(
+    session: AsyncSession,
+    condition,
+    limit: int,
+    since: Optional[datetime],
+    cursor: Optional[str],
+) -> AlertPage:
+    """
+    Fetch one keyset page ordered by (created_at desc, id desc).
+
+    One extra row is read to decide whether a next page exists.
+    """
+    stmt = select(*ALERT_COLUMNS).where(condition)
+    if since is not None:
+        stmt = stmt.where(Alert.created_at >= since)
+    if cursor is not None:
+        stmt = stmt.where(after_cursor(Alert.created_at, Alert.id, cursor))
+    stmt = stmt.order_by(desc(Alert.created_at), desc(Alert.id)).limit(limit + 1)
+
+    result = await session.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return AlertPage.model_construct(
+        items=[_to_response(row) for row in rows], next_cursor=next_cursor
+    )
+
+
+async def get_alerts_by_robot(
+    session: AsyncSession,
+    robot_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> AlertPage:
     """
-    Fetch all alerts for a specific robot.
+    Fetch a page of alerts for a specific robot, newest first.
 
     Args:
         robot_id: The robot identifier
+        limit: Maximum number of alerts to return
+        since: Only include alerts created at or after this time
+        cursor: Resume after the position returned as next_cursor
 
     Returns:
-        List of AlertResponse objects
+        AlertPage of AlertResponse objects
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
-    stmt = (
-        select(Alert)
-        .where(Alert.robot_id == robot_id)
-        .order_by(desc(Alert.created_at))
-    )
-    result = await session.execute(stmt)
-    alerts = result.scalars().all()
-
-    return [
-        AlertResponse(
-            id=alert.id,
-            robot_id=alert.robot_id,
-            severity=alert.severity,
-            message=alert.message,
-            created_at=alert.created_at,
-        )
-        for alert in alerts
-    ]
+    return await _fetch_page(session, Alert.robot_id == robot_id, limit, since, cursor)
 
 
-async def get_critical_alerts(session: AsyncSession) -> List[AlertResponse]:
+async def get_critical_alerts(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> AlertPage:
     """
-    Fetch all critical severity alerts.
+    Fetch a page of critical severity alerts, newest first.
+
+    Args:
+        limit: Maximum number of alerts to return
+        since: Only include alerts created at or after this time
+        cursor: Resume after the position returned as next_cursor
 
     Returns:
-        List of critical AlertResponse objects
+        AlertPage of critical AlertResponse objects
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
-    stmt = (
-        select(Alert)
-        .where(Alert.severity == "critical")
-        .order_by(desc(Alert.created_at))
-    )
-    result = await session.execute(stmt)
-    alerts = result.scalars().all()
-
-    return [
-        AlertResponse(
-            id=alert.id,
-            robot_id=alert.robot_id,
-            severity=alert.severity,
-            message=alert.message,
-            created_at=alert.created_at,
-        )
-        for alert in alerts
-    ]
+    return await _fetch_page(session, Alert.severity == "critical", limit, since, cursor)
+
+
+async def stream_alerts(
+    session: AsyncSession,
+    condition,
+    limit: Optional[int],
+    since: Optional[datetime],
+    cursor: Optional[str],
+) -> AsyncIterator[bytes]:
+    """
+    Stream alerts as NDJSON lines in (created_at desc, id desc) order.
+
+    Rows are read from a server-side cursor STREAM_YIELD_PER at a time and
+    never enter the ORM identity map, so memory stays flat.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    stmt = select(*ALERT_COLUMNS).where(condition)
+    if since is not None:
+        stmt = stmt.where(Alert.created_at >= since)
+    if cursor is not None:
+        stmt = stmt.where(after_cursor(Alert.created_at, Alert.id, cursor))
+    stmt = stmt.order_by(desc(Alert.created_at), desc(Alert.id))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    result = await session.stream(stmt.execution_options(yield_per=STREAM_YIELD_PER))
+    async for row in result:
+        yield dumps_line(row._asdict())
 
 
 async def get_batch_alerts(
-    session: AsyncSession, robot_ids: list[str]
+    session: AsyncSession,
+    robot_ids: list[str],
+    limit_per_robot: Optional[int] = None,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
 ) -> Dict[str, List[AlertResponse]]:
     """
-    Fetch alerts for multiple robots.
+    Fetch alerts for multiple robots with a single query.
+
+    Rows come back ordered by (robot_id, created_at desc, id desc) and are grouped
+    into the response in one pass.
 
     Args:
         robot_ids: List of robot identifiers
+        limit_per_robot: Keep only the newest N alerts per robot (all if None)
+        since: Only include alerts created at or after this time
+        cursor: Only include alerts after this position, as encoded by
+            encode_cursor, in every robot's list
 
     Returns:
         Dictionary mapping robot_id to list of AlertResponse
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
-    result = {}
+    unique_ids = list(dict.fromkeys(robot_ids))
+    result: Dict[str, List[AlertResponse]] = {robot_id: [] for robot_id in unique_ids}
+    if not unique_ids:
+        return result
+
+    columns = ALERT_COLUMNS
+    condition = Alert.robot_id.in_(unique_ids)
+    if since is not None:
+        condition = condition & (Alert.created_at >= since)
+    if cursor is not None:
+        condition = condition & after_cursor(Alert.created_at, Alert.id, cursor)
+
+    if limit_per_robot is None:
+        stmt = (
+            select(*columns)
+            .where(condition)
+            .order_by(Alert.robot_id, desc(Alert.created_at), desc(Alert.id))
+        )
+    else:
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=Alert.robot_id,
+                order_by=(desc(Alert.created_at), desc(Alert.id)),
+            )
+            .label("rank")
+        )
+        ranked = (
+            select(*columns, rank)
+            .where(condition)
+            .subquery()
+        )
+        stmt = (
+            select(
+                ranked.c.id,
+                ranked.c.robot_id,
+                ranked.c.severity,
+                ranked.c.message,
+                ranked.c.created_at,
+            )
+            .where(ranked.c.rank <= limit_per_robot)
+            .order_by(ranked.c.robot_id, desc(ranked.c.created_at), desc(ranked.c.id))
+        )
 
-    for robot_id in robot_ids:
-        alerts = await get_alerts_by_robot(session, robot_id)
-        result[robot_id] = alerts
+    rows = await session.execute(stmt)
+    for row in rows:
+        result[row.robot_id].append(_to_response(row))
 
     return result
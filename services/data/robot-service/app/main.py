@@ -1,22 +1,35 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from prometheus_fastapi_instrumentator import Instrumentator
-from typing import List
+from typing import Dict, List, Optional
 
-from shared.db.database import get_session, create_tables
-from shared.schemas.robot import RobotResponse
-from app.service import get_all_robots, get_robot_by_id
+from shared.config import DB_REPOSITORY
+from shared.db.database import get_read_session, stop_replica_lag_monitor
+from shared.db.raw import close_raw_pool
+from shared.db.startup import WARMUP_ROBOT_ID, mark_ready, prepare_database, startup_report
+from shared.db.statement_metrics import StatementStatsMiddleware
+from shared.resilience import RequestDeadlineMiddleware
+from shared.responses import FastJSONResponse, conditional_response
+from shared.schemas.robot import RobotBatchRequest, RobotResponse
+
+if DB_REPOSITORY == "asyncpg":
+    from app.pg_repository import get_all_robots, get_robot_by_id, get_robots_by_ids
+else:
+    from app.service import get_all_robots, get_robot_by_id, get_robots_by_ids
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
-    Creates database tables on startup.
+    Creates or verifies the schema and warms the connection pool on startup.
     """
-    await create_tables()
+    await prepare_database(prime=[lambda session: get_robot_by_id(session, WARMUP_ROBOT_ID)])
+    mark_ready()
     yield
+    await close_raw_pool()
+    await stop_replica_lag_monitor()
 
 
 app = FastAPI(
@@ -28,36 +41,77 @@ app = FastAPI(
 
 # Initialize Prometheus metrics
 Instrumentator().instrument(app).expose(app)
+app.add_middleware(StatementStatsMiddleware)
+app.add_middleware(RequestDeadlineMiddleware)
 
 
 @app.get("/health")
 async def health_check():
     """
     Health check endpoint.
+    Includes startup timing: schema and warmup phases, lifespan duration
+    and time from process start to ready.
     """
-    return {"status": "ok"}
+    return {"status": "ok", "startup": startup_report}
 
 
 @app.get("/robots", response_model=List[RobotResponse])
-async def list_robots(session: AsyncSession = Depends(get_session)):
+async def list_robots(
+    request: Request,
+    ids: Optional[str] = Query(default=None, description="Comma-separated robot IDs"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Retrieve all robots, or only those listed in ids.
+
+    Supports If-None-Match: responds 304 while the ETag still matches.
+
+    Args:
+        ids: Optional comma-separated robot IDs; unknown IDs are skipped
+
+    Returns:
+        List of robots, in ID order or in the order requested
+    """
+    try:
+        if ids is not None:
+            found = await get_robots_by_ids(session, [i for i in ids.split(",") if i])
+            robots = [robot for robot in found.values() if robot is not None]
+        else:
+            robots = await get_all_robots(session)
+        return conditional_response(request, robots)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/robots/batch", response_model=Dict[str, Optional[RobotResponse]])
+async def get_robots_batch(
+    request: RobotBatchRequest, session: AsyncSession = Depends(get_read_session)
+):
     """
-    Retrieve all robots.
+    Retrieve multiple robots in one query.
+
+    Args:
+        request: Batch request containing list of robot IDs
 
     Returns:
-        List of all robots in the system
+        Dictionary mapping robot_id to robot details (None if not found)
     """
     try:
-        robots = await get_all_robots(session)
-        return robots
+        robots = await get_robots_by_ids(session, request.robot_ids)
+        return FastJSONResponse(robots)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @app.get("/robots/{robot_id}", response_model=RobotResponse)
-async def get_robot(robot_id: str, session: AsyncSession = Depends(get_session)):
+async def get_robot(
+    robot_id: str, request: Request, session: AsyncSession = Depends(get_read_session)
+):
     """
     Retrieve a single robot by ID.
 
+    Supports If-None-Match: responds 304 while the ETag still matches.
+
     Args:
         robot_id: The robot identifier
 
@@ -71,7 +125,7 @@ async def get_robot(robot_id: str, session: AsyncSession = Depends(get_session))
         robot = await get_robot_by_id(session, robot_id)
         if robot is None:
             raise HTTPException(status_code=404, detail=f"Robot {robot_id} not found")
-        return robot
+        return conditional_response(request, robot)
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,65 @@
+"""
+Raw asyncpg implementations of the hot robot lookups.
+
+Same signatures and return types as app.service; the session argument
+only picks the database, primary or read replica, whose raw pool is
+queried. Selected with DB_REPOSITORY=asyncpg.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.db.raw import get_raw_pool
+from shared.resilience import statement_timeout
+from shared.schemas.robot import RobotResponse
+from typing import Dict, List, Optional
+
+SELECT_ALL_ROBOTS = "SELECT id, name, model, location, status FROM robots ORDER BY id"
+SELECT_ROBOT = "SELECT id, name, model, location, status FROM robots WHERE id = $1"
+SELECT_ROBOTS = (
+    "SELECT id, name, model, location, status FROM robots WHERE id = ANY($1::varchar[])"
+)
+
+
+async def get_all_robots(session: AsyncSession) -> List[RobotResponse]:
+    """
+    Fetch all robots from the database.
+
+    Returns:
+        List of RobotResponse objects
+    """
+    pool = await get_raw_pool(session)
+    records = await pool.fetch(SELECT_ALL_ROBOTS, timeout=statement_timeout())
+    return [RobotResponse.model_construct(**record) for record in records]
+
+
+async def get_robots_by_ids(
+    session: AsyncSession, robot_ids: List[str]
+) -> Dict[str, Optional[RobotResponse]]:
+    """
+    Fetch multiple robots by ID in one round trip.
+
+    Args:
+        robot_ids: List of robot identifiers
+
+    Returns:
+        Dictionary mapping robot_id to RobotResponse (or None if not found),
+        in request order
+    """
+    result: Dict[str, Optional[RobotResponse]] = dict.fromkeys(robot_ids)
+    pool = await get_raw_pool(session)
+    for record in await pool.fetch(SELECT_ROBOTS, list(result), timeout=statement_timeout()):
+        result[record["id"]] = RobotResponse.model_construct(**record)
+    return result
+
+
+async def get_robot_by_id(session: AsyncSession, robot_id: str) -> Optional[RobotResponse]:
+    """
+    Fetch a single robot by ID.
+
+    Args:
+        robot_id: The robot identifier
+
+    Returns:
+        RobotResponse if found, None otherwise
+    """
+    pool = await get_raw_pool(session)
+    record = await pool.fetchrow(SELECT_ROBOT, robot_id, timeout=statement_timeout())
+    return RobotResponse.model_construct(**record) if record is not None else None
@@ -2,7 +2,32 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from shared.db.models import Robot
 from shared.schemas.robot import RobotResponse
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+# Maximum IDs bound into one IN list
+BATCH_CHUNK_SIZE = 1000
+
+
+# Projected columns; rows come back as plain tuples instead of identity-mapped
+# ORM instances.
+ROBOT_COLUMNS = (
+    Robot.id,
+    Robot.name,
+    Robot.model,
+    Robot.location,
+    Robot.status,
+)
+
+
+def _to_response(row) -> RobotResponse:
+    """Build a RobotResponse from a projected row without re-validating it."""
+    return RobotResponse.model_construct(
+        id=row.id,
+        name=row.name,
+        model=row.model,
+        location=row.location,
+        status=row.status,
+    )
 
 
 async def get_all_robots(session: AsyncSession) -> List[RobotResponse]:
@@ -12,20 +37,38 @@ async def get_all_robots(session: AsyncSession) -> List[RobotResponse]:
     Returns:
         List of RobotResponse objects
     """
-    stmt = select(Robot).order_by(Robot.id)
+    stmt = select(*ROBOT_COLUMNS).order_by(Robot.id)
     result = await session.execute(stmt)
-    robots = result.scalars().all()
 
-    return [
-        RobotResponse(
-            id=robot.id,
-            name=robot.name,
-            model=robot.model,
-            location=robot.location,
-            status=robot.status,
-        )
-        for robot in robots
-    ]
+    return [_to_response(row) for row in result]
+
+
+async def get_robots_by_ids(
+    session: AsyncSession, robot_ids: List[str]
+) -> Dict[str, Optional[RobotResponse]]:
+    """
+    Fetch multiple robots by ID.
+
+    Duplicate IDs are collapsed and the remainder is resolved with one
+    IN query per chunk of BATCH_CHUNK_SIZE.
+
+    Args:
+        robot_ids: List of robot identifiers
+
+    Returns:
+        Dictionary mapping robot_id to RobotResponse (or None if not found),
+        in request order
+    """
+    unique_ids = list(dict.fromkeys(robot_ids))
+    result: Dict[str, Optional[RobotResponse]] = dict.fromkeys(unique_ids)
+
+    for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+        rows = await session.execute(select(*ROBOT_COLUMNS).where(Robot.id.in_(chunk)))
+        for row in rows:
+            result[row.id] = _to_response(row)
+
+    return result
 
 
 async def get_robot_by_id(session: AsyncSession, robot_id: str) -> Optional[RobotResponse]:
@@ -38,17 +81,11 @@ async def get_robot_by_id(session: AsyncSession, robot_id: str) -> Optional[Robo
     Returns:
         RobotResponse if found, None otherwise
     """
-    stmt = select(Robot).where(Robot.id == robot_id)
+    stmt = select(*ROBOT_COLUMNS).where(Robot.id == robot_id)
     result = await session.execute(stmt)
-    robot = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if robot is None:
+    if row is None:
         return None
 
-    return RobotResponse(
-        id=robot.id,
-        name=robot.name,
-        model=robot.model,
-        location=robot.location,
-        status=robot.status,
-    )
+    return _to_response(row)
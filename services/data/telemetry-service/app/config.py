@@ -0,0 +1,27 @@
+import os
+
+# Where /latest and /batch read from when the cache is off or stale:
+# "state" (robot_latest_state, one PK lookup) or "history" (telemetry_data)
+TELEMETRY_LATEST_SOURCE = os.getenv("TELEMETRY_LATEST_SOURCE", "state")
+
+# In-process latest-telemetry cache (serves /latest and /batch without the DB)
+TELEMETRY_CACHE_ENABLED = os.getenv("TELEMETRY_CACHE_ENABLED", "false").lower() == "true"
+TELEMETRY_CACHE_REFRESH_INTERVAL = float(os.getenv("TELEMETRY_CACHE_REFRESH_INTERVAL", "1.0"))
+# Fall back to the DB when the last successful refresh is older than this
+TELEMETRY_CACHE_MAX_STALENESS = float(os.getenv("TELEMETRY_CACHE_MAX_STALENESS", "30.0"))
+# Refreshes re-read rows committed up to this many seconds late below the watermark
+TELEMETRY_CACHE_LOOKBACK = float(os.getenv("TELEMETRY_CACHE_LOOKBACK", "5.0"))
+# Re-warm from robot_latest_state this often to pick up anything later still
+TELEMETRY_CACHE_FULL_REFRESH_INTERVAL = float(
+    os.getenv("TELEMETRY_CACHE_FULL_REFRESH_INTERVAL", "60.0")
+)
+
+# Bulk ingestion buffer for POST /telemetry/ingest
+TELEMETRY_INGEST_FLUSH_SIZE = int(os.getenv("TELEMETRY_INGEST_FLUSH_SIZE", "5000"))
+TELEMETRY_INGEST_FLUSH_INTERVAL = float(os.getenv("TELEMETRY_INGEST_FLUSH_INTERVAL", "0.5"))
+TELEMETRY_INGEST_MAX_BUFFERED_ROWS = int(os.getenv("TELEMETRY_INGEST_MAX_BUFFERED_ROWS", "100000"))
+# Retries for flushes that fail for reasons other than the rows themselves
+TELEMETRY_INGEST_FLUSH_RETRIES = int(os.getenv("TELEMETRY_INGEST_FLUSH_RETRIES", "3"))
+
+# Largest number of buckets a single /telemetry/{robot_id}/series call may span
+TELEMETRY_SERIES_MAX_BUCKETS = int(os.getenv("TELEMETRY_SERIES_MAX_BUCKETS", "10000"))
@@ -1,22 +1,124 @@
+import asyncio
+import re
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from datetime import datetime, timedelta
+from fastapi import FastAPI, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from prometheus_fastapi_instrumentator import Instrumentator
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
 
-from shared.db.database import get_session, create_tables
-from shared.schemas.telemetry import TelemetryResponse, TelemetryBatchRequest
-from app.service import get_latest_telemetry, get_batch_telemetry
+from shared.config import DB_REPOSITORY, TELEMETRY_PARTITION_MAINTENANCE_INTERVAL
+from shared.db.database import engine, get_session, get_read_session, stop_replica_lag_monitor
+from shared.db.statement_metrics import StatementStatsMiddleware
+from shared.resilience import RequestDeadlineMiddleware
+from shared.db.models import TELEMETRY_PARTITIONED
+from shared.db.pagination import to_naive_utc
+from shared.db.partitions import partition_maintenance_loop
+from shared.db.raw import close_raw_pool
+from shared.db.startup import WARMUP_ROBOT_ID, mark_ready, prepare_database, startup_report
+from shared.ndjson import NDJSON_MEDIA_TYPE, ndjson_response, wants_ndjson
+from shared.responses import FastJSONResponse, conditional_response, dumps_line, version_etag
+from shared.schemas.telemetry import (
+    TelemetryResponse,
+    TelemetryBatchRequest,
+    TelemetryIngestRecord,
+    TelemetryIngestResponse,
+    TelemetrySeriesResponse,
+)
+from app.cache import LatestTelemetryCache
+from app.config import (
+    TELEMETRY_CACHE_ENABLED,
+    TELEMETRY_CACHE_FULL_REFRESH_INTERVAL,
+    TELEMETRY_CACHE_LOOKBACK,
+    TELEMETRY_CACHE_MAX_STALENESS,
+    TELEMETRY_CACHE_REFRESH_INTERVAL,
+    TELEMETRY_INGEST_FLUSH_INTERVAL,
+    TELEMETRY_INGEST_FLUSH_RETRIES,
+    TELEMETRY_INGEST_FLUSH_SIZE,
+    TELEMETRY_INGEST_MAX_BUFFERED_ROWS,
+    TELEMETRY_LATEST_SOURCE,
+    TELEMETRY_SERIES_MAX_BUCKETS,
+)
+from app import pg_repository
+from app.ingest import IngestBufferFull, TelemetryIngestBuffer
+from app.service import (
+    SERIES_AGGREGATES,
+    get_latest_telemetry,
+    get_batch_telemetry,
+    get_latest_state,
+    get_batch_latest_state,
+    get_existing_robot_ids,
+    get_telemetry_series,
+    stream_batch_telemetry,
+)
+
+if TELEMETRY_LATEST_SOURCE == "state":
+    fetch_latest, fetch_batch_latest = get_latest_state, get_batch_latest_state
+    if DB_REPOSITORY == "asyncpg":
+        fetch_latest = pg_repository.get_latest_state
+else:
+    fetch_latest, fetch_batch_latest = get_latest_telemetry, get_batch_telemetry
+    if DB_REPOSITORY == "asyncpg":
+        fetch_latest = pg_repository.get_latest_telemetry
+
+latest_cache: LatestTelemetryCache | None = None
+ingest_buffer = TelemetryIngestBuffer(
+    TELEMETRY_INGEST_FLUSH_SIZE,
+    TELEMETRY_INGEST_FLUSH_INTERVAL,
+    TELEMETRY_INGEST_MAX_BUFFERED_ROWS,
+    TELEMETRY_INGEST_FLUSH_RETRIES,
+)
+# Robot IDs already confirmed to exist, so ingest only checks new ones
+known_robot_ids: Set[str] = set()
+ingest_records_adapter = TypeAdapter(List[TelemetryIngestRecord])
+ingest_record_adapter = TypeAdapter(TelemetryIngestRecord)
+
+BUCKET_PATTERN = re.compile(r"^(\d+)([smhd])$")
+BUCKET_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
-    Creates database tables on startup.
+    Creates or verifies the schema and warms the connection pool on
+    startup, starts the ingest flusher, and when enabled warms the
+    latest-telemetry cache and schedules telemetry partition maintenance.
     """
-    await create_tables()
+    global latest_cache
+    await prepare_database(prime=[
+        lambda session: fetch_latest(session, WARMUP_ROBOT_ID),
+        lambda session: fetch_batch_latest(session, [WARMUP_ROBOT_ID]),
+    ])
+    await ingest_buffer.start()
+    maintenance_task = None
+    if TELEMETRY_PARTITIONED:
+        maintenance_task = asyncio.create_task(
+            partition_maintenance_loop(engine, TELEMETRY_PARTITION_MAINTENANCE_INTERVAL)
+        )
+    if TELEMETRY_CACHE_ENABLED:
+        latest_cache = LatestTelemetryCache(
+            TELEMETRY_CACHE_REFRESH_INTERVAL,
+            TELEMETRY_CACHE_MAX_STALENESS,
+            TELEMETRY_CACHE_LOOKBACK,
+            TELEMETRY_CACHE_FULL_REFRESH_INTERVAL,
+        )
+        await latest_cache.start()
+    mark_ready()
     yield
+    if maintenance_task is not None:
+        maintenance_task.cancel()
+        try:
+            await maintenance_task
+        except asyncio.CancelledError:
+            pass
+    if latest_cache is not None:
+        await latest_cache.stop()
+    await ingest_buffer.stop()
+    await close_raw_pool()
+    await stop_replica_lag_monitor()
 
 
 app = FastAPI(
@@ -28,23 +130,30 @@ app = FastAPI(
 
 # Initialize Prometheus metrics
 Instrumentator().instrument(app).expose(app)
+app.add_middleware(StatementStatsMiddleware)
+app.add_middleware(RequestDeadlineMiddleware)
 
 
 @app.get("/health")
 async def health_check():
     """
     Health check endpoint.
+    Includes startup timing: schema and warmup phases, lifespan duration
+    and time from process start to ready.
     """
-    return {"status": "ok"}
+    return {"status": "ok", "startup": startup_report}
 
 
 @app.get("/telemetry/{robot_id}/latest", response_model=TelemetryResponse)
 async def get_latest_telemetry_for_robot(
-    robot_id: str, session: AsyncSession = Depends(get_session)
+    robot_id: str, request: Request, session: AsyncSession = Depends(get_read_session)
 ):
     """
     Retrieve the latest telemetry data for a specific robot.
 
+    The ETag is derived from (robot_id, timestamp), so a 304 is answered
+    without encoding the body. Supports If-None-Match.
+
     Args:
         robot_id: The robot identifier
 
@@ -55,33 +164,187 @@ async def get_latest_telemetry_for_robot(
         404: Telemetry data not found
     """
     try:
-        telemetry = await get_latest_telemetry(session, robot_id)
+        telemetry = None
+        if latest_cache is not None and latest_cache.ready:
+            telemetry = latest_cache.get(robot_id)
+        if telemetry is None:
+            telemetry = await fetch_latest(session, robot_id)
         if telemetry is None:
             raise HTTPException(
                 status_code=404, detail=f"Telemetry data not found for robot {robot_id}"
             )
-        return telemetry
+        # Rows can share a timestamp, so the values are part of the version
+        etag = version_etag(
+            robot_id,
+            telemetry.timestamp.isoformat(),
+            telemetry.battery_level,
+            telemetry.cpu_usage,
+            telemetry.temperature,
+        )
+        return conditional_response(request, telemetry, etag=etag)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get("/telemetry/{robot_id}/series", response_model=TelemetrySeriesResponse)
+async def get_telemetry_series_for_robot(
+    robot_id: str,
+    start: Optional[datetime] = Query(default=None, alias="from"),
+    end: Optional[datetime] = Query(default=None, alias="to"),
+    bucket: str = "1m",
+    agg: str = "avg,min,max",
+    session: AsyncSession = Depends(get_read_session),
+):
+    """
+    Retrieve downsampled telemetry for a robot as column arrays.
+
+    Args:
+        robot_id: The robot identifier
+        from: Range start (defaults to 24h before `to`)
+        to: Range end (defaults to now)
+        bucket: Bucket width such as 30s, 1m, 15m, 1h or 1d
+        agg: Comma-separated aggregates from avg, min, max
+
+    Returns:
+        Bucket timestamps, row counts and per-metric aggregate arrays
+
+    Raises:
+        422: Invalid bucket, aggregate or range
+    """
+    match = BUCKET_PATTERN.match(bucket)
+    if match is None or int(match.group(1)) == 0:
+        raise HTTPException(status_code=422, detail=f"Invalid bucket: {bucket}")
+    bucket_seconds = int(match.group(1)) * BUCKET_UNIT_SECONDS[match.group(2)]
+
+    aggregates = list(dict.fromkeys(a.strip() for a in agg.split(",") if a.strip()))
+    unknown = [a for a in aggregates if a not in SERIES_AGGREGATES]
+    if not aggregates or unknown:
+        raise HTTPException(status_code=422, detail=f"Invalid aggregates: {agg}")
+
+    end = to_naive_utc(end) or datetime.utcnow()
+    start = to_naive_utc(start) or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(status_code=422, detail="'from' must be before 'to'")
+    if (end - start).total_seconds() / bucket_seconds > TELEMETRY_SERIES_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Range spans more than {TELEMETRY_SERIES_MAX_BUCKETS} buckets",
+        )
+
+    try:
+        series = await get_telemetry_series(
+            session, robot_id, start, end, bucket_seconds, aggregates
+        )
+        return FastJSONResponse(series)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+async def _cached_batch(
+    session: AsyncSession, robot_ids: List[str]
+) -> Dict[str, Optional[TelemetryResponse]]:
+    telemetry = latest_cache.get_many(robot_ids)
+    missing = [robot_id for robot_id, value in telemetry.items() if value is None]
+    if missing:
+        telemetry.update(await fetch_batch_latest(session, missing))
+    return telemetry
+
+
+def _stream_cached(telemetry: Dict[str, Optional[TelemetryResponse]]) -> StreamingResponse:
+    lines = (dumps_line(t) for t in telemetry.values() if t is not None)
+    return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+
+
 @app.post("/telemetry/batch", response_model=Dict[str, Optional[TelemetryResponse]])
 async def get_batch_telemetry_data(
-    request: TelemetryBatchRequest, session: AsyncSession = Depends(get_session)
+    request: TelemetryBatchRequest,
+    accept: Optional[str] = Header(default=None),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Retrieve latest telemetry data for multiple robots in batch.
 
+    With Accept: application/x-ndjson the result is streamed as one
+    telemetry object per line, omitting robots without telemetry.
+
     Args:
         request: Batch request containing list of robot IDs
 
     Returns:
         Dictionary mapping robot_id to telemetry data (None if not found)
     """
+    cached = latest_cache is not None and latest_cache.ready
+    if wants_ndjson(accept):
+        if cached:
+            return _stream_cached(await _cached_batch(session, request.robot_ids))
+        return ndjson_response(
+            stream_batch_telemetry,
+            request.robot_ids,
+            TELEMETRY_LATEST_SOURCE == "state",
+            primary=True,
+        )
     try:
-        telemetry_data = await get_batch_telemetry(session, request.robot_ids)
-        return telemetry_data
+        if cached:
+            return FastJSONResponse(await _cached_batch(session, request.robot_ids))
+        telemetry_data = await fetch_batch_latest(session, request.robot_ids)
+        return FastJSONResponse(telemetry_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/telemetry/ingest", response_model=TelemetryIngestResponse, status_code=202)
+async def ingest_telemetry(request: Request, session: AsyncSession = Depends(get_session)):
+    """
+    Accept telemetry rows for buffered bulk insertion.
+
+    The body is either a JSON array of records or, with
+    Content-Type: application/x-ndjson, one JSON record per line.
+    Requests naming an unknown robot are rejected whole, before anything
+    is buffered.
+
+    Returns:
+        Number of rows accepted into the buffer
+
+    Raises:
+        422: Body could not be parsed or names unknown robots
+        429: Ingest buffer is full
+    """
+    body = await request.body()
+    try:
+        if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+            records = [
+                ingest_record_adapter.validate_json(line)
+                for line in body.splitlines()
+                if line.strip()
+            ]
+        else:
+            records = ingest_records_adapter.validate_json(body)
+    except ValidationError as e:
+        # The input may be raw bytes, which the error response cannot encode
+        raise HTTPException(
+            status_code=422, detail=e.errors(include_url=False, include_input=False)
+        )
+
+    unchecked = {record.robot_id for record in records} - known_robot_ids
+    if unchecked:
+        try:
+            known_robot_ids.update(await get_existing_robot_ids(session, unchecked))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        unknown = unchecked - known_robot_ids
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown robot_id: {', '.join(sorted(unknown))}"
+            )
+
+    try:
+        accepted = ingest_buffer.submit(records)
+    except IngestBufferFull:
+        raise HTTPException(
+            status_code=429,
+            detail="Ingest buffer full",
+            headers={"Retry-After": str(max(1, round(TELEMETRY_INGEST_FLUSH_INTERVAL)))},
+        )
+    return TelemetryIngestResponse(accepted=accepted)
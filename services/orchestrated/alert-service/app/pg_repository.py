@@ -0,0 +1,80 @@
+"""
+Raw asyncpg implementations of the hot alert lookups.
+
+Same signatures and return types as app.service; the session argument
+only picks the database, primary or read replica, whose raw pool is
+queried. Selected with DB_REPOSITORY=asyncpg.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.db.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from shared.db.raw import get_raw_pool
+from shared.resilience import statement_timeout
+from shared.schemas.alert import AlertPage, AlertResponse
+from datetime import datetime
+from typing import Optional
+
+
+def _alerts_by_robot_sql(with_since: bool, with_cursor: bool) -> str:
+    # One constant string per filter combination, so each gets its own
+    # prepared statement and plan instead of a catch-all "$n IS NULL OR ..."
+    conditions = ["robot_id = $1"]
+    if with_since:
+        conditions.append("created_at >= $3")
+    if with_cursor:
+        offset = 4 if with_since else 3
+        conditions.append(f"(created_at, id) < (${offset}, ${offset + 1})")
+    return (
+        "SELECT id, robot_id, severity, message, created_at FROM alerts"
+        f" WHERE {' AND '.join(conditions)}"
+        " ORDER BY created_at DESC, id DESC LIMIT $2"
+    )
+
+
+SELECT_ALERTS_BY_ROBOT = {
+    (with_since, with_cursor): _alerts_by_robot_sql(with_since, with_cursor)
+    for with_since in (False, True)
+    for with_cursor in (False, True)
+}
+
+
+async def get_alerts_by_robot(
+    session: AsyncSession,
+    robot_id: str,
+    limit: int = DEFAULT_PAGE_SIZE,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> AlertPage:
+    """
+    Fetch a page of alerts for a specific robot, newest first.
+
+    Args:
+        robot_id: The robot identifier
+        limit: Maximum number of alerts to return
+        since: Only include alerts created at or after this time
+        cursor: Resume after the position returned as next_cursor
+
+    Returns:
+        AlertPage of AlertResponse objects
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    args = [robot_id, limit + 1]
+    if since is not None:
+        args.append(since)
+    if cursor is not None:
+        args.extend(decode_cursor(cursor))
+    sql = SELECT_ALERTS_BY_ROBOT[since is not None, cursor is not None]
+
+    pool = await get_raw_pool(session)
+    records = await pool.fetch(sql, *args, timeout=statement_timeout())
+
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(records[-1]["created_at"], records[-1]["id"])
+
+    return AlertPage.model_construct(
+        items=[AlertResponse.model_construct(**record) for record in records],
+        next_cursor=next_cursor,
+    )
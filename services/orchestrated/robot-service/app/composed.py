@@ -0,0 +1,251 @@
+"""
+Single-statement SQL composition of the orchestrated endpoints.
+
+With ORCHESTRATION_MODE=sql the robot service answers the dashboard,
+monitor and critical-alerts endpoints straight from the shared database
+instead of calling the telemetry and alert services. Each endpoint is one
+statement: robots joined LATERAL to their latest telemetry and newest
+alerts, with Postgres building the JSON documents (json_agg for nested
+alert lists). The dashboard and critical-alerts arrays are streamed one
+document per row from a server-side cursor; the JSON text is never
+parsed, so this mode is the latency floor the HTTP fan-out modes are
+measured against.
+
+Payloads match the other modes field for field.
+"""
+import os
+from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple
+
+from sqlalchemy import Row, Select, Text, func, literal_column, select, true
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.db.database import read_session
+from shared.db.models import Alert, Robot, RobotLatestState, TelemetryData
+from shared.db.pagination import DEFAULT_PAGE_SIZE, after_cursor, encode_cursor, to_naive_utc
+from shared.ndjson import STREAM_YIELD_PER
+
+# Where latest telemetry is read from; keep in step with the telemetry
+# service's setting so every mode returns the same data
+TELEMETRY_LATEST_SOURCE = os.getenv("TELEMETRY_LATEST_SOURCE", "state")
+
+# Robots shown on the dashboard, as in the fan-out modes
+DASHBOARD_ROBOTS = 15
+
+EMPTY_JSON_ARRAY = literal_column("'[]'::json")
+
+
+def _robot_json(robot, *extra):
+    return func.json_build_object(
+        "id", robot.c.id,
+        "name", robot.c.name,
+        "model", robot.c.model,
+        "location", robot.c.location,
+        "status", robot.c.status,
+        *extra,
+    )
+
+
+def _latest_telemetry(robot_id):
+    """LATERAL yielding the robot's latest telemetry as a JSON column, or no row."""
+    source = RobotLatestState if TELEMETRY_LATEST_SOURCE == "state" else TelemetryData
+    stmt = select(
+        func.json_build_object(
+            "robot_id", source.robot_id,
+            "battery_level", source.battery_level,
+            "cpu_usage", source.cpu_usage,
+            "temperature", source.temperature,
+            "timestamp", source.timestamp,
+        ).label("telemetry")
+    ).where(source.robot_id == robot_id)
+    if source is RobotLatestState:
+        stmt = stmt.where(RobotLatestState.timestamp.isnot(None))
+    else:
+        stmt = stmt.order_by(TelemetryData.timestamp.desc()).limit(1)
+    return stmt.lateral("latest")
+
+
+def _recent_alerts(robot_id):
+    """LATERAL yielding the robot's first /alerts page as a JSON array column."""
+    # Nested one level down, so correlate to the outer robot row explicitly
+    page = (
+        select(Alert.id, Alert.robot_id, Alert.severity, Alert.message, Alert.created_at)
+        .where(Alert.robot_id == robot_id)
+        .order_by(Alert.created_at.desc(), Alert.id.desc())
+        .limit(DEFAULT_PAGE_SIZE)
+        .correlate_except(Alert)
+        .subquery("page")
+    )
+    alert = func.json_build_object(
+        "id", page.c.id,
+        "robot_id", page.c.robot_id,
+        "severity", page.c.severity,
+        "message", page.c.message,
+        "created_at", page.c.created_at,
+    )
+    ordered = aggregate_order_by(alert, page.c.created_at.desc(), page.c.id.desc())
+    return select(
+        func.coalesce(func.json_agg(ordered), EMPTY_JSON_ARRAY).label("alerts")
+    ).lateral("recent_alerts")
+
+
+def _monitor_select(robots):
+    """
+    Robot document with telemetry and alerts, and the FROM clause it needs.
+
+    Returns:
+        (json_build_object expression, robots joined to both LATERALs)
+    """
+    latest = _latest_telemetry(robots.c.id)
+    alerts = _recent_alerts(robots.c.id)
+    document = _robot_json(robots, "telemetry", latest.c.telemetry, "alerts", alerts.c.alerts)
+    return document, robots.outerjoin(latest, true()).join(alerts, true())
+
+
+async def _stream_rows(stmt: Select, primary: bool) -> AsyncIterator[Row]:
+    # The session lives in the generator: request-scoped dependencies are
+    # closed before a streaming body is sent (see shared.ndjson)
+    async with read_session(primary) as session:
+        result = await session.stream(stmt.execution_options(yield_per=STREAM_YIELD_PER))
+        async for row in result:
+            yield row
+
+
+async def _json_array(first: Optional[Row], rows: AsyncIterator[Row]) -> AsyncIterator[bytes]:
+    if first is None:
+        yield b"[]"
+        return
+    yield b"[" + first.document.encode()
+    async for row in rows:
+        yield b"," + row.document.encode()
+    yield b"]"
+
+
+async def _start_stream(stmt: Select, primary: bool) -> Tuple[Optional[Row], AsyncIterator[bytes]]:
+    """
+    Run stmt and read its first row before anything is sent.
+
+    Errors in the statement therefore surface before the response starts,
+    and the first row can supply response headers.
+
+    Returns:
+        (first row or None, the JSON array body made of each row's document)
+    """
+    rows = _stream_rows(stmt, primary)
+    first = await anext(rows, None)
+    return first, _json_array(first, rows)
+
+
+async def stream_dashboard_json(primary: bool = False) -> AsyncIterator[bytes]:
+    """
+    Stream the dashboard payload from one statement, one robot document per row.
+
+    Args:
+        primary: Read from the primary even when replicas are configured
+
+    Returns:
+        JSON array body: the first robots by ID with telemetry and alerts
+    """
+    robots = select(Robot).order_by(Robot.id).limit(DASHBOARD_ROBOTS).subquery("robots")
+    document, source = _monitor_select(robots)
+    stmt = (
+        select(document.cast(Text).label("document"))
+        .select_from(source)
+        .order_by(robots.c.id)
+    )
+    _, body = await _start_stream(stmt, primary)
+    return body
+
+
+async def get_robot_monitor_json(session: AsyncSession, robot_id: str) -> Optional[str]:
+    """
+    Build one robot's monitor payload in one statement.
+
+    Args:
+        robot_id: The robot identifier
+
+    Returns:
+        JSON object text, or None if the robot does not exist
+    """
+    robots = select(Robot).where(Robot.id == robot_id).subquery("robots")
+    document, source = _monitor_select(robots)
+    stmt = select(document.cast(Text)).select_from(source)
+    return (await session.execute(stmt)).scalar_one_or_none()
+
+
+async def stream_critical_alerts_json(
+    limit: int = DEFAULT_PAGE_SIZE,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    primary: bool = False,
+) -> Tuple[AsyncIterator[bytes], Optional[str]]:
+    """
+    Stream a critical-alerts page with robot and telemetry context from one
+    statement, one alert document per row.
+
+    The page is read with one extra row. Every row also carries the page's
+    last position and whether the extra row exists (evaluated once), so the
+    next cursor is known from the first row, before the body is sent.
+
+    Args:
+        limit: Maximum number of alerts to return
+        since: Only include alerts created at or after this time
+        cursor: Resume after the position returned as the next cursor
+        primary: Read from the primary even when replicas are configured
+
+    Returns:
+        (JSON array body, next cursor or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    page = select(
+        Alert.id,
+        Alert.robot_id,
+        Alert.severity,
+        Alert.message,
+        Alert.created_at,
+        func.row_number().over(
+            order_by=(Alert.created_at.desc(), Alert.id.desc())
+        ).label("position"),
+    ).where(Alert.severity == "critical")
+    if since is not None:
+        page = page.where(Alert.created_at >= to_naive_utc(since))
+    if cursor is not None:
+        page = page.where(after_cursor(Alert.created_at, Alert.id, cursor))
+    page = (
+        page.order_by(Alert.created_at.desc(), Alert.id.desc()).limit(limit + 1).cte("page")
+    )
+
+    robots = Robot.__table__
+    # NULL when the alert's robot no longer exists, as in the other modes
+    robot = select(_robot_json(robots)).where(robots.c.id == page.c.robot_id).scalar_subquery()
+    latest = _latest_telemetry(page.c.robot_id)
+    item = func.json_build_object(
+        "alert_id", page.c.id,
+        "robot_id", page.c.robot_id,
+        "severity", page.c.severity,
+        "message", page.c.message,
+        "created_at", page.c.created_at,
+        "robot", robot,
+        "telemetry", latest.c.telemetry,
+    )
+    last = page.c.position == limit
+    stmt = (
+        select(
+            item.cast(Text).label("document"),
+            select(page.c.created_at).where(last).scalar_subquery().label("last_created_at"),
+            select(page.c.id).where(last).scalar_subquery().label("last_id"),
+            (select(func.count()).select_from(page).scalar_subquery() > limit).label("has_more"),
+        )
+        .select_from(page.outerjoin(latest, true()))
+        .where(page.c.position <= limit)
+        .order_by(page.c.position)
+    )
+
+    first, body = await _start_stream(stmt, primary)
+    next_cursor = None
+    if first is not None and first.has_more:
+        next_cursor = encode_cursor(first.last_created_at, first.last_id)
+    return body, next_cursor
@@ -1,27 +1,55 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException
+from datetime import datetime
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from prometheus_fastapi_instrumentator import Instrumentator
-from typing import List, Dict, Any
-
-from shared.db.database import get_session, create_tables
-from shared.schemas.robot import RobotResponse
-from app.service import get_all_robots, get_robot_by_id
+from typing import List, Dict, Any, Optional
+
+from shared.config import DB_REPOSITORY
+from shared.db.database import get_read_session, pins_primary, stop_replica_lag_monitor
+from shared.db.raw import close_raw_pool
+from shared.db.startup import WARMUP_ROBOT_ID, mark_ready, prepare_database, startup_report
+from shared.db.statement_metrics import StatementStatsMiddleware
+from shared.resilience import RequestDeadlineMiddleware
+from shared.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER
+from shared.responses import FastJSONResponse, conditional_response
+from shared.schemas.robot import RobotBatchRequest, RobotResponse
+from shared.http_clients import http_clients
+from app.composed import get_robot_monitor_json, stream_critical_alerts_json, stream_dashboard_json
 from app.orchestrator import (
+    ALERT_SERVICE_URL,
+    ORCHESTRATION_MODE,
+    TELEMETRY_SERVICE_URL,
+    check_orchestration_mode,
     get_dashboard_data,
     get_robot_monitor_data,
     get_critical_alerts_with_context,
 )
 
+if DB_REPOSITORY == "asyncpg":
+    from app.pg_repository import get_all_robots, get_robot_by_id, get_robots_by_ids
+else:
+    from app.service import get_all_robots, get_robot_by_id, get_robots_by_ids
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Application lifespan manager.
-    Creates database tables on startup.
+    Creates or verifies the schema and warms the connection pool on startup,
+    and opens the pooled clients used to reach telemetry and alert services.
+    Refuses to start with an unknown ORCHESTRATION_MODE.
     """
-    await create_tables()
+    check_orchestration_mode()
+    await prepare_database(prime=[lambda session: get_robot_by_id(session, WARMUP_ROBOT_ID)])
+    http_clients.register("telemetry", TELEMETRY_SERVICE_URL)
+    http_clients.register("alert", ALERT_SERVICE_URL)
+    mark_ready()
     yield
+    await http_clients.aclose()
+    await close_raw_pool()
+    await stop_replica_lag_monitor()
 
 
 app = FastAPI(
@@ -33,33 +61,59 @@ app = FastAPI(
 
 # Initialize Prometheus metrics
 Instrumentator().instrument(app).expose(app)
+app.add_middleware(StatementStatsMiddleware)
+app.add_middleware(RequestDeadlineMiddleware)
 
 
 @app.get("/health")
 async def health_check():
     """
     Health check endpoint.
+    Includes startup timing: schema and warmup phases, lifespan duration
+    and time from process start to ready.
     """
-    return {"status": "ok"}
+    return {"status": "ok", "startup": startup_report}
 
 
 @app.get("/robots", response_model=List[RobotResponse])
-async def list_robots(session: AsyncSession = Depends(get_session)):
+async def list_robots(
+    request: Request,
+    ids: Optional[str] = Query(default=None, description="Comma-separated robot IDs"),
+    session: AsyncSession = Depends(get_read_session),
+):
+    try:
+        if ids is not None:
+            found = await get_robots_by_ids(session, [i for i in ids.split(",") if i])
+            robots = [robot for robot in found.values() if robot is not None]
+        else:
+            robots = await get_all_robots(session)
+        return conditional_response(request, robots)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@app.post("/robots/batch", response_model=Dict[str, Optional[RobotResponse]])
+async def get_robots_batch(
+    request: RobotBatchRequest, session: AsyncSession = Depends(get_read_session)
+):
     try:
-        robots = await get_all_robots(session)
-        return robots
+        robots = await get_robots_by_ids(session, request.robot_ids)
+        return FastJSONResponse(robots)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 # Static routes MUST come before parameterized routes
 @app.get("/robots/dashboard", response_model=List[Dict[str, Any]])
-async def get_dashboard(session: AsyncSession = Depends(get_session)):
+async def get_dashboard(request: Request, session: AsyncSession = Depends(get_read_session)):
     """
     Get dashboard data for all robots with telemetry and alerts.
     Demonstrates N+1 problem: 1 + 15 + 15 = 31 calls.
     """
     try:
+        if ORCHESTRATION_MODE == "sql":
+            body = await stream_dashboard_json(pins_primary(request))
+            return StreamingResponse(body, media_type="application/json")
         dashboard_data = await get_dashboard_data(session)
         return dashboard_data
     except Exception as e:
@@ -67,25 +121,49 @@ async def get_dashboard(session: AsyncSession = Depends(get_session)):
 
 
 @app.get("/robots/alerts/critical", response_model=List[Dict[str, Any]])
-async def get_critical_alerts(session: AsyncSession = Depends(get_session)):
+async def get_critical_alerts(
+    request: Request,
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+):
     """
-    Get all critical alerts with robot and telemetry context.
-    Demonstrates N+1 problem: 2N+1 calls for N critical alerts.
+    Get a page of critical alerts with robot and telemetry context.
+    Demonstrates N+1 problem: 2N+1 calls for N critical alerts on the page.
+    X-Next-Cursor is set when more alerts remain.
     """
     try:
-        alerts_data = await get_critical_alerts_with_context(session)
+        if ORCHESTRATION_MODE == "sql":
+            body, next_cursor = await stream_critical_alerts_json(
+                limit, since, cursor, pins_primary(request)
+            )
+            response = StreamingResponse(body, media_type="application/json")
+            if next_cursor is not None:
+                response.headers[NEXT_CURSOR_HEADER] = next_cursor
+            return response
+        alerts_data, next_cursor = await get_critical_alerts_with_context(
+            session, limit, since, cursor
+        )
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return alerts_data
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
 @app.get("/robots/{robot_id}", response_model=RobotResponse)
-async def get_robot(robot_id: str, session: AsyncSession = Depends(get_session)):
+async def get_robot(
+    robot_id: str, request: Request, session: AsyncSession = Depends(get_read_session)
+):
     try:
         robot = await get_robot_by_id(session, robot_id)
         if robot is None:
             raise HTTPException(status_code=404, detail=f"Robot {robot_id} not found")
-        return robot
+        return conditional_response(request, robot)
     except HTTPException:
         raise
     except Exception as e:
@@ -93,12 +171,17 @@ async def get_robot(robot_id: str, session: AsyncSession = Depends(get_session))
 
 
 @app.get("/robots/{robot_id}/monitor", response_model=Dict[str, Any])
-async def get_robot_monitor(robot_id: str, session: AsyncSession = Depends(get_session)):
+async def get_robot_monitor(robot_id: str, session: AsyncSession = Depends(get_read_session)):
     """Get monitoring data for a single robot. Makes 3 separate calls."""
     try:
-        monitor_data = await get_robot_monitor_data(session, robot_id)
+        if ORCHESTRATION_MODE == "sql":
+            monitor_data = await get_robot_monitor_json(session, robot_id)
+        else:
+            monitor_data = await get_robot_monitor_data(session, robot_id)
         if monitor_data is None:
             raise HTTPException(status_code=404, detail=f"Robot {robot_id} not found")
+        if ORCHESTRATION_MODE == "sql":
+            return Response(monitor_data, media_type="application/json")
         return monitor_data
     except HTTPException:
         raise
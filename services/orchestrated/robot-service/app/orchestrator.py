@@ -1,23 +1,160 @@
+import asyncio
 import os
-import httpx
-from typing import List, Dict, Optional, Any
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.service import get_all_robots, get_robot_by_id
+from app.service import get_all_robots, get_robot_by_id, get_robots_by_ids
 from sqlalchemy import select
 from shared.db.models import Alert
+from shared.db.pagination import DEFAULT_PAGE_SIZE, after_cursor, encode_cursor, to_naive_utc
+from shared.http_clients import http_clients
+from shared.resilience import mark_degraded
 
-# Environment variables for service URLs
+# Environment variables for service URLs, registered as the "telemetry" and
+# "alert" pooled clients in the app lifespan
 TELEMETRY_SERVICE_URL = os.getenv("TELEMETRY_SERVICE_URL", "http://localhost:10002")
 ALERT_SERVICE_URL = os.getenv("ALERT_SERVICE_URL", "http://localhost:10003")
 
+# How per-robot telemetry and alerts are fetched:
+#   "sequential" - one call at a time, per robot (the N+1 baseline)
+#   "concurrent" - the same per-robot calls, at most ORCHESTRATION_CONCURRENCY in flight
+#   "batch"      - one POST /telemetry/batch and one POST /alerts/batch per request
+#   "sql"        - no service calls; one SQL statement per endpoint (see app.composed)
+ORCHESTRATION_MODES = ("sequential", "concurrent", "batch", "sql")
+ORCHESTRATION_MODE = os.getenv("ORCHESTRATION_MODE", "sequential")
+ORCHESTRATION_CONCURRENCY = int(os.getenv("ORCHESTRATION_CONCURRENCY", "10"))
+
+RobotContext = Tuple[Dict[str, Optional[Dict[str, Any]]], Dict[str, List[Dict[str, Any]]]]
+
+
+def check_orchestration_mode() -> None:
+    """
+    Fail startup on a mistyped ORCHESTRATION_MODE instead of silently
+    running another mode.
+
+    Raises:
+        RuntimeError: If ORCHESTRATION_MODE is not one of ORCHESTRATION_MODES
+    """
+    if ORCHESTRATION_MODE not in ORCHESTRATION_MODES:
+        raise RuntimeError(
+            f"Unknown ORCHESTRATION_MODE={ORCHESTRATION_MODE!r}; "
+            f"expected one of {', '.join(ORCHESTRATION_MODES)}"
+        )
+
+
+# Context is optional: when an upstream fails, times out or has its circuit
+# open, the response is built without its data and reported as degraded
+
+
+async def _get_json(upstream: str, path: str, default: Any) -> Any:
+    try:
+        response = await http_clients.hedged_get(upstream, path)
+        if response.status_code == 200:
+            return response.json()
+        if response.status_code >= 500:
+            mark_degraded(upstream)
+    except Exception:
+        mark_degraded(upstream)
+    return default
+
+
+async def _post_json(upstream: str, path: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        response = await http_clients.get(upstream).post(path, json=body)
+        if response.status_code == 200:
+            return response.json()
+        mark_degraded(upstream)
+    except Exception:
+        mark_degraded(upstream)
+    return {}
+
+
+async def _fetch_robot_context(robot_ids: List[str], with_alerts: bool = True) -> RobotContext:
+    """
+    Fetch latest telemetry, and optionally alerts, for robots.
+
+    The calls are made according to ORCHESTRATION_MODE. Sequential mode
+    calls once per listed ID, duplicates included; the other modes
+    collapse duplicates first.
+
+    Args:
+        robot_ids: Robot identifiers to fetch context for
+        with_alerts: Also fetch each robot's first page of alerts
+
+    Returns:
+        (telemetry by robot_id, None when missing;
+         alerts by robot_id, empty when missing or not requested)
+    """
+    telemetry: Dict[str, Optional[Dict[str, Any]]] = {}
+    alerts: Dict[str, List[Dict[str, Any]]] = {}
+
+    def telemetry_path(robot_id: str) -> str:
+        return f"/telemetry/{robot_id}/latest"
+
+    def alerts_path(robot_id: str) -> str:
+        return f"/alerts/{robot_id}"
+
+    if ORCHESTRATION_MODE == "batch":
+        unique_ids = list(dict.fromkeys(robot_ids))
+        calls = [_post_json("telemetry", "/telemetry/batch", {"robot_ids": unique_ids})]
+        if with_alerts:
+            calls.append(_post_json(
+                "alert",
+                "/alerts/batch",
+                {"robot_ids": unique_ids, "limit_per_robot": DEFAULT_PAGE_SIZE},
+            ))
+        results = await asyncio.gather(*calls)
+        for robot_id in unique_ids:
+            telemetry[robot_id] = results[0].get(robot_id)
+            if with_alerts:
+                alerts[robot_id] = results[1].get(robot_id, [])
+
+    elif ORCHESTRATION_MODE == "concurrent":
+        unique_ids = list(dict.fromkeys(robot_ids))
+        semaphore = asyncio.Semaphore(ORCHESTRATION_CONCURRENCY)
+
+        async def bounded(upstream: str, path: str, default: Any) -> Any:
+            async with semaphore:
+                return await _get_json(upstream, path, default)
+
+        telemetry_calls = [
+            bounded("telemetry", telemetry_path(robot_id), None) for robot_id in unique_ids
+        ]
+        alert_calls = []
+        if with_alerts:
+            alert_calls = [bounded("alert", alerts_path(robot_id), []) for robot_id in unique_ids]
+        results = await asyncio.gather(*telemetry_calls, *alert_calls)
+        telemetry = dict(zip(unique_ids, results[:len(unique_ids)]))
+        if with_alerts:
+            alerts = dict(zip(unique_ids, results[len(unique_ids):]))
+
+    else:
+        for robot_id in robot_ids:
+            telemetry[robot_id] = await _get_json("telemetry", telemetry_path(robot_id), None)
+            if with_alerts:
+                alerts[robot_id] = await _get_json("alert", alerts_path(robot_id), [])
+
+    return telemetry, alerts
+
+
+def _robot_dict(robot) -> Dict[str, Any]:
+    return {
+        "id": robot.id,
+        "name": robot.name,
+        "model": robot.model,
+        "location": robot.location,
+        "status": robot.status,
+    }
+
 
 async def get_dashboard_data(session: AsyncSession) -> List[Dict[str, Any]]:
     """
     Get dashboard data for all robots (first 15).
     Demonstrates N+1 problem: fetches robots, then makes individual calls for each robot's data.
 
-    This intentionally uses sequential calls (not asyncio.gather) to maximize N+1 overhead.
+    In the default sequential ORCHESTRATION_MODE the per-robot calls run one
+    after another (not asyncio.gather) to maximize N+1 overhead.
 
     Returns:
         List of robot data with telemetry and alerts
@@ -26,44 +163,16 @@ async def get_dashboard_data(session: AsyncSession) -> List[Dict[str, Any]]:
     robots = await get_all_robots(session)
     robots_limited = robots[:15]
 
-    dashboard_data = []
-
-    # N+1: Individual sequential calls for each robot
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for robot in robots_limited:
-            robot_data = {
-                "id": robot.id,
-                "name": robot.name,
-                "model": robot.model,
-                "location": robot.location,
-                "status": robot.status,
-                "telemetry": None,
-                "alerts": [],
-            }
-
-            # Call 1: Get telemetry for this robot
-            try:
-                telemetry_response = await client.get(
-                    f"{TELEMETRY_SERVICE_URL}/telemetry/{robot.id}/latest"
-                )
-                if telemetry_response.status_code == 200:
-                    robot_data["telemetry"] = telemetry_response.json()
-            except Exception:
-                pass  # Telemetry is optional
-
-            # Call 2: Get alerts for this robot
-            try:
-                alerts_response = await client.get(
-                    f"{ALERT_SERVICE_URL}/alerts/{robot.id}"
-                )
-                if alerts_response.status_code == 200:
-                    robot_data["alerts"] = alerts_response.json()
-            except Exception:
-                pass  # Alerts are optional
-
-            dashboard_data.append(robot_data)
-
-    return dashboard_data
+    telemetry, alerts = await _fetch_robot_context([robot.id for robot in robots_limited])
+
+    return [
+        {
+            **_robot_dict(robot),
+            "telemetry": telemetry.get(robot.id),
+            "alerts": alerts.get(robot.id, []),
+        }
+        for robot in robots_limited
+    ]
 
 
 async def get_robot_monitor_data(
@@ -71,7 +180,8 @@ async def get_robot_monitor_data(
 ) -> Optional[Dict[str, Any]]:
     """
     Get monitoring data for a single robot.
-    Makes 3 separate calls: robot info, telemetry, alerts.
+    Makes 3 separate calls: robot info, telemetry, alerts. Telemetry and
+    alerts are fetched according to ORCHESTRATION_MODE.
 
     Args:
         robot_id: The robot identifier
@@ -84,89 +194,84 @@ async def get_robot_monitor_data(
     if robot is None:
         return None
 
-    robot_data = {
-        "id": robot.id,
-        "name": robot.name,
-        "model": robot.model,
-        "location": robot.location,
-        "status": robot.status,
-        "telemetry": None,
-        "alerts": [],
+    # Calls 2 and 3: Get telemetry and alerts
+    telemetry, alerts = await _fetch_robot_context([robot_id])
+
+    return {
+        **_robot_dict(robot),
+        "telemetry": telemetry.get(robot_id),
+        "alerts": alerts.get(robot_id, []),
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        # Call 2: Get telemetry
-        try:
-            telemetry_response = await client.get(
-                f"{TELEMETRY_SERVICE_URL}/telemetry/{robot_id}/latest"
-            )
-            if telemetry_response.status_code == 200:
-                robot_data["telemetry"] = telemetry_response.json()
-        except Exception:
-            pass
-
-        # Call 3: Get alerts
-        try:
-            alerts_response = await client.get(
-                f"{ALERT_SERVICE_URL}/alerts/{robot_id}"
-            )
-            if alerts_response.status_code == 200:
-                robot_data["alerts"] = alerts_response.json()
-        except Exception:
-            pass
-
-    return robot_data
-
-
-async def get_critical_alerts_with_context(session: AsyncSession) -> List[Dict[str, Any]]:
+
+async def get_critical_alerts_with_context(
+    session: AsyncSession,
+    limit: int = DEFAULT_PAGE_SIZE,
+    since: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
     """
-    Get all critical alerts with robot and telemetry context.
+    Get a page of critical alerts with robot and telemetry context.
     Demonstrates N+1: gets critical alerts, then fetches robot + telemetry for each.
+    The page size bounds the fan-out.
+
+    In sequential ORCHESTRATION_MODE each alert looks up its robot and
+    telemetry separately. The other modes load the page's distinct robots
+    in one query and fetch their telemetry concurrently or in one batch.
+
+    Args:
+        limit: Maximum number of alerts to return
+        since: Only include alerts created at or after this time
+        cursor: Resume after the position returned as the next cursor
 
     Returns:
-        List of critical alerts with robot and telemetry data
+        (critical alerts with robot and telemetry data, next cursor or None)
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
     # Get critical alerts directly from database
-    stmt = select(Alert).where(Alert.severity == "critical").order_by(Alert.created_at.desc())
+    stmt = select(
+        Alert.id, Alert.robot_id, Alert.severity, Alert.message, Alert.created_at
+    ).where(Alert.severity == "critical")
+    if since is not None:
+        stmt = stmt.where(Alert.created_at >= to_naive_utc(since))
+    if cursor is not None:
+        stmt = stmt.where(after_cursor(Alert.created_at, Alert.id, cursor))
+    stmt = stmt.order_by(Alert.created_at.desc(), Alert.id.desc()).limit(limit + 1)
     result = await session.execute(stmt)
-    critical_alerts = result.scalars().all()
+    critical_alerts = result.all()
+
+    next_cursor = None
+    if len(critical_alerts) > limit:
+        critical_alerts = critical_alerts[:limit]
+        next_cursor = encode_cursor(critical_alerts[-1].created_at, critical_alerts[-1].id)
+
+    robot_ids = [alert.robot_id for alert in critical_alerts]
+
+    # Call 1: Get robot info
+    if ORCHESTRATION_MODE == "sequential":
+        # N+1: one lookup per alert, even for repeated robots
+        robots = {}
+        for robot_id in robot_ids:
+            robots[robot_id] = await get_robot_by_id(session, robot_id)
+    else:
+        robots = await get_robots_by_ids(session, robot_ids)
+
+    # Call 2: Get telemetry
+    telemetry, _ = await _fetch_robot_context(robot_ids, with_alerts=False)
 
     alerts_with_context = []
+    for alert in critical_alerts:
+        robot = robots.get(alert.robot_id)
+        alerts_with_context.append({
+            "alert_id": alert.id,
+            "robot_id": alert.robot_id,
+            "severity": alert.severity,
+            "message": alert.message,
+            "created_at": alert.created_at.isoformat(),
+            "robot": _robot_dict(robot) if robot else None,
+            "telemetry": telemetry.get(alert.robot_id),
+        })
 
-    # N+1: Individual sequential calls for each alert's robot
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        for alert in critical_alerts:
-            alert_data = {
-                "alert_id": alert.id,
-                "robot_id": alert.robot_id,
-                "severity": alert.severity,
-                "message": alert.message,
-                "created_at": alert.created_at.isoformat(),
-                "robot": None,
-                "telemetry": None,
-            }
-
-            # Call 1: Get robot info
-            robot = await get_robot_by_id(session, alert.robot_id)
-            if robot:
-                alert_data["robot"] = {
-                    "id": robot.id,
-                    "name": robot.name,
-                    "model": robot.model,
-                    "location": robot.location,
-                    "status": robot.status,
-                }
-
-            # Call 2: Get telemetry
-            try:
-                telemetry_response = await client.get(
-                    f"{TELEMETRY_SERVICE_URL}/telemetry/{alert.robot_id}/latest"
-                )
-                if telemetry_response.status_code == 200:
-                    alert_data["telemetry"] = telemetry_response.json()
-            except Exception:
-                pass
-
-            alerts_with_context.append(alert_data)
-
-    return alerts_with_context
+    return alerts_with_context, next_cursor
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from shared.db.database import async_session
+from shared.schemas.telemetry import TelemetryResponse
+from app.service import (
+    get_fleet_latest_telemetry,
+    get_latest_telemetry_since,
+    get_telemetry_watermark,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = Counter(
+    "telemetry_cache_requests_total",
+    "Latest-telemetry cache lookups by result",
+    ["result"],
+)
+CACHE_ENTRIES = Gauge(
+    "telemetry_cache_entries",
+    "Robots currently held in the latest-telemetry cache",
+)
+CACHE_STALENESS = Gauge(
+    "telemetry_cache_staleness_seconds",
+    "Seconds since the latest-telemetry cache last refreshed successfully",
+)
+CACHE_REFRESH_SECONDS = Histogram(
+    "telemetry_cache_refresh_seconds",
+    "Duration of latest-telemetry cache refreshes",
+    ["kind"],
+)
+
+
+class _Entry(NamedTuple):
+    battery_level: float
+    cpu_usage: float
+    temperature: float
+    timestamp: datetime
+
+
+class LatestTelemetryCache:
+    """
+    In-process latest-state cache keyed by robot_id.
+
+    Warmed from robot_latest_state, then kept current by a background task
+    that polls the telemetry max(id) watermark and loads rows past it.
+
+    Ids are assigned at insert but rows become visible at commit, so a
+    concurrent writer can commit a lower id after a higher one has been
+    seen. Each refresh therefore re-reads from the watermark observed
+    `lookback` seconds earlier (merging is idempotent on timestamp), and
+    every `full_refresh_interval` the cache is re-warmed from
+    robot_latest_state, which the triggers keep in commit order.
+    Robots absent from the cache are the caller's to look up in the DB.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float,
+        max_staleness: float,
+        lookback: float = 5.0,
+        full_refresh_interval: float = 60.0,
+    ):
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self.lookback = lookback
+        self.full_refresh_interval = full_refresh_interval
+        self._entries: Dict[str, _Entry] = {}
+        # (time.monotonic(), watermark) pairs seen within the lookback window
+        self._watermarks: Deque[Tuple[float, int]] = deque()
+        self._warmed_at = 0.0
+        self._refreshed_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        CACHE_STALENESS.set_function(self.staleness)
+
+    def staleness(self) -> float:
+        """Seconds since the last successful refresh (inf before warmup)."""
+        if self._refreshed_at is None:
+            return float("inf")
+        return time.monotonic() - self._refreshed_at
+
+    @property
+    def ready(self) -> bool:
+        """True when the cache is warm and fresh enough to answer reads."""
+        return self.staleness() <= self.max_staleness
+
+    def get(self, robot_id: str) -> Optional[TelemetryResponse]:
+        entry = self._entries.get(robot_id)
+        if entry is None:
+            CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        CACHE_REQUESTS.labels(result="hit").inc()
+        return TelemetryResponse.model_construct(robot_id=robot_id, **entry._asdict())
+
+    def get_many(self, robot_ids: List[str]) -> Dict[str, Optional[TelemetryResponse]]:
+        return {robot_id: self.get(robot_id) for robot_id in robot_ids}
+
+    def _merge(self, rows: List[TelemetryResponse]) -> None:
+        for row in rows:
+            current = self._entries.get(row.robot_id)
+            if current is None or row.timestamp >= current.timestamp:
+                self._entries[row.robot_id] = _Entry(
+                    row.battery_level, row.cpu_usage, row.temperature, row.timestamp
+                )
+        CACHE_ENTRIES.set(len(self._entries))
+
+    async def warm(self) -> None:
+        """Load the latest row for every robot."""
+        with CACHE_REFRESH_SECONDS.labels(kind="full").time():
+            async with async_session() as session:
+                watermark = await get_telemetry_watermark(session)
+                rows = await get_fleet_latest_telemetry(session)
+        self._entries.clear()
+        self._merge(rows)
+        now = time.monotonic()
+        self._watermarks = deque([(now, watermark)])
+        self._warmed_at = self._refreshed_at = now
+
+    def _lookback_floor(self, now: float) -> int:
+        """The newest watermark seen at least `lookback` seconds ago."""
+        cutoff = now - self.lookback
+        while len(self._watermarks) > 1 and self._watermarks[1][0] <= cutoff:
+            self._watermarks.popleft()
+        return self._watermarks[0][1]
+
+    async def refresh(self) -> None:
+        """Merge rows past the lookback floor, or re-warm when a full refresh is due."""
+        now = time.monotonic()
+        if now - self._warmed_at >= self.full_refresh_interval:
+            await self.warm()
+            return
+        with CACHE_REFRESH_SECONDS.labels(kind="incremental").time():
+            async with async_session() as session:
+                watermark = await get_telemetry_watermark(session)
+                floor = self._lookback_floor(now)
+                if watermark != floor:
+                    rows = await get_latest_telemetry_since(session, floor, watermark)
+                    self._merge(rows)
+        self._watermarks.append((now, watermark))
+        self._refreshed_at = time.monotonic()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Latest-telemetry cache refresh failed")
+
+    async def start(self) -> None:
+        await self.warm()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,200 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from shared.db.database import engine
+from shared.db.models import TelemetryData
+from shared.schemas.telemetry import TelemetryIngestRecord
+
+logger = logging.getLogger(__name__)
+
+INGEST_ROWS = Counter(
+    "telemetry_ingest_rows_total",
+    "Telemetry rows handled by the ingest buffer by outcome",
+    ["outcome"],
+)
+INGEST_BUFFERED = Gauge(
+    "telemetry_ingest_buffered_rows",
+    "Telemetry rows waiting in the ingest buffer",
+)
+INGEST_FLUSH_SECONDS = Histogram(
+    "telemetry_ingest_flush_seconds",
+    "Duration of ingest buffer flushes",
+)
+
+COLUMNS = ["robot_id", "battery_level", "cpu_usage", "temperature", "timestamp"]
+
+Row = Tuple[str, float, float, float, datetime]
+
+
+class IngestBufferFull(Exception):
+    """Raised when accepting a batch would exceed the buffer capacity."""
+
+
+def is_row_error(exc: BaseException) -> bool:
+    """
+    True when a write failed because of the rows themselves.
+
+    Covers SQLAlchemy data and integrity errors and, for asyncpg COPY (which
+    raises driver exceptions directly), SQLSTATE classes 22 and 23.
+    """
+    if isinstance(exc, (DataError, IntegrityError)):
+        return True
+    sqlstate = getattr(exc, "sqlstate", None)
+    return isinstance(sqlstate, str) and sqlstate[:2] in ("22", "23")
+
+
+def to_row(record: TelemetryIngestRecord, received_at: datetime) -> Row:
+    """Convert an ingest record to a COPY-ready tuple with a naive UTC timestamp."""
+    timestamp = record.timestamp or received_at
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (
+        record.robot_id,
+        record.battery_level,
+        record.cpu_usage,
+        record.temperature,
+        timestamp,
+    )
+
+
+class TelemetryIngestBuffer:
+    """
+    Buffers ingested telemetry and writes it to the DB in large batches.
+
+    Each accepted request is queued as one chunk. A background flusher
+    gathers chunks until flush_size rows or flush_interval seconds,
+    then writes them with asyncpg COPY (Core executemany on other drivers).
+
+    A batch rejected because of its rows is split in half and each half
+    written separately, so only the offending rows are dropped. Other
+    failures (e.g. the DB being unreachable) are retried up to
+    flush_retries times before the batch is given up.
+    """
+
+    def __init__(
+        self,
+        flush_size: int,
+        flush_interval: float,
+        max_buffered_rows: int,
+        flush_retries: int = 3,
+    ):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self.flush_retries = flush_retries
+        self._queue: asyncio.Queue[Optional[List[Row]]] = asyncio.Queue()
+        self._buffered = 0
+        self._accepting = False
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+
+    def submit(self, records: List[TelemetryIngestRecord]) -> int:
+        """
+        Queue records for the next flush.
+
+        Raises:
+            IngestBufferFull: If the buffer cannot take the whole batch or
+                is shutting down
+        """
+        if not self._accepting or self._buffered + len(records) > self.max_buffered_rows:
+            INGEST_ROWS.labels(outcome="rejected").inc(len(records))
+            raise IngestBufferFull()
+        received_at = datetime.utcnow()
+        self._queue.put_nowait([to_row(r, received_at) for r in records])
+        self._buffered += len(records)
+        INGEST_BUFFERED.set(self._buffered)
+        INGEST_ROWS.labels(outcome="accepted").inc(len(records))
+        return len(records)
+
+    async def _collect(self) -> List[Row]:
+        """Wait for the first chunk, then gather more until size or time runs out."""
+        loop = asyncio.get_running_loop()
+        batch: List[Row] = []
+        deadline = None
+        while len(batch) < self.flush_size:
+            if deadline is None:
+                chunk = await self._queue.get()
+                deadline = loop.time() + self.flush_interval
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    chunk = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if chunk is None:
+                self._closing = True
+                break
+            batch.extend(chunk)
+        return batch
+
+    async def _write(self, rows: List[Row]) -> None:
+        with INGEST_FLUSH_SECONDS.time():
+            async with engine.begin() as conn:
+                if conn.dialect.driver == "asyncpg":
+                    raw = await conn.get_raw_connection()
+                    await raw.driver_connection.copy_records_to_table(
+                        TelemetryData.__tablename__, records=rows, columns=COLUMNS
+                    )
+                else:
+                    await conn.execute(
+                        insert(TelemetryData), [dict(zip(COLUMNS, row)) for row in rows]
+                    )
+
+    async def _write_isolating(self, rows: List[Row]) -> None:
+        """Write rows, bisecting on row errors and retrying other failures."""
+        attempt = 0
+        while True:
+            try:
+                await self._write(rows)
+                INGEST_ROWS.labels(outcome="written").inc(len(rows))
+                return
+            except Exception as e:
+                if is_row_error(e):
+                    if len(rows) > 1:
+                        middle = len(rows) // 2
+                        await self._write_isolating(rows[:middle])
+                        await self._write_isolating(rows[middle:])
+                        return
+                    logger.warning("Dropping telemetry row %r: %s", rows[0], e)
+                    INGEST_ROWS.labels(outcome="failed").inc()
+                    return
+                if attempt >= self.flush_retries:
+                    logger.exception("Failed to flush %d telemetry rows", len(rows))
+                    INGEST_ROWS.labels(outcome="failed").inc(len(rows))
+                    return
+                attempt += 1
+                await asyncio.sleep(self.flush_interval * attempt)
+
+    async def _flush(self, rows: List[Row]) -> None:
+        try:
+            await self._write_isolating(rows)
+        finally:
+            self._buffered -= len(rows)
+            INGEST_BUFFERED.set(self._buffered)
+
+    async def _flush_loop(self) -> None:
+        while not self._closing:
+            rows = await self._collect()
+            if rows:
+                await self._flush(rows)
+
+    async def start(self) -> None:
+        self._accepting = True
+        self._closing = False
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop accepting rows and write whatever is still buffered."""
+        self._accepting = False
+        if self._task is not None:
+            self._queue.put_nowait(None)
+            await self._task
+            self._task = None
@@ -0,0 +1,59 @@
+"""
+Raw asyncpg implementations of the hot telemetry lookups.
+
+Same signatures and return types as app.service; the session argument
+only picks the database, primary or read replica, whose raw pool is
+queried. Selected with DB_REPOSITORY=asyncpg.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.db.raw import get_raw_pool
+from shared.resilience import statement_timeout
+from shared.schemas.telemetry import TelemetryResponse
+from typing import Optional
+
+SELECT_LATEST_TELEMETRY = """
+    SELECT robot_id, battery_level, cpu_usage, temperature, timestamp
+    FROM telemetry_data
+    WHERE robot_id = $1
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+SELECT_LATEST_STATE = """
+    SELECT robot_id, battery_level, cpu_usage, temperature, timestamp
+    FROM robot_latest_state
+    WHERE robot_id = $1 AND timestamp IS NOT NULL
+"""
+
+
+async def _fetch_latest(
+    session: AsyncSession, sql: str, robot_id: str
+) -> Optional[TelemetryResponse]:
+    pool = await get_raw_pool(session)
+    record = await pool.fetchrow(sql, robot_id, timeout=statement_timeout())
+    return TelemetryResponse.model_construct(**record) if record is not None else None
+
+
+async def get_latest_telemetry(session: AsyncSession, robot_id: str) -> Optional[TelemetryResponse]:
+    """
+    Fetch the latest telemetry data for a specific robot.
+
+    Args:
+        robot_id: The robot identifier
+
+    Returns:
+        TelemetryResponse if found, None otherwise
+    """
+    return await _fetch_latest(session, SELECT_LATEST_TELEMETRY, robot_id)
+
+
+async def get_latest_state(session: AsyncSession, robot_id: str) -> Optional[TelemetryResponse]:
+    """
+    Fetch the latest telemetry for a robot from robot_latest_state.
+
+    Args:
+        robot_id: The robot identifier
+
+    Returns:
+        TelemetryResponse if the robot has telemetry, None otherwise
+    """
+    return await _fetch_latest(session, SELECT_LATEST_STATE, robot_id)
@@ -1,8 +1,40 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from shared.db.models import TelemetryData
-from shared.schemas.telemetry import TelemetryResponse
-from typing import Optional, Dict
+from sqlalchemy import select, desc, func, bindparam, true, String, Interval, DateTime
+from sqlalchemy.dialects.postgresql import ARRAY
+from shared.db.models import Robot, RobotLatestState, TelemetryData
+from shared.schemas.telemetry import TelemetryResponse, TelemetrySeriesResponse
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Iterable, Optional, Dict, List, Set
+from shared.ndjson import STREAM_YIELD_PER
+from shared.responses import dumps_line
+
+# Upper bound on robot IDs bound into a single batch statement
+BATCH_CHUNK_SIZE = 1000
+
+SERIES_METRICS = ("battery_level", "cpu_usage", "temperature")
+SERIES_AGGREGATES = {"avg": func.avg, "min": func.min, "max": func.max}
+# Buckets are aligned to this origin so identical ranges always bucket the same way
+SERIES_BUCKET_ORIGIN = datetime(2000, 1, 1)
+
+
+TELEMETRY_COLUMNS = (
+    TelemetryData.robot_id,
+    TelemetryData.battery_level,
+    TelemetryData.cpu_usage,
+    TelemetryData.temperature,
+    TelemetryData.timestamp,
+)
+
+
+def _row_response(row) -> TelemetryResponse:
+    """Build a TelemetryResponse from a projected row without re-validating it."""
+    return TelemetryResponse.model_construct(
+        robot_id=row.robot_id,
+        battery_level=row.battery_level,
+        cpu_usage=row.cpu_usage,
+        temperature=row.temperature,
+        timestamp=row.timestamp,
+    )
 
 
 async def get_latest_telemetry(session: AsyncSession, robot_id: str) -> Optional[TelemetryResponse]:
@@ -16,24 +48,41 @@ async def get_latest_telemetry(session: AsyncSession, robot_id: str) -> Optional
         TelemetryResponse if found, None otherwise
     """
     stmt = (
-        select(TelemetryData)
+        select(*TELEMETRY_COLUMNS)
         .where(TelemetryData.robot_id == robot_id)
         .order_by(desc(TelemetryData.timestamp))
         .limit(1)
     )
     result = await session.execute(stmt)
-    telemetry = result.scalar_one_or_none()
+    row = result.first()
 
-    if telemetry is None:
+    if row is None:
         return None
 
-    return TelemetryResponse(
-        robot_id=telemetry.robot_id,
-        battery_level=telemetry.battery_level,
-        cpu_usage=telemetry.cpu_usage,
-        temperature=telemetry.temperature,
-        timestamp=telemetry.timestamp,
+    return _row_response(row)
+
+
+def _latest_per_robot_stmt():
+    """
+    Build the set-based "latest row per robot" statement.
+
+    Unnests the bound robot ID array and joins each ID LATERAL to a
+    LIMIT 1 probe on idx_telemetry_robot_ts, so every robot costs one
+    index lookup regardless of how much history it has.
+    """
+    robot_ids = (
+        func.unnest(bindparam("robot_ids", type_=ARRAY(String(20))))
+        .table_valued("robot_id")
+        .render_derived(name="ids")
     )
+    latest = (
+        select(*TELEMETRY_COLUMNS)
+        .where(TelemetryData.robot_id == robot_ids.c.robot_id)
+        .order_by(desc(TelemetryData.timestamp))
+        .limit(1)
+        .lateral("latest")
+    )
+    return select(latest).select_from(robot_ids).join(latest, true())
 
 
 async def get_batch_telemetry(
@@ -42,16 +91,243 @@ async def get_batch_telemetry(
     """
     Fetch latest telemetry data for multiple robots.
 
+    Duplicate IDs are collapsed and the remainder is resolved in chunks of
+    BATCH_CHUNK_SIZE, one round trip per chunk.
+
+    Args:
+        robot_ids: List of robot identifiers
+
+    Returns:
+        Dictionary mapping robot_id to TelemetryResponse (or None if not found)
+    """
+    unique_ids = list(dict.fromkeys(robot_ids))
+    result: Dict[str, Optional[TelemetryResponse]] = dict.fromkeys(unique_ids)
+    stmt = _latest_per_robot_stmt()
+
+    for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+        rows = await session.execute(stmt, {"robot_ids": chunk})
+        for row in rows:
+            result[row.robot_id] = _row_response(row)
+
+    return result
+
+
+def _latest_state_select():
+    return select(
+        RobotLatestState.robot_id,
+        RobotLatestState.battery_level,
+        RobotLatestState.cpu_usage,
+        RobotLatestState.temperature,
+        RobotLatestState.timestamp,
+    )
+
+
+async def get_latest_state(session: AsyncSession, robot_id: str) -> Optional[TelemetryResponse]:
+    """
+    Fetch the latest telemetry for a robot from robot_latest_state.
+
+    Args:
+        robot_id: The robot identifier
+
+    Returns:
+        TelemetryResponse if the robot has telemetry, None otherwise
+    """
+    stmt = _latest_state_select().where(
+        RobotLatestState.robot_id == robot_id,
+        RobotLatestState.timestamp.isnot(None),
+    )
+    row = (await session.execute(stmt)).first()
+    return _row_response(row) if row is not None else None
+
+
+async def get_batch_latest_state(
+    session: AsyncSession, robot_ids: list[str]
+) -> Dict[str, Optional[TelemetryResponse]]:
+    """
+    Fetch the latest telemetry for multiple robots from robot_latest_state.
+
     Args:
         robot_ids: List of robot identifiers
 
     Returns:
         Dictionary mapping robot_id to TelemetryResponse (or None if not found)
     """
-    result = {}
+    unique_ids = list(dict.fromkeys(robot_ids))
+    result: Dict[str, Optional[TelemetryResponse]] = dict.fromkeys(unique_ids)
 
-    for robot_id in robot_ids:
-        telemetry = await get_latest_telemetry(session, robot_id)
-        result[robot_id] = telemetry
+    for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+        stmt = _latest_state_select().where(
+            RobotLatestState.robot_id.in_(chunk),
+            RobotLatestState.timestamp.isnot(None),
+        )
+        for row in await session.execute(stmt):
+            result[row.robot_id] = _row_response(row)
 
     return result
+
+
+async def get_existing_robot_ids(session: AsyncSession, robot_ids: Iterable[str]) -> Set[str]:
+    """
+    Filter robot IDs down to the robots that exist.
+
+    Args:
+        robot_ids: Robot identifiers to check
+
+    Returns:
+        The subset of robot_ids present in the robots table
+    """
+    unique_ids = list(dict.fromkeys(robot_ids))
+    existing: Set[str] = set()
+    for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+        result = await session.execute(select(Robot.id).where(Robot.id.in_(chunk)))
+        existing.update(result.scalars())
+    return existing
+
+
+async def stream_batch_telemetry(
+    session: AsyncSession, robot_ids: list[str], from_state: bool
+) -> AsyncIterator[bytes]:
+    """
+    Stream the latest telemetry for multiple robots as NDJSON lines.
+
+    Each chunk of BATCH_CHUNK_SIZE IDs is read through a server-side
+    cursor. Robots without telemetry are omitted.
+
+    Args:
+        robot_ids: List of robot identifiers
+        from_state: Read robot_latest_state instead of telemetry_data
+    """
+    unique_ids = list(dict.fromkeys(robot_ids))
+
+    for start in range(0, len(unique_ids), BATCH_CHUNK_SIZE):
+        chunk = unique_ids[start:start + BATCH_CHUNK_SIZE]
+        if from_state:
+            stmt = _latest_state_select().where(
+                RobotLatestState.robot_id.in_(chunk),
+                RobotLatestState.timestamp.isnot(None),
+            )
+            params = {}
+        else:
+            stmt = _latest_per_robot_stmt()
+            params = {"robot_ids": chunk}
+        result = await session.stream(
+            stmt.execution_options(yield_per=STREAM_YIELD_PER), params
+        )
+        async for row in result:
+            yield dumps_line(row._asdict())
+
+
+async def get_telemetry_watermark(session: AsyncSession) -> int:
+    """
+    Fetch the highest telemetry row id.
+
+    Ids are assigned at insert, not commit, so rows with lower ids can still
+    become visible after this value has been read; callers re-read a window
+    below it (see LatestTelemetryCache).
+
+    Returns:
+        max(id) of telemetry_data, or 0 if the table is empty
+    """
+    result = await session.execute(select(func.max(TelemetryData.id)))
+    return result.scalar_one() or 0
+
+
+async def get_fleet_latest_telemetry(session: AsyncSession) -> List[TelemetryResponse]:
+    """
+    Fetch the latest telemetry data for every known robot.
+
+    Returns:
+        List of TelemetryResponse, one per robot that has telemetry
+    """
+    stmt = _latest_state_select().where(RobotLatestState.timestamp.isnot(None))
+    rows = await session.execute(stmt)
+    return [_row_response(row) for row in rows]
+
+
+async def get_latest_telemetry_since(
+    session: AsyncSession, after_id: int, up_to_id: int
+) -> List[TelemetryResponse]:
+    """
+    Fetch the latest telemetry per robot among rows in (after_id, up_to_id].
+
+    Args:
+        after_id: Exclusive lower bound on telemetry row id
+        up_to_id: Inclusive upper bound on telemetry row id
+
+    Returns:
+        List of TelemetryResponse, one per robot with new rows
+    """
+    stmt = (
+        select(*TELEMETRY_COLUMNS)
+        .where(TelemetryData.id > after_id, TelemetryData.id <= up_to_id)
+        .distinct(TelemetryData.robot_id)
+        .order_by(TelemetryData.robot_id, desc(TelemetryData.timestamp))
+    )
+    rows = await session.execute(stmt)
+    return [_row_response(row) for row in rows]
+
+
+async def get_telemetry_series(
+    session: AsyncSession,
+    robot_id: str,
+    start: datetime,
+    end: datetime,
+    bucket_seconds: int,
+    aggregates: List[str],
+) -> TelemetrySeriesResponse:
+    """
+    Downsample a robot's telemetry into fixed-width time buckets in SQL.
+
+    The range filter rides idx_telemetry_robot_ts and date_bin groups the
+    matching rows, so only one row per bucket leaves the database.
+
+    Args:
+        robot_id: The robot identifier
+        start: Inclusive range start (naive UTC)
+        end: Exclusive range end (naive UTC)
+        bucket_seconds: Bucket width in seconds
+        aggregates: Names from SERIES_AGGREGATES to compute per metric
+
+    Returns:
+        TelemetrySeriesResponse with one array entry per non-empty bucket
+    """
+    bucket = func.date_bin(
+        bindparam("stride", timedelta(seconds=bucket_seconds), type_=Interval),
+        TelemetryData.timestamp,
+        bindparam("origin", SERIES_BUCKET_ORIGIN, type_=DateTime),
+    ).label("bucket")
+    labels = [(metric, agg) for metric in SERIES_METRICS for agg in aggregates]
+    stmt = (
+        select(
+            bucket,
+            func.count().label("count"),
+            *(
+                SERIES_AGGREGATES[agg](getattr(TelemetryData, metric)).label(f"{metric}_{agg}")
+                for metric, agg in labels
+            ),
+        )
+        .where(
+            TelemetryData.robot_id == robot_id,
+            TelemetryData.timestamp >= start,
+            TelemetryData.timestamp < end,
+        )
+        .group_by(bucket)
+        .order_by(bucket)
+    )
+    rows = (await session.execute(stmt)).all()
+
+    columns = list(zip(*rows)) if rows else [()] * (2 + len(labels))
+    values: Dict[str, Dict[str, List[float]]] = {metric: {} for metric in SERIES_METRICS}
+    for (metric, agg), column in zip(labels, columns[2:]):
+        values[metric][agg] = [float(v) for v in column]
+
+    return TelemetrySeriesResponse.model_construct(
+        robot_id=robot_id,
+        bucket_seconds=bucket_seconds,
+        timestamps=list(columns[0]),
+        counts=list(columns[1]),
+        values=values,
+    )
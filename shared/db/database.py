@@ -1,16 +1,278 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from shared.config import DATABASE_URL
-from shared.db.models import Base
+import asyncio
+import itertools
+import math
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Tuple
 
-engine = create_async_engine(DATABASE_URL, pool_size=10, max_overflow=20)
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
+from shared.config import (
+    DATABASE_URL,
+    DATABASE_READ_URLS,
+    DATABASE_READ_STRATEGY,
+    DATABASE_READ_MAX_LAG_SECONDS,
+    DATABASE_READ_LAG_CHECK_INTERVAL,
+    DATABASE_POOL_SIZE,
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_TIMEOUT,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE,
+    DB_RAW_POOL_SIZE,
+    DB_REPOSITORY,
+    DB_STATEMENT_METRICS,
+    DB_STATEMENT_TIMEOUT,
+)
+from shared.db.models import Base, TELEMETRY_PARTITIONED
+from shared.db.partitions import maintain_partitions
+from shared.db.pool_metrics import InstrumentedQueuePool, instrument_engine
+from shared.db.statement_metrics import NO_STATEMENT_METRICS, instrument_statements
+from shared.resilience import statement_timeout
+
+# Requests carrying "X-Read-Consistency: primary" never read from a replica
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+# Replay lag in seconds; zero when the replica has replayed all WAL it received,
+# so an idle primary does not make its replicas look stale.
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+          OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _pool_sizes() -> Tuple[int, int]:
+    """
+    (pool_size, max_overflow) for the primary and each replica engine.
+
+    With DB_REPOSITORY=asyncpg each database's raw pool of DB_RAW_POOL_SIZE
+    connections is taken out of the configured budget, overflow first, so
+    the process never holds more than DATABASE_POOL_SIZE +
+    DATABASE_MAX_OVERFLOW connections to any one database.
+    """
+    if DB_REPOSITORY != "asyncpg":
+        return DATABASE_POOL_SIZE, DATABASE_MAX_OVERFLOW
+    budget = max(1, DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW - DB_RAW_POOL_SIZE)
+    pool_size = min(DATABASE_POOL_SIZE, budget)
+    return pool_size, budget - pool_size
+
+
+def _create_engine(
+    url: str,
+    name: str,
+    pool_size: int = DATABASE_POOL_SIZE,
+    max_overflow: int = DATABASE_MAX_OVERFLOW,
+) -> AsyncEngine:
+    """
+    Create an engine with the configured pool, exported under pool=<name>.
+
+    SQLite stands in for Postgres locally and keeps its default pool.
+    asyncpg connections start with DB_STATEMENT_TIMEOUT, sent with the
+    connection's startup parameters rather than as a statement.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite":
+        engine = create_async_engine(url)
+    else:
+        connect_args = {}
+        if DB_STATEMENT_TIMEOUT > 0 and parsed.get_driver_name() == "asyncpg":
+            connect_args["server_settings"] = {
+                "statement_timeout": str(int(DB_STATEMENT_TIMEOUT * 1000))
+            }
+        engine = create_async_engine(
+            url,
+            connect_args=connect_args,
+            poolclass=InstrumentedQueuePool,
+            pool_logging_name=name,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+            pool_pre_ping=DATABASE_POOL_PRE_PING,
+            pool_recycle=DATABASE_POOL_RECYCLE,
+        )
+        instrument_engine(engine, name)
+    if DB_STATEMENT_METRICS:
+        instrument_statements(engine)
+    return engine
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    """
+    Bound a transaction's statements by what is left of the request deadline.
+
+    Skipped only when the connection's DB_STATEMENT_TIMEOUT is already
+    within the remaining budget.
+    """
+    timeout = statement_timeout()
+    if timeout is None or connection.dialect.name != "postgresql":
+        return
+    if 0 < DB_STATEMENT_TIMEOUT <= timeout:
+        return
+    # set_config(..., true) is SET LOCAL: it ends with the transaction
+    connection.execute(
+        text("SELECT set_config('statement_timeout', :ms, true)"),
+        {"ms": str(max(1, int(timeout * 1000)))},
+        execution_options=NO_STATEMENT_METRICS,
+    )
+
+
+engine = _create_engine(DATABASE_URL, "primary", *_pool_sizes())
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+class ReadReplica:
+    """A read-only engine plus the bookkeeping used to pick and skip it."""
+
+    def __init__(self, url: str, name: str):
+        self.engine = _create_engine(url, name, *_pool_sizes())
+        self.session = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.in_flight = 0
+        # Last measured replication lag in seconds, kept current by the lag monitor
+        self.lag = 0.0
+
+    async def measure_lag(self) -> float:
+        """
+        Measure replication lag in seconds and store it in self.lag.
+
+        An unreachable replica, or one that does not answer within
+        DATABASE_READ_LAG_CHECK_INTERVAL, reports infinite lag.
+        """
+        try:
+            async with self.engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(REPLICA_LAG_SQL), DATABASE_READ_LAG_CHECK_INTERVAL
+                )
+                self.lag = float(result.scalar_one())
+        except Exception:
+            self.lag = math.inf
+        return self.lag
+
+
+read_replicas: List[ReadReplica] = [
+    ReadReplica(url, f"replica{index}") for index, url in enumerate(DATABASE_READ_URLS)
+]
+_round_robin = itertools.count()
+_lag_monitor: Optional[asyncio.Task] = None
+
+
+async def _measure_replica_lag(replicas: List[ReadReplica]) -> None:
+    await asyncio.gather(*(replica.measure_lag() for replica in replicas))
+
+
+async def _lag_monitor_loop(replicas: List[ReadReplica]) -> None:
+    while True:
+        await asyncio.sleep(DATABASE_READ_LAG_CHECK_INTERVAL)
+        await _measure_replica_lag(replicas)
+
+
+async def start_replica_lag_monitor() -> None:
+    """
+    Measure replica lag now, then every DATABASE_READ_LAG_CHECK_INTERVAL
+    seconds in the background.
+
+    Does nothing without Postgres replicas or when lag filtering is off.
+    """
+    global _lag_monitor
+    replicas = [r for r in read_replicas if r.engine.dialect.name == "postgresql"]
+    if _lag_monitor is not None or not replicas or DATABASE_READ_MAX_LAG_SECONDS <= 0:
+        return
+    await _measure_replica_lag(replicas)
+    _lag_monitor = asyncio.create_task(_lag_monitor_loop(replicas))
+
+
+async def stop_replica_lag_monitor() -> None:
+    global _lag_monitor
+    if _lag_monitor is not None:
+        _lag_monitor.cancel()
+        try:
+            await _lag_monitor
+        except asyncio.CancelledError:
+            pass
+        _lag_monitor = None
+
+
+def choose_read_replica() -> Optional[ReadReplica]:
+    """
+    Pick a replica for the next read.
+
+    Only reads lag figures already measured by the lag monitor, so choosing
+    never waits on a probe query.
+
+    Returns:
+        A replica within DATABASE_READ_MAX_LAG_SECONDS, chosen by
+        DATABASE_READ_STRATEGY, or None when reads should go to the primary
+    """
+    candidates = read_replicas
+    if DATABASE_READ_MAX_LAG_SECONDS > 0:
+        candidates = [
+            replica for replica in candidates
+            if replica.lag <= DATABASE_READ_MAX_LAG_SECONDS
+        ]
+    if not candidates:
+        return None
+    if DATABASE_READ_STRATEGY == "least_busy":
+        return min(candidates, key=lambda replica: replica.in_flight)
+    return candidates[next(_round_robin) % len(candidates)]
+
+
+def pins_primary(request: Request) -> bool:
+    """True when the request asked to read its own writes from the primary."""
+    return request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary"
+
+
+@asynccontextmanager
+async def read_session(primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """
+    Open a session for read-only work.
+
+    Args:
+        primary: Read from the primary even when replicas are configured
+    """
+    replica = None if primary else choose_read_replica()
+    if replica is None:
+        async with async_session() as session:
+            yield session
+        return
+
+    replica.in_flight += 1
+    try:
+        async with replica.session() as session:
+            yield session
+    finally:
+        replica.in_flight -= 1
+
+
+def _create_missing_indexes(sync_conn):
+    # create_all skips indexes on tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
 async def create_tables():
     async with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Index builds and backfills may outlast DB_STATEMENT_TIMEOUT
+            await conn.execute(text("SET LOCAL statement_timeout = 0"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_create_missing_indexes)
+        if TELEMETRY_PARTITIONED:
+            await maintain_partitions(conn)
 
 
 async def get_session():
     async with async_session() as session:
         yield session
+
+
+async def get_read_session(request: Request):
+    """Session dependency for GET endpoints; may be served by a read replica."""
+    async with read_session(pins_primary(request)) as session:
+        yield session
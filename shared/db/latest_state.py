@@ -0,0 +1,111 @@
+"""
+Trigger DDL that keeps robot_latest_state current.
+
+Statement-level triggers with transition tables fold every INSERT or COPY
+into telemetry_data and every INSERT/DELETE on alerts into one set-based
+upsert per statement, whichever service or script did the write.
+
+The alert counts are totals of every alert row per robot and severity, not
+of open alerts: alerts have no status column, so the only way an alert
+stops counting is being deleted. Introducing a status would need an
+UPDATE trigger that moves counts between old and new rows.
+"""
+
+
+def _alert_count_function(name: str, transition_table: str, sign: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+    LANGUAGE plpgsql AS $fn$
+    BEGIN
+        INSERT INTO robot_latest_state AS s
+            (robot_id, critical_alerts, warning_alerts, info_alerts)
+        SELECT
+            robot_id,
+            {sign}count(*) FILTER (WHERE severity = 'critical'),
+            {sign}count(*) FILTER (WHERE severity = 'warning'),
+            {sign}count(*) FILTER (WHERE severity = 'info')
+        FROM {transition_table}
+        GROUP BY robot_id
+        ORDER BY robot_id
+        ON CONFLICT (robot_id) DO UPDATE SET
+            critical_alerts = s.critical_alerts + EXCLUDED.critical_alerts,
+            warning_alerts = s.warning_alerts + EXCLUDED.warning_alerts,
+            info_alerts = s.info_alerts + EXCLUDED.info_alerts;
+        RETURN NULL;
+    END
+    $fn$
+    """
+
+
+LATEST_STATE_STATEMENTS = [
+    """
+    CREATE OR REPLACE FUNCTION robot_latest_state_on_telemetry() RETURNS trigger
+    LANGUAGE plpgsql AS $fn$
+    BEGIN
+        INSERT INTO robot_latest_state AS s
+            (robot_id, battery_level, cpu_usage, temperature, timestamp)
+        SELECT DISTINCT ON (robot_id)
+            robot_id, battery_level, cpu_usage, temperature, timestamp
+        FROM new_rows
+        ORDER BY robot_id, timestamp DESC
+        ON CONFLICT (robot_id) DO UPDATE SET
+            battery_level = EXCLUDED.battery_level,
+            cpu_usage = EXCLUDED.cpu_usage,
+            temperature = EXCLUDED.temperature,
+            timestamp = EXCLUDED.timestamp
+        WHERE s.timestamp IS NULL OR EXCLUDED.timestamp >= s.timestamp;
+        RETURN NULL;
+    END
+    $fn$
+    """,
+    _alert_count_function("robot_latest_state_on_alert_insert", "new_rows", ""),
+    _alert_count_function("robot_latest_state_on_alert_delete", "old_rows", "-"),
+    "DROP TRIGGER IF EXISTS robot_latest_state_telemetry ON telemetry_data",
+    """
+    CREATE TRIGGER robot_latest_state_telemetry
+    AFTER INSERT ON telemetry_data
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION robot_latest_state_on_telemetry()
+    """,
+    "DROP TRIGGER IF EXISTS robot_latest_state_alert_insert ON alerts",
+    """
+    CREATE TRIGGER robot_latest_state_alert_insert
+    AFTER INSERT ON alerts
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION robot_latest_state_on_alert_insert()
+    """,
+    "DROP TRIGGER IF EXISTS robot_latest_state_alert_delete ON alerts",
+    """
+    CREATE TRIGGER robot_latest_state_alert_delete
+    AFTER DELETE ON alerts
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION robot_latest_state_on_alert_delete()
+    """,
+    # Backfill from existing history when the table is first created
+    """
+    INSERT INTO robot_latest_state
+        (robot_id, battery_level, cpu_usage, temperature, timestamp,
+         critical_alerts, warning_alerts, info_alerts)
+    SELECT
+        r.id, t.battery_level, t.cpu_usage, t.temperature, t.timestamp,
+        coalesce(a.critical, 0), coalesce(a.warning, 0), coalesce(a.info, 0)
+    FROM robots r
+    LEFT JOIN LATERAL (
+        SELECT battery_level, cpu_usage, temperature, timestamp
+        FROM telemetry_data
+        WHERE robot_id = r.id
+        ORDER BY timestamp DESC
+        LIMIT 1
+    ) t ON true
+    LEFT JOIN (
+        SELECT
+            robot_id,
+            count(*) FILTER (WHERE severity = 'critical') AS critical,
+            count(*) FILTER (WHERE severity = 'warning') AS warning,
+            count(*) FILTER (WHERE severity = 'info') AS info
+        FROM alerts
+        GROUP BY robot_id
+    ) a ON a.robot_id = r.id
+    ON CONFLICT (robot_id) DO NOTHING
+    """,
+]
@@ -0,0 +1,67 @@
+"""
+Explicit schema migration.
+
+Creates missing tables, indexes, triggers and telemetry partitions, then
+records SCHEMA_VERSION so services started with DB_STARTUP_MODE=verify can
+skip create_all and only check the version.
+
+Usage:
+    DATABASE_URL=... python -m shared.db.migrate
+"""
+import asyncio
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from shared.db.database import engine, create_tables
+from shared.db.models import SCHEMA_VERSION, SchemaVersion
+
+
+async def current_schema_version(conn) -> Optional[int]:
+    """Highest applied schema version, or None if the schema was never migrated."""
+    try:
+        result = await conn.execute(select(func.max(SchemaVersion.version)))
+    except Exception:
+        # schema_version does not exist yet
+        return None
+    return result.scalar_one()
+
+
+async def migrate() -> int:
+    """
+    Bring the schema up to SCHEMA_VERSION.
+
+    Returns:
+        The schema version now recorded
+    """
+    await create_tables()
+    async with engine.begin() as conn:
+        if await current_schema_version(conn) != SCHEMA_VERSION:
+            await conn.execute(SchemaVersion.__table__.insert().values(version=SCHEMA_VERSION))
+    return SCHEMA_VERSION
+
+
+async def verify_schema() -> None:
+    """
+    Check the schema version without touching the schema.
+
+    Raises:
+        RuntimeError: If the recorded version is missing or differs from SCHEMA_VERSION
+    """
+    async with engine.connect() as conn:
+        version = await current_schema_version(conn)
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema version is {version}, expected {SCHEMA_VERSION}; "
+            "run `python -m shared.db.migrate`"
+        )
+
+
+async def _main() -> None:
+    version = await migrate()
+    await engine.dispose()
+    print(f"Schema at version {version}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
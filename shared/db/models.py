@@ -1,12 +1,29 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index, event
 from sqlalchemy.orm import DeclarativeBase
 from datetime import datetime
+from shared.config import TELEMETRY_PARTITION_INTERVAL
+from shared.db.latest_state import LATEST_STATE_STATEMENTS
+
+# Bump whenever the tables, indexes or triggers below change; services started
+# with DB_STARTUP_MODE=verify refuse to run against any other version.
+SCHEMA_VERSION = 1
+
+# Postgres requires the partition key in every unique constraint, so the
+# partitioned layout widens the primary key to (id, timestamp).
+TELEMETRY_PARTITIONED = TELEMETRY_PARTITION_INTERVAL != "none"
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
 class Robot(Base):
     __tablename__ = "robots"
 
@@ -25,10 +42,13 @@ class TelemetryData(Base):
     battery_level = Column(Float, nullable=False)
     cpu_usage = Column(Float, nullable=False)
     temperature = Column(Float, nullable=False)
-    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
+    timestamp = Column(
+        DateTime, nullable=False, default=datetime.utcnow, primary_key=TELEMETRY_PARTITIONED
+    )
 
     __table_args__ = (
         Index("idx_telemetry_robot_ts", "robot_id", timestamp.desc()),
+        {"postgresql_partition_by": "RANGE (timestamp)"} if TELEMETRY_PARTITIONED else {},
     )
 
 
@@ -42,6 +62,47 @@ class Alert(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     __table_args__ = (
-        Index("idx_alerts_robot", "robot_id"),
+        # Keyset pagination order for per-robot and critical alert listings
+        Index("idx_alerts_robot_created", "robot_id", created_at.desc(), id.desc()),
+        Index(
+            "idx_alerts_critical_created",
+            created_at.desc(),
+            id.desc(),
+            postgresql_where=(severity == "critical"),
+        ),
         Index("idx_alerts_severity", "severity"),
     )
+
+
+class RobotLatestState(Base):
+    """
+    Latest telemetry and alert counts per robot.
+
+    Maintained by triggers on telemetry_data and alerts (see
+    shared.db.latest_state), so reads cost one primary-key lookup no
+    matter how deep the history is. The *_alerts columns count every
+    alert stored for the robot; alerts carry no open/closed status.
+    """
+    __tablename__ = "robot_latest_state"
+
+    robot_id = Column(String(20), ForeignKey("robots.id"), primary_key=True)
+    battery_level = Column(Float)
+    cpu_usage = Column(Float)
+    temperature = Column(Float)
+    timestamp = Column(DateTime)
+    critical_alerts = Column(Integer, nullable=False, default=0, server_default="0")
+    warning_alerts = Column(Integer, nullable=False, default=0, server_default="0")
+    info_alerts = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+# The triggers reference telemetry_data and alerts, so create those first
+RobotLatestState.__table__.add_is_dependent_on(TelemetryData.__table__)
+RobotLatestState.__table__.add_is_dependent_on(Alert.__table__)
+
+
+@event.listens_for(RobotLatestState.__table__, "after_create")
+def _install_latest_state_triggers(target, connection, **kw):
+    if connection.dialect.name != "postgresql":
+        return
+    for statement in LATEST_STATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,31 @@
+"""Keyset pagination over (created_at desc, id desc)."""
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import tuple_
+
+from shared.paging import (  # noqa: F401
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a time filter to the naive UTC the timestamp columns store.
+
+    asyncpg refuses to bind an aware datetime against a naive column, so
+    filters such as ?since=...Z must be converted before reaching a query.
+    """
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def after_cursor(created_at_column, id_column, cursor: str):
+    """WHERE clause selecting rows after cursor in (created_at desc, id desc) order."""
+    created_at, id = decode_cursor(cursor)
+    return tuple_(created_at_column, id_column) < tuple_(created_at, id)
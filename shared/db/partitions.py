@@ -0,0 +1,254 @@
+"""
+Range partition management for telemetry_data.
+
+Besides the per-interval range partitions, every partitioned table gets a
+DEFAULT partition catching rows outside the premade window (late or
+clock-skewed timestamps), so those inserts succeed instead of failing the
+whole batch. Rows parked there are moved into their range partition when
+it is created and are dropped by the same retention TTL.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from shared.config import (
+    TELEMETRY_PARTITION_INTERVAL,
+    TELEMETRY_PARTITION_PREMAKE,
+    TELEMETRY_RETENTION_HOURS,
+)
+
+logger = logging.getLogger(__name__)
+
+PARTITION_INTERVALS = {
+    "daily": timedelta(days=1),
+    "hourly": timedelta(hours=1),
+}
+# Partition names encode their lower bound, e.g. telemetry_data_p20240131 / _p2024013113
+PARTITION_NAME_FORMATS = {
+    "daily": "%Y%m%d",
+    "hourly": "%Y%m%d%H",
+}
+
+
+def partition_start(value: datetime, interval: str) -> datetime:
+    """Truncate a timestamp to the lower bound of its partition."""
+    if interval == "daily":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    return f"{table}_p{start.strftime(PARTITION_NAME_FORMATS[interval])}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_ranges(
+    start: datetime, end: datetime, interval: str
+) -> List[Tuple[datetime, datetime]]:
+    """List the [lower, upper) partition bounds covering start..end inclusive."""
+    step = PARTITION_INTERVALS[interval]
+    lower = partition_start(start, interval)
+    ranges = []
+    while lower <= end:
+        ranges.append((lower, lower + step))
+        lower += step
+    return ranges
+
+
+async def is_partitioned(conn: AsyncConnection, table: str = "telemetry_data") -> bool:
+    result = await conn.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = :table AND c.relnamespace = to_regnamespace(current_schema())"
+        ),
+        {"table": table},
+    )
+    return result.first() is not None
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    start: datetime,
+    end: datetime,
+    interval: str = TELEMETRY_PARTITION_INTERVAL,
+    table: str = "telemetry_data",
+) -> List[str]:
+    """
+    Create the DEFAULT partition and any missing partitions covering start..end.
+
+    Postgres refuses to create a range partition while the DEFAULT
+    partition holds rows in that range, so such rows are first moved into
+    a standalone table which is then attached as the new partition.
+
+    Returns:
+        Names of the partitions that cover the range
+    """
+    default = default_partition_name(table)
+    await conn.execute(
+        text(f'CREATE TABLE IF NOT EXISTS "{default}" PARTITION OF "{table}" DEFAULT')
+    )
+    existing = {name for name, _ in await list_partitions(conn, interval, table)}
+    names = []
+    for lower, upper in partition_ranges(start, end, interval):
+        name = partition_name(table, lower, interval)
+        names.append(name)
+        if name in existing:
+            continue
+        bounds = f"FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        in_range = {"lower": lower, "upper": upper}
+        parked = await conn.execute(
+            text(
+                f'SELECT 1 FROM "{default}" '
+                "WHERE timestamp >= :lower AND timestamp < :upper LIMIT 1"
+            ),
+            in_range,
+        )
+        if parked.first() is None:
+            await conn.execute(
+                text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES {bounds}"
+                )
+            )
+            continue
+        await conn.execute(
+            text(
+                f'CREATE TABLE "{name}" '
+                f'(LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            )
+        )
+        await conn.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" '
+                "WHERE timestamp >= :lower AND timestamp < :upper RETURNING *) "
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ),
+            in_range,
+        )
+        await conn.execute(
+            text(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" FOR VALUES {bounds}')
+        )
+    return names
+
+
+async def list_partitions(
+    conn: AsyncConnection,
+    interval: str = TELEMETRY_PARTITION_INTERVAL,
+    table: str = "telemetry_data",
+) -> List[Tuple[str, datetime]]:
+    """List (name, lower bound) for partitions created by ensure_partitions."""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :table AND p.relnamespace = to_regnamespace(current_schema())"
+        ),
+        {"table": table},
+    )
+    prefix = f"{table}_p"
+    partitions = []
+    for (name,) in result:
+        if not name.startswith(prefix):
+            continue
+        try:
+            lower = datetime.strptime(name[len(prefix):], PARTITION_NAME_FORMATS[interval])
+        except ValueError:
+            continue
+        partitions.append((name, lower))
+    return sorted(partitions, key=lambda p: p[1])
+
+
+async def drop_expired_partitions(
+    conn: AsyncConnection,
+    now: datetime,
+    retention: timedelta,
+    interval: str = TELEMETRY_PARTITION_INTERVAL,
+    table: str = "telemetry_data",
+) -> List[str]:
+    """
+    Drop whole partitions whose range ended before now - retention, and
+    delete rows older than that from the DEFAULT partition.
+
+    Returns:
+        Names of the dropped partitions
+    """
+    cutoff = now - retention
+    step = PARTITION_INTERVALS[interval]
+    dropped = []
+    for name, lower in await list_partitions(conn, interval, table):
+        if lower + step <= cutoff:
+            await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+            dropped.append(name)
+    await conn.execute(
+        text(f'DELETE FROM "{default_partition_name(table)}" WHERE timestamp < :cutoff'),
+        {"cutoff": cutoff},
+    )
+    return dropped
+
+
+async def maintain_partitions(
+    conn: AsyncConnection, now: Optional[datetime] = None
+) -> Tuple[List[str], List[str]]:
+    """
+    Premake upcoming telemetry partitions and apply the retention TTL.
+
+    Returns:
+        (partitions ensured, partitions dropped)
+    """
+    now = now or datetime.utcnow()
+    interval = TELEMETRY_PARTITION_INTERVAL
+    # Moving rows out of the default partition may outlast DB_STATEMENT_TIMEOUT
+    await conn.execute(text("SET LOCAL statement_timeout = 0"))
+    if not await is_partitioned(conn):
+        raise RuntimeError(
+            f"TELEMETRY_PARTITION_INTERVAL={interval} but telemetry_data is not "
+            "a partitioned table; migrate or recreate it before enabling partitioning"
+        )
+    ahead = now + PARTITION_INTERVALS[interval] * TELEMETRY_PARTITION_PREMAKE
+    ensured = await ensure_partitions(conn, now, ahead, interval)
+    dropped = []
+    if TELEMETRY_RETENTION_HOURS > 0:
+        dropped = await drop_expired_partitions(
+            conn, now, timedelta(hours=TELEMETRY_RETENTION_HOURS), interval
+        )
+    return ensured, dropped
+
+
+async def partition_maintenance_loop(engine, interval_seconds: float) -> None:
+    """
+    Run maintain_partitions now and then every interval_seconds, forever.
+
+    The first run matters when startup skipped create_tables and partitions
+    were last made by a migration long ago.
+    """
+    while True:
+        try:
+            async with engine.begin() as conn:
+                _, dropped = await maintain_partitions(conn)
+            if dropped:
+                logger.info("Dropped expired telemetry partitions: %s", ", ".join(dropped))
+        except Exception:
+            logger.exception("Telemetry partition maintenance failed")
+        await asyncio.sleep(interval_seconds)
+
+
+async def _main() -> None:
+    from shared.db.database import engine
+
+    async with engine.begin() as conn:
+        ensured, dropped = await maintain_partitions(conn)
+    await engine.dispose()
+    print(f"Ensured {len(ensured)} partitions, dropped {len(dropped)}: {', '.join(dropped) or '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
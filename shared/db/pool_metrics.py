@@ -0,0 +1,95 @@
+"""Prometheus metrics for SQLAlchemy connection pools."""
+import time
+from typing import Dict
+
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent obtaining a connection from the pool, including opening new ones",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CONNECTION_LIFETIME = Histogram(
+    "db_pool_connection_lifetime_seconds",
+    "Age of database connections when the pool closes them",
+    ["pool"],
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 7200, 21600, 86400),
+)
+
+# Pool label -> engine; the engine's current pool is read at scrape time
+# because dispose() swaps in a fresh pool instance.
+_engines: Dict[str, AsyncEngine] = {}
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that tracks waiting checkouts and their wait time.
+
+    The pool has no event for the start of a checkout, so _do_get is
+    wrapped instead. Its rare internal retries count as separate checkouts.
+    """
+
+    waiters = 0
+
+    def _do_get(self):
+        self.waiters += 1
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.waiters -= 1
+            POOL_CHECKOUT_WAIT.labels(self.logging_name).observe(time.perf_counter() - start)
+
+
+class PoolCollector:
+    """Reports size, checked-out, overflow and waiter gauges per pool."""
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["pool"])
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow", "Connections open beyond pool_size", labels=["pool"]
+        )
+        waiters = GaugeMetricFamily(
+            "db_pool_waiters", "Checkouts waiting for a connection", labels=["pool"]
+        )
+        for name, engine in _engines.items():
+            pool = engine.pool
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            waiters.add_metric([name], getattr(pool, "waiters", 0))
+        yield from (size, checked_out, overflow, waiters)
+
+
+REGISTRY.register(PoolCollector())
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Export pool gauges for an engine and time its connection lifetimes.
+
+    Args:
+        engine: Engine created with poolclass=InstrumentedQueuePool
+        name: Value of the "pool" label, e.g. "primary" or "replica0"
+    """
+    _engines[name] = engine
+    pool = engine.sync_engine.pool
+
+    # Listeners on the pool survive dispose(), which copies them to the new pool
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        connection_record.info["connected_at"] = time.monotonic()
+
+    @event.listens_for(pool, "close")
+    def on_close(dbapi_connection, connection_record):
+        connected_at = connection_record.info.pop("connected_at", None)
+        if connected_at is not None:
+            POOL_CONNECTION_LIFETIME.labels(name).observe(time.monotonic() - connected_at)
@@ -0,0 +1,84 @@
+"""Plain asyncpg pools for the raw repository layer."""
+import asyncio
+from typing import Dict, Optional
+
+import asyncpg
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.config import (
+    DATABASE_URL,
+    DB_RAW_POOL_SIZE,
+    DB_RAW_STATEMENT_CACHE_SIZE,
+    DB_STATEMENT_METRICS,
+    DB_STATEMENT_TIMEOUT,
+)
+from shared.db.statement_metrics import instrument_raw_connection
+
+# One pool per database URL: the primary and any read replica sessions were bound to
+_pools: Dict[str, asyncpg.Pool] = {}
+_pool_lock = asyncio.Lock()
+
+
+def asyncpg_dsn(url: str) -> str:
+    """Turn a SQLAlchemy URL such as postgresql+asyncpg://... into an asyncpg DSN."""
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def _session_url(session: Optional[AsyncSession]) -> str:
+    bind = session.bind if session is not None else None
+    if bind is None:
+        return DATABASE_URL
+    return bind.url.render_as_string(hide_password=False)
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    instrument_raw_connection(conn)
+
+
+async def get_raw_pool(session: Optional[AsyncSession] = None) -> asyncpg.Pool:
+    """
+    Return the asyncpg pool for the database a session is bound to,
+    creating it on first use.
+
+    A session from get_read_session may be bound to a read replica, so the
+    raw repositories read from the same replica, with the same lag-based
+    fallback to the primary, as the SQLAlchemy ones. Without a session the
+    primary's pool is returned.
+
+    asyncpg prepares every query it runs and keeps the prepared statement
+    on the connection, keyed by query text, so repositories that reuse
+    constant SQL strings skip parsing and planning after the first call on
+    each connection.
+
+    Connections start with DB_STATEMENT_TIMEOUT, like the SQLAlchemy
+    engines; repositories pass resilience.statement_timeout() as each
+    call's timeout so the request deadline bounds them too. With
+    DB_STATEMENT_METRICS on, their statements are recorded like the
+    engines' (without row counts).
+    """
+    url = _session_url(session)
+    pool = _pools.get(url)
+    if pool is None:
+        async with _pool_lock:
+            pool = _pools.get(url)
+            if pool is None:
+                server_settings = {}
+                if DB_STATEMENT_TIMEOUT > 0:
+                    server_settings["statement_timeout"] = str(int(DB_STATEMENT_TIMEOUT * 1000))
+                pool = _pools[url] = await asyncpg.create_pool(
+                    asyncpg_dsn(url),
+                    min_size=1,
+                    max_size=DB_RAW_POOL_SIZE,
+                    statement_cache_size=DB_RAW_STATEMENT_CACHE_SIZE,
+                    server_settings=server_settings,
+                    init=_init_connection if DB_STATEMENT_METRICS else None,
+                )
+    return pool
+
+
+async def close_raw_pool() -> None:
+    """Close every asyncpg pool that was created."""
+    pools = list(_pools.values())
+    _pools.clear()
+    await asyncio.gather(*(pool.close() for pool in pools))
@@ -1,10 +1,36 @@
-"""Seed data: 15 robots, telemetry per robot, alerts per robot."""
+"""
+Seed data: robots, telemetry per robot, alerts per robot.
+
+Fleet size comes from a named profile (small, medium, large) whose fields
+can each be overridden, or from "custom", which takes them all from flags.
+Telemetry and alert rows are generated in worker processes, each chunk
+from its own deterministic RNG, and loaded through COPY over several
+connections.
+
+Usage:
+    python -m shared.db.seed [--profile small|medium|large|custom] [--robots N]
+        [--points N] [--alerts N] [--span-minutes N] [--alert-span-minutes N]
+        [--workers N] [--seed N] [--reset]
+"""
+import argparse
 import asyncio
+import io
+import multiprocessing
+import os
 import random
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from sqlalchemy import select
-from shared.db.database import engine, async_session, create_tables
-from shared.db.models import Robot, TelemetryData, Alert
+from typing import Callable, List, NamedTuple, Tuple
+
+import asyncpg
+from sqlalchemy import select, text
+from shared.config import DATABASE_URL
+from shared.db.database import engine, async_session
+from shared.db.migrate import migrate
+from shared.db.models import Robot, TELEMETRY_PARTITIONED
+from shared.db.partitions import ensure_partitions
+from shared.db.raw import asyncpg_dsn
 
 ROBOT_MODELS = ["AGV-X100", "AGV-X200", "AGV-X300", "ARM-A1", "ARM-A2"]
 LOCATIONS = [
@@ -21,62 +47,261 @@ ALERT_TYPES = [
 ]
 
 
-async def seed():
-    await create_tables()
+class SeedProfile(NamedTuple):
+    robots: int
+    points_per_robot: int
+    # Each robot gets between half of this and this many alerts
+    alerts_per_robot: int
+    # Telemetry is spread evenly over the last span_minutes, alerts at
+    # random over the last alert_span_minutes
+    span_minutes: int
+    alert_span_minutes: int
+
+
+PROFILES = {
+    # The original fixed seed: 100 minutes of telemetry, alerts over a day
+    "small": SeedProfile(
+        robots=15, points_per_robot=100, alerts_per_robot=10,
+        span_minutes=100, alert_span_minutes=1440,
+    ),
+    "medium": SeedProfile(
+        robots=1000, points_per_robot=1000, alerts_per_robot=20,
+        span_minutes=1440, alert_span_minutes=1440,
+    ),
+    "large": SeedProfile(
+        robots=10000, points_per_robot=10000, alerts_per_robot=50,
+        span_minutes=10080, alert_span_minutes=10080,
+    ),
+}
+# "custom" takes every field from the command line; unset ones fall back to this
+CUSTOM_DEFAULTS = SeedProfile(
+    robots=15, points_per_robot=100, alerts_per_robot=10,
+    span_minutes=1440, alert_span_minutes=1440,
+)
+
+# Target rows generated per worker task; bounds the size of one COPY
+CHUNK_ROWS = 500_000
+
+TELEMETRY_COLUMNS = ["robot_id", "battery_level", "cpu_usage", "temperature", "timestamp"]
+ALERT_COLUMNS = ["robot_id", "severity", "message", "created_at"]
+
+
+def robot_id(index: int) -> str:
+    return f"robot-{index:03d}"
+
+
+def robot_name(index: int) -> str:
+    return f"AGV-{chr(64 + index)}" if index <= 26 else f"AGV-{index:05d}"
 
-    async with async_session() as session:
-        existing = await session.execute(select(Robot).limit(1))
-        if existing.scalar_one_or_none():
-            print("Seed data already exists, skipping.")
-            return
 
-        now = datetime.utcnow()
+def _chunk_rng(seed: int, salt: int, first_robot: int) -> random.Random:
+    # Depends only on the chunk's robots, not on which worker runs it
+    return random.Random(seed * 1_000_003 + salt * 7919 + first_robot)
 
-        # 15 robots
-        robots = []
-        for i in range(1, 16):
-            robot = Robot(
-                id=f"robot-{i:03d}",
-                name=f"AGV-{chr(64 + i)}",
-                model=random.choice(ROBOT_MODELS),
-                location=random.choice(LOCATIONS),
-                status="active" if i <= 13 else "maintenance",
+
+def _telemetry_chunk(args: Tuple[int, int, int, int, datetime, float]) -> bytes:
+    """Render telemetry rows for robots [first, last] in COPY text format."""
+    seed, first, last, points, start, step_seconds = args
+    rng = _chunk_rng(seed, 1, first)
+    uniform = rng.uniform
+    timestamps = [
+        (start + timedelta(seconds=step_seconds * j)).isoformat(sep=" ") for j in range(points)
+    ]
+    out = io.StringIO()
+    write = out.write
+    for index in range(first, last + 1):
+        rid = robot_id(index)
+        for ts in timestamps:
+            write(
+                f"{rid}\t{uniform(10.0, 100.0):.1f}\t{uniform(5.0, 95.0):.1f}"
+                f"\t{uniform(25.0, 75.0):.1f}\t{ts}\n"
             )
-            robots.append(robot)
-        session.add_all(robots)
-        await session.flush()
-
-        # telemetry: 100 records per robot (last 100 minutes)
-        telemetry_records = []
-        for robot in robots:
-            for j in range(100):
-                ts = now - timedelta(minutes=100 - j)
-                telemetry_records.append(TelemetryData(
-                    robot_id=robot.id,
-                    battery_level=round(random.uniform(10.0, 100.0), 1),
-                    cpu_usage=round(random.uniform(5.0, 95.0), 1),
-                    temperature=round(random.uniform(25.0, 75.0), 1),
-                    timestamp=ts,
-                ))
-        session.add_all(telemetry_records)
-
-        # alerts: 5-10 per robot, some critical
-        alert_records = []
-        for robot in robots:
-            num_alerts = random.randint(5, 10)
-            for j in range(num_alerts):
-                severity, message = random.choice(ALERT_TYPES)
-                alert_records.append(Alert(
-                    robot_id=robot.id,
-                    severity=severity,
-                    message=f"{message} on {robot.name}",
-                    created_at=now - timedelta(minutes=random.randint(1, 1440)),
-                ))
-        session.add_all(alert_records)
-
-        await session.commit()
-        print(f"Seeded: {len(robots)} robots, {len(telemetry_records)} telemetry, {len(alert_records)} alerts")
+    return out.getvalue().encode()
+
+
+def _alert_chunk(args: Tuple[int, int, int, int, datetime, int]) -> bytes:
+    """Render alert rows for robots [first, last] in COPY text format."""
+    seed, first, last, alerts, end, span_minutes = args
+    rng = _chunk_rng(seed, 2, first)
+    out = io.StringIO()
+    for index in range(first, last + 1):
+        name = robot_name(index)
+        for _ in range(rng.randint(max(1, alerts // 2), alerts)):
+            severity, message = rng.choice(ALERT_TYPES)
+            created_at = end - timedelta(minutes=rng.randint(1, span_minutes))
+            out.write(
+                f"{robot_id(index)}\t{severity}\t{message} on {name}"
+                f"\t{created_at.isoformat(sep=' ')}\n"
+            )
+    return out.getvalue().encode()
+
+
+def _robot_chunks(robots: int, rows_per_robot: int) -> List[Tuple[int, int]]:
+    per_chunk = max(1, CHUNK_ROWS // max(1, rows_per_robot))
+    return [
+        (first, min(first + per_chunk - 1, robots))
+        for first in range(1, robots + 1, per_chunk)
+    ]
+
+
+async def _copy_chunks(
+    pool: asyncpg.Pool,
+    executor: ProcessPoolExecutor,
+    render: Callable[[tuple], bytes],
+    tasks: List[tuple],
+    table: str,
+    columns: List[str],
+    workers: int,
+) -> Tuple[int, float]:
+    """
+    Render chunks in worker processes and COPY each one as it arrives.
+
+    At most 2 x workers rendered chunks wait for COPY at a time, so memory
+    stays bounded however large the profile is.
+
+    Returns:
+        (rows loaded, elapsed seconds)
+    """
+    loop = asyncio.get_running_loop()
+    in_flight = asyncio.Semaphore(workers * 2)
+    started = time.perf_counter()
+
+    async def load(task: tuple) -> int:
+        async with in_flight:
+            data = await loop.run_in_executor(executor, render, task)
+            async with pool.acquire() as conn:
+                status = await conn.copy_to_table(
+                    table, source=io.BytesIO(data), columns=columns, format="text"
+                )
+        return int(status.split()[-1])
+
+    rows = sum(await asyncio.gather(*(load(task) for task in tasks)))
+    return rows, time.perf_counter() - started
+
+
+def _report(label: str, rows: int, seconds: float) -> None:
+    rate = rows / max(seconds, 1e-9)
+    print(f"  {label:<10} {rows:>12,} rows  {seconds:8.1f}s  {rate:>12,.0f} rows/s")
+
+
+async def seed(
+    profile: SeedProfile = PROFILES["small"],
+    workers: int = os.cpu_count() or 1,
+    rng_seed: int = 42,
+    reset: bool = False,
+):
+    await migrate()
+
+    pool = await asyncpg.create_pool(asyncpg_dsn(DATABASE_URL), min_size=1, max_size=workers)
+    try:
+        if reset:
+            await pool.execute(
+                "TRUNCATE robot_latest_state, alerts, telemetry_data, robots RESTART IDENTITY"
+            )
+        else:
+            async with async_session() as session:
+                existing = await session.execute(select(Robot.id).limit(1))
+                if existing.scalar_one_or_none():
+                    print("Seed data already exists, skipping (use --reset to replace it).")
+                    return
+
+        print(
+            f"Seeding {profile.robots:,} robots x {profile.points_per_robot:,} points, "
+            f"over {profile.span_minutes} minutes, up to {profile.alerts_per_robot} alerts each "
+            f"over {profile.alert_span_minutes} minutes, with {workers} workers"
+        )
+        total_started = time.perf_counter()
+        now = datetime.utcnow().replace(microsecond=0)
+        span = timedelta(minutes=profile.span_minutes)
+
+        rng = random.Random(rng_seed)
+        maintenance_from = profile.robots - max(1, profile.robots * 2 // 15)
+        robots = [
+            (
+                robot_id(i),
+                robot_name(i),
+                rng.choice(ROBOT_MODELS),
+                rng.choice(LOCATIONS),
+                "active" if i <= maintenance_from else "maintenance",
+            )
+            for i in range(1, profile.robots + 1)
+        ]
+        started = time.perf_counter()
+        await pool.copy_records_to_table(
+            "robots", records=robots, columns=["id", "name", "model", "location", "status"]
+        )
+        _report("robots", len(robots), time.perf_counter() - started)
+
+        if TELEMETRY_PARTITIONED:
+            async with engine.begin() as conn:
+                # Rows parked in the default partition are moved into the new ones
+                await conn.execute(text("SET LOCAL statement_timeout = 0"))
+                await ensure_partitions(conn, now - span, now)
+
+        step_seconds = span.total_seconds() / max(1, profile.points_per_robot)
+        telemetry_tasks = [
+            (rng_seed, first, last, profile.points_per_robot, now - span, step_seconds)
+            for first, last in _robot_chunks(profile.robots, profile.points_per_robot)
+        ]
+        alert_tasks = [
+            (rng_seed, first, last, profile.alerts_per_robot, now, profile.alert_span_minutes)
+            for first, last in _robot_chunks(profile.robots, profile.alerts_per_robot)
+        ]
+
+        # spawn: children must not inherit the event loop or open connections
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            telemetry_rows, seconds = await _copy_chunks(
+                pool, executor, _telemetry_chunk, telemetry_tasks,
+                "telemetry_data", TELEMETRY_COLUMNS, workers,
+            )
+            _report("telemetry", telemetry_rows, seconds)
+            alert_rows, seconds = await _copy_chunks(
+                pool, executor, _alert_chunk, alert_tasks, "alerts", ALERT_COLUMNS, workers,
+            )
+            _report("alerts", alert_rows, seconds)
+
+        total = len(robots) + telemetry_rows + alert_rows
+        _report("total", total, time.perf_counter() - total_started)
+        print(f"Seeded: {len(robots)} robots, {telemetry_rows} telemetry, {alert_rows} alerts")
+    finally:
+        await pool.close()
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--profile",
+        choices=[*PROFILES, "custom"],
+        default=os.getenv("SEED_PROFILE", "small"),
+    )
+    parser.add_argument("--robots", type=int, help="Override the profile's robot count")
+    parser.add_argument("--points", type=int, help="Override telemetry points per robot")
+    parser.add_argument("--alerts", type=int, help="Override the maximum alerts per robot")
+    parser.add_argument(
+        "--span-minutes", type=int, help="Override the time span covered by telemetry"
+    )
+    parser.add_argument(
+        "--alert-span-minutes", type=int, help="Override the time span covered by alerts"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42, help="RNG seed; same seed, same data")
+    parser.add_argument("--reset", action="store_true", help="Truncate existing data first")
+    args = parser.parse_args()
+
+    profile = PROFILES.get(args.profile, CUSTOM_DEFAULTS)
+    overrides = {
+        "robots": args.robots,
+        "points_per_robot": args.points,
+        "alerts_per_robot": args.alerts,
+        "span_minutes": args.span_minutes,
+        "alert_span_minutes": args.alert_span_minutes,
+    }
+    profile = profile._replace(**{k: v for k, v in overrides.items() if v is not None})
+    asyncio.run(seed(profile, max(1, args.workers), args.seed, args.reset))
 
 
 if __name__ == "__main__":
-    asyncio.run(seed())
+    main()
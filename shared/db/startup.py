@@ -0,0 +1,113 @@
+"""Service startup: schema check or creation, pool warmup and timing."""
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.config import DB_POOL_WARMUP, DB_STARTUP_MODE
+from shared.db.database import (
+    async_session,
+    create_tables,
+    read_replicas,
+    start_replica_lag_monitor,
+)
+from shared.db.migrate import verify_schema
+
+logger = logging.getLogger(__name__)
+
+# Robot id used by priming lookups; it never exists, so priming reads no rows
+WARMUP_ROBOT_ID = "__warmup__"
+
+PrimeFn = Callable[[AsyncSession], Awaitable[object]]
+
+
+def _process_age() -> Optional[float]:
+    # Seconds since this process started, from /proc where available
+    try:
+        with open("/proc/self/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Process start on the monotonic clock; falls back to this module's import time
+BOOT_STARTED = time.monotonic() - (_process_age() or 0.0)
+
+# Filled in during startup and served on /health
+startup_report: Dict[str, object] = {}
+_lifespan_started: Optional[float] = None
+
+
+async def warm_pool(connections: int, prime: Sequence[PrimeFn] = ()) -> int:
+    """
+    Open connections up front and prime them with the hot statements.
+
+    Each engine (primary and every read replica) gets ``connections``
+    concurrent sessions, so each session holds its own connection. Every
+    session runs each ``prime`` callable, which leaves the statements
+    compiled and prepared on that connection.
+
+    Returns:
+        Number of sessions that warmed up without error
+    """
+    if connections <= 0:
+        return 0
+
+    async def open_one(session_factory) -> bool:
+        try:
+            async with session_factory() as session:
+                await session.connection()
+                for fn in prime:
+                    await fn(session)
+            return True
+        except Exception:
+            logger.warning("Connection warmup failed", exc_info=True)
+            return False
+
+    factories = [async_session] + [replica.session for replica in read_replicas]
+    results = await asyncio.gather(
+        *(open_one(factory) for factory in factories for _ in range(connections))
+    )
+    return sum(results)
+
+
+async def prepare_database(prime: Sequence[PrimeFn] = ()) -> None:
+    """
+    Create or verify the schema per DB_STARTUP_MODE, warm the pools and
+    start the replica lag monitor.
+
+    Raises:
+        RuntimeError: In verify mode, if the schema version does not match
+    """
+    global _lifespan_started
+    started = _lifespan_started = time.monotonic()
+    if DB_STARTUP_MODE == "verify":
+        await verify_schema()
+    else:
+        await create_tables()
+    schema_done = time.monotonic()
+    warmed = await warm_pool(DB_POOL_WARMUP, prime)
+    await start_replica_lag_monitor()
+
+    startup_report.update(
+        schema_mode=DB_STARTUP_MODE,
+        schema_seconds=round(schema_done - started, 4),
+        warm_connections=warmed,
+        warmup_seconds=round(time.monotonic() - schema_done, 4),
+    )
+
+
+def mark_ready() -> None:
+    """Record total startup time once the service is about to accept requests."""
+    ready = time.monotonic()
+    started = _lifespan_started if _lifespan_started is not None else ready
+    startup_report.update(
+        startup_seconds=round(ready - started, 4),
+        time_to_ready_seconds=round(ready - BOOT_STARTED, 4),
+    )
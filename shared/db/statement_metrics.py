@@ -0,0 +1,212 @@
+"""Per-statement DB metrics keyed by normalized query fingerprint."""
+import hashlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from shared.config import DB_EXPLAIN_SLOW_QUERIES, DB_SLOW_QUERY_SECONDS, SERVICE_NAME
+
+logger = logging.getLogger(__name__)
+
+STATEMENT_DURATION = Histogram(
+    "db_statement_duration_seconds",
+    "Statement execution time by query fingerprint",
+    ["service", "fingerprint"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+STATEMENT_ROWS = Histogram(
+    "db_statement_rows",
+    "Rows returned or affected per statement by query fingerprint",
+    ["service", "fingerprint"],
+    buckets=(0, 1, 10, 100, 1000, 10000, 100000),
+)
+STATEMENT_CALLS = Counter(
+    "db_statement_calls_total",
+    "Statements executed by query fingerprint",
+    ["service", "fingerprint"],
+)
+STATEMENT_INFO = Gauge(
+    "db_statement_info",
+    "Normalized statement text for each fingerprint (always 1)",
+    ["service", "fingerprint", "statement"],
+)
+REQUEST_STATEMENTS = Histogram(
+    "db_request_statements",
+    "Statements of one fingerprint issued while serving one request",
+    ["service", "endpoint", "fingerprint"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 500),
+)
+REQUEST_STATEMENT_SECONDS = Histogram(
+    "db_request_statement_seconds",
+    "Time spent in statements of one fingerprint while serving one request",
+    ["service", "endpoint", "fingerprint"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+STATEMENT_INFO_MAX_LENGTH = 500
+
+# Execution options for housekeeping statements left out of the metrics
+NO_STATEMENT_METRICS = {"statement_metrics": False}
+
+_NORMALIZE = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\$\d+|%\(\w+\)s|%s"), "?"),
+    (re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?\b"), "?"),
+    # Expanded IN lists differ only in length, so they share a fingerprint
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+
+# statement -> (fingerprint, normalized); statements are compiled-cache
+# strings, so the set of distinct keys stays small
+_fingerprints: Dict[str, tuple] = {}
+_explained: set = set()
+
+# Per-request fingerprint -> [calls, seconds], set by StatementStatsMiddleware
+_request_stats: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar(
+    "db_request_stats", default=None
+)
+
+
+def fingerprint(statement: str) -> tuple:
+    """
+    Normalize a statement and hash it.
+
+    Literals and bound parameters become ``?`` and IN lists collapse to
+    ``(...)``, so statements differing only in values share a fingerprint.
+
+    Returns:
+        (12-character fingerprint, normalized statement)
+    """
+    cached = _fingerprints.get(statement)
+    if cached is None:
+        normalized = statement
+        for pattern, replacement in _NORMALIZE:
+            normalized = pattern.sub(replacement, normalized)
+        normalized = normalized.strip()
+        digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+        cached = _fingerprints[statement] = (digest, normalized)
+        STATEMENT_INFO.labels(
+            SERVICE_NAME, digest, normalized[:STATEMENT_INFO_MAX_LENGTH]
+        ).set(1)
+    return cached
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    # A raw DBAPI cursor keeps the plan query out of the event hooks
+    explain_cursor = conn.connection.cursor()
+    try:
+        explain_cursor.execute(f"EXPLAIN {statement}", parameters)
+        return "\n".join(str(row[0]) for row in explain_cursor.fetchall())
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        explain_cursor.close()
+
+
+def _log_slow(conn, statement, parameters, context, digest, elapsed) -> None:
+    logger.warning(
+        "slow query %.3fs fingerprint=%s statement=%s parameters=%.200r",
+        elapsed, digest, statement, parameters,
+    )
+    if (
+        DB_EXPLAIN_SLOW_QUERIES
+        and digest not in _explained
+        and not context.executemany
+        and not context.execution_options.get("stream_results")
+        and statement.lstrip()[:6].upper() in ("SELECT", "WITH")
+    ):
+        _explained.add(digest)
+        logger.warning("plan for fingerprint=%s\n%s", digest, _explain(conn, statement, parameters))
+
+
+def _record(statement: str, elapsed: float, rowcount: int = -1) -> str:
+    """Record one statement's metrics and return its fingerprint."""
+    digest, _ = fingerprint(statement)
+
+    STATEMENT_CALLS.labels(SERVICE_NAME, digest).inc()
+    STATEMENT_DURATION.labels(SERVICE_NAME, digest).observe(elapsed)
+    if rowcount >= 0:
+        STATEMENT_ROWS.labels(SERVICE_NAME, digest).observe(rowcount)
+
+    stats = _request_stats.get()
+    if stats is not None:
+        entry = stats.setdefault(digest, [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+    return digest
+
+
+def instrument_statements(engine: AsyncEngine) -> None:
+    """Record per-fingerprint metrics for every statement the engine runs."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._statement_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not context.execution_options.get("statement_metrics", True):
+            return
+        elapsed = time.perf_counter() - context._statement_started
+        rowcount = cursor.rowcount if cursor.rowcount is not None else -1
+        digest = _record(statement, elapsed, rowcount)
+
+        if DB_SLOW_QUERY_SECONDS > 0 and elapsed >= DB_SLOW_QUERY_SECONDS:
+            _log_slow(conn, statement, parameters, context, digest, elapsed)
+
+
+def _record_raw_query(record) -> None:
+    digest = _record(record.query, record.elapsed)
+    if DB_SLOW_QUERY_SECONDS > 0 and record.elapsed >= DB_SLOW_QUERY_SECONDS:
+        logger.warning(
+            "slow query %.3fs fingerprint=%s statement=%s parameters=%.200r",
+            record.elapsed, digest, record.query, record.args,
+        )
+
+
+def instrument_raw_connection(conn) -> None:
+    """
+    Record per-fingerprint metrics for statements on a raw asyncpg connection.
+
+    asyncpg reports no row counts, and slow statements are logged without
+    a plan.
+    """
+    conn.add_query_logger(_record_raw_query)
+
+
+class StatementStatsMiddleware:
+    """
+    ASGI middleware attributing statements to the endpoint that issued them.
+
+    Observes, per request and fingerprint, how many statements ran and how
+    long they took, labelled with the matched route path. NDJSON bodies are
+    streamed inside the call, so their statements are included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats: Dict[str, List[float]] = {}
+        token = _request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_stats.reset(token)
+            route = scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            for digest, (calls, seconds) in stats.items():
+                REQUEST_STATEMENTS.labels(SERVICE_NAME, endpoint, digest).observe(calls)
+                REQUEST_STATEMENT_SECONDS.labels(SERVICE_NAME, endpoint, digest).observe(seconds)
@@ -0,0 +1,34 @@
+"""
+ETag construction and If-None-Match matching.
+
+Kept free of the JSON encoder so the gateways can check validators without
+pulling in orjson.
+"""
+import hashlib
+from typing import Any, Optional
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag from a hash of the encoded body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def version_etag(*parts: Any) -> str:
+    """
+    Strong ETag from the parts that identify a version, without encoding the body.
+
+    The parts must change whenever the body does; e.g. a timestamp alone is
+    not enough when two versions can share it.
+    """
+    raw = "|".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check; uses weak comparison, as RFC 9110 requires for it."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
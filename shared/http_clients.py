@@ -0,0 +1,462 @@
+"""
+Process-wide pooled HTTP clients for calls between services.
+
+Each upstream gets one httpx.AsyncClient, created in the app's lifespan
+and reused by every resolver, loader and orchestration call, so requests
+share keep-alive connections instead of paying a TCP handshake each.
+Pool occupancy, connections opened and request latency are exported per
+upstream.
+
+Every request carries the remaining request deadline (shared.resilience)
+and is cut off when it runs out, and goes through the upstream's circuit
+breaker. Idempotent GETs made with hedged_get() can be hedged, and
+revalidated_json() turns repeat reads of an unchanged resource into 304s.
+"""
+import asyncio
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import httpx
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+
+from shared.config import (
+    HTTP_CLIENT_BREAKER_FAILURES,
+    HTTP_CLIENT_BREAKER_RESET,
+    HTTP_CLIENT_HEDGE,
+    HTTP_CLIENT_HEDGE_MIN_DELAY,
+    HTTP_CLIENT_HEDGE_MIN_SAMPLES,
+    HTTP_CLIENT_HEDGE_QUANTILE,
+    HTTP_CLIENT_HEDGE_WINDOW,
+    HTTP_CLIENT_HTTP2,
+    HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    HTTP_CLIENT_MAX_CONNECTIONS,
+    HTTP_CLIENT_MAX_KEEPALIVE,
+    HTTP_CLIENT_REVALIDATE_MAX_ENTRIES,
+    HTTP_CLIENT_TIMEOUT,
+    HTTP_CLIENT_UPSTREAM_LIMITS,
+)
+from shared.resilience import DEADLINE_HEADER, remaining
+
+HTTP_CLIENT_CONNECTIONS_OPENED = Counter(
+    "http_client_connections_opened_total",
+    "TCP connections opened to an upstream",
+    ["upstream"],
+)
+HTTP_CLIENT_REQUEST_DURATION = Histogram(
+    "http_client_request_duration_seconds",
+    "Time from sending a request to receiving the response headers",
+    ["upstream"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+HTTP_CLIENT_HEDGES = Counter(
+    "http_client_hedges_total",
+    "Hedged GETs by which copy answered first (primary or hedge), or failed if neither did",
+    ["upstream", "winner"],
+)
+
+HTTP_CLIENT_REVALIDATIONS = Counter(
+    "http_client_revalidations_total",
+    "Conditional GETs by result: not_modified (kept body reused) or modified",
+    ["upstream", "result"],
+)
+HTTP_CLIENT_CIRCUIT_REJECTIONS = Counter(
+    "http_client_circuit_rejections_total",
+    "Requests failed fast because the upstream's circuit breaker was open",
+    ["upstream"],
+)
+
+# Seconds an upstream's hedge delay is reused before it is recomputed
+HEDGE_DELAY_REFRESH = 1.0
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """The request's deadline passed before the call could be made."""
+
+
+class CircuitOpenError(httpx.TransportError):
+    """The upstream's circuit breaker is open; the call was not attempted."""
+
+
+# The httpx timeout phase each timeout exception reports
+TIMEOUT_PHASES = (
+    (httpx.ConnectTimeout, "connect"),
+    (httpx.ReadTimeout, "read"),
+    (httpx.WriteTimeout, "write"),
+    (httpx.PoolTimeout, "pool"),
+)
+
+
+def _timeout_phase(exc: httpx.TimeoutException) -> Optional[str]:
+    for exc_type, phase in TIMEOUT_PHASES:
+        if isinstance(exc, exc_type):
+            return phase
+    return None
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    Closed: calls pass. After ``failure_threshold`` consecutive failures it
+    opens and rejects calls for ``reset_timeout`` seconds, then half-opens
+    and lets a single trial call through; its outcome closes or re-opens it.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, upstream: str, failure_threshold: int, reset_timeout: float):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may be made now; counts the rejection when not."""
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        HTTP_CLIENT_CIRCUIT_REJECTIONS.labels(self.upstream).inc()
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._trial_in_flight = False
+        self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Forget an allowed call that ended without an outcome (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+
+class _ResilientTransport(httpx.AsyncHTTPTransport):
+    """
+    Pooled transport applying the request deadline and the upstream's breaker.
+
+    A timeout only counts against the breaker when the configured timeout
+    expired. When the deadline had cut that phase's timeout short, the
+    caller's budget ran out rather than the upstream failing, and it is
+    raised as DeadlineExceeded without an outcome for the breaker.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, **kwargs):
+        super().__init__(**kwargs)
+        self.breaker = breaker
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        left = remaining()
+        capped = set()
+        if left is not None:
+            if left <= 0:
+                raise DeadlineExceeded("Request deadline exceeded", request=request)
+            request.headers[DEADLINE_HEADER] = str(int(left * 1000))
+            timeouts = request.extensions.get("timeout", {})
+            capped = {
+                phase for phase, limit in timeouts.items() if limit is None or left < limit
+            }
+            request.extensions["timeout"] = {
+                phase: left if phase in capped else limit for phase, limit in timeouts.items()
+            }
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"Circuit open for upstream '{self.breaker.upstream}'", request=request
+            )
+
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TimeoutException as e:
+            if _timeout_phase(e) in capped:
+                self.breaker.release()
+                raise DeadlineExceeded("Request deadline exceeded", request=request) from e
+            self.breaker.record_failure()
+            raise
+        except httpx.TransportError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
+
+
+class HttpClientRegistry:
+    """
+    One pooled AsyncClient per named upstream.
+
+    register() is called from the lifespan before the app serves traffic
+    and aclose() on shutdown; get() is used everywhere else.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._limits: Dict[str, int] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+        # upstream -> (hedge delay, time.monotonic() it was computed)
+        self._hedge_delays: Dict[str, Tuple[float, float]] = {}
+        # (upstream, url, query) -> (ETag, parsed body), least recently used first
+        self._validated: "OrderedDict[Tuple, Tuple[str, Any]]" = OrderedDict()
+
+    def register(
+        self,
+        name: str,
+        base_url: str,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.AsyncClient:
+        """
+        Create the pooled client for an upstream.
+
+        Args:
+            name: Upstream name, used by get() and as the metrics label
+            base_url: Prefix for the relative URLs requested through the client
+            max_connections: Pool size; defaults to HTTP_CLIENT_UPSTREAM_LIMITS
+                for this name, then HTTP_CLIENT_MAX_CONNECTIONS
+            timeout: Per-request timeout in seconds (default HTTP_CLIENT_TIMEOUT)
+
+        Returns:
+            The registered client
+
+        Raises:
+            RuntimeError: If HTTP/2 is enabled but the h2 package is missing
+        """
+        if max_connections is None:
+            max_connections = HTTP_CLIENT_UPSTREAM_LIMITS.get(name, HTTP_CLIENT_MAX_CONNECTIONS)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(HTTP_CLIENT_MAX_KEEPALIVE, max_connections),
+            keepalive_expiry=HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        )
+        trace = _connection_trace(name)
+        breaker = CircuitBreaker(name, HTTP_CLIENT_BREAKER_FAILURES, HTTP_CLIENT_BREAKER_RESET)
+        latencies: Deque[float] = deque(maxlen=HTTP_CLIENT_HEDGE_WINDOW)
+
+        async def on_request(request: httpx.Request) -> None:
+            request.extensions["trace"] = trace
+            request.extensions["started_at"] = time.perf_counter()
+
+        async def on_response(response: httpx.Response) -> None:
+            started_at = response.request.extensions.get("started_at")
+            if started_at is not None:
+                elapsed = time.perf_counter() - started_at
+                HTTP_CLIENT_REQUEST_DURATION.labels(name).observe(elapsed)
+                if HTTP_CLIENT_HEDGE and response.status_code < 500:
+                    latencies.append(elapsed)
+
+        try:
+            client = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=HTTP_CLIENT_TIMEOUT if timeout is None else timeout,
+                transport=_ResilientTransport(breaker, limits=limits, http2=HTTP_CLIENT_HTTP2),
+                event_hooks={"request": [on_request], "response": [on_response]},
+            )
+        except ImportError as e:
+            raise RuntimeError("HTTP_CLIENT_HTTP2 requires the h2 package") from e
+
+        self._clients[name] = client
+        self._limits[name] = max_connections
+        self._breakers[name] = breaker
+        self._latencies[name] = latencies
+        return client
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Return the pooled client for an upstream.
+
+        Raises:
+            RuntimeError: If the upstream was not registered (lifespan not run)
+        """
+        try:
+            return self._clients[name]
+        except KeyError:
+            raise RuntimeError(f"HTTP client '{name}' not initialized") from None
+
+    async def hedged_get(self, name: str, url: str, **kwargs) -> httpx.Response:
+        """
+        GET through an upstream's pooled client, hedging slow requests.
+
+        With HTTP_CLIENT_HEDGE on, once the upstream has enough latency
+        samples, a second identical GET is sent if the first has not
+        answered within HTTP_CLIENT_HEDGE_QUANTILE of recent latencies. The
+        first successful response is returned and the other request
+        cancelled. Only use this for idempotent requests.
+
+        Args:
+            name: Upstream name
+            url: URL relative to the upstream's base URL
+            **kwargs: Passed to AsyncClient.get (params, headers, ...)
+
+        Returns:
+            The upstream response
+
+        Raises:
+            httpx.RequestError: If every request sent failed
+        """
+        client = self.get(name)
+        delay = self._hedge_delay(name)
+        if delay is None:
+            return await client.get(url, **kwargs)
+
+        primary = asyncio.ensure_future(client.get(url, **kwargs))
+        pending = {primary}
+        hedge = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            left = remaining()
+            breaker_closed = self._breakers[name].state == CircuitBreaker.CLOSED
+            if not done and breaker_closed and (left is None or left > 0):
+                hedge = asyncio.ensure_future(client.get(url, **kwargs))
+                pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = succeeded[0]
+                    if hedge is not None:
+                        HTTP_CLIENT_HEDGES.labels(
+                            name, "hedge" if winner is hedge else "primary"
+                        ).inc()
+                    return winner.result()
+            if hedge is not None:
+                HTTP_CLIENT_HEDGES.labels(name, "failed").inc()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def revalidated_json(
+        self, name: str, url: str, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        GET and parse a JSON resource, revalidating the last copy seen.
+
+        The upstream's ETag and parsed body are kept per URL and query, up
+        to HTTP_CLIENT_REVALIDATE_MAX_ENTRIES. Later calls send
+        If-None-Match, and a 304 answer returns the kept body without
+        transferring or parsing it again. The returned data is shared
+        between callers and must be treated as read-only.
+
+        Args:
+            name: Upstream name
+            url: URL relative to the upstream's base URL
+            params: Query parameters
+
+        Returns:
+            The parsed JSON body
+
+        Raises:
+            httpx.HTTPStatusError: If the upstream answers with an error status
+        """
+        key = (name, url, tuple(sorted(httpx.QueryParams(params or {}).multi_items())))
+        kept = self._validated.get(key)
+        headers = {"If-None-Match": kept[0]} if kept is not None else {}
+        response = await self.hedged_get(name, url, params=params, headers=headers)
+        if response.status_code == 304 and kept is not None:
+            HTTP_CLIENT_REVALIDATIONS.labels(name, "not_modified").inc()
+            self._validated.move_to_end(key)
+            return kept[1]
+        response.raise_for_status()
+        data = response.json()
+        if kept is not None:
+            HTTP_CLIENT_REVALIDATIONS.labels(name, "modified").inc()
+        etag = response.headers.get("etag")
+        if etag is not None and HTTP_CLIENT_REVALIDATE_MAX_ENTRIES > 0:
+            self._validated[key] = (etag, data)
+            self._validated.move_to_end(key)
+            while len(self._validated) > HTTP_CLIENT_REVALIDATE_MAX_ENTRIES:
+                self._validated.popitem(last=False)
+        else:
+            self._validated.pop(key, None)
+        return data
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        """The upstream's hedge delay, or None when its GETs are not hedged."""
+        latencies = self._latencies.get(name)
+        if not HTTP_CLIENT_HEDGE or latencies is None:
+            return None
+        if len(latencies) < HTTP_CLIENT_HEDGE_MIN_SAMPLES:
+            return None
+        # Sorting the window is kept off the per-call path
+        now = time.monotonic()
+        delay, computed_at = self._hedge_delays.get(name, (0.0, -HEDGE_DELAY_REFRESH))
+        if now - computed_at >= HEDGE_DELAY_REFRESH:
+            ordered = sorted(latencies)
+            quantile = ordered[int(HTTP_CLIENT_HEDGE_QUANTILE * (len(ordered) - 1))]
+            delay = max(quantile, HTTP_CLIENT_HEDGE_MIN_DELAY)
+            self._hedge_delays[name] = (delay, now)
+        return delay
+
+    async def aclose(self) -> None:
+        """Close every client and its pooled connections."""
+        clients, self._clients = self._clients, {}
+        self._limits = {}
+        self._breakers = {}
+        self._latencies = {}
+        self._hedge_delays = {}
+        self._validated.clear()
+        for client in clients.values():
+            await client.aclose()
+
+    def collect(self):
+        connections = GaugeMetricFamily(
+            "http_client_pool_connections",
+            "Pooled connections per upstream by state (active or idle)",
+            labels=["upstream", "state"],
+        )
+        limit = GaugeMetricFamily(
+            "http_client_pool_max_connections",
+            "Configured connection limit per upstream",
+            labels=["upstream"],
+        )
+        circuit = GaugeMetricFamily(
+            "http_client_circuit_state",
+            "Circuit breaker state per upstream (1 for the current state)",
+            labels=["upstream", "state"],
+        )
+        for name, breaker in self._breakers.items():
+            for state in (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN):
+                circuit.add_metric([name, state], 1 if breaker.state == state else 0)
+        for name, client in self._clients.items():
+            # httpx keeps its httpcore pool on the private transport attribute
+            pool = getattr(getattr(client, "_transport", None), "_pool", None)
+            if pool is None:
+                continue
+            idle = sum(1 for connection in pool.connections if connection.is_idle())
+            connections.add_metric([name, "active"], len(pool.connections) - idle)
+            connections.add_metric([name, "idle"], idle)
+            limit.add_metric([name], self._limits[name])
+        yield from (connections, limit, circuit)
+
+
+def _connection_trace(name: str):
+    """httpcore trace callback counting TCP connects for one upstream."""
+    opened = HTTP_CLIENT_CONNECTIONS_OPENED.labels(name)
+
+    async def trace(event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            opened.inc()
+
+    return trace
+
+
+http_clients = HttpClientRegistry()
+REGISTRY.register(http_clients)
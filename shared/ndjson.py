@@ -0,0 +1,34 @@
+"""NDJSON streaming responses backed by server-side cursors."""
+from typing import AsyncIterator, Callable, Optional
+
+from fastapi.responses import StreamingResponse
+
+from shared.db.database import read_session
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rows fetched per round trip from a server-side cursor
+STREAM_YIELD_PER = 500
+
+
+def wants_ndjson(accept: Optional[str]) -> bool:
+    """True when the Accept header asks for NDJSON."""
+    return accept is not None and NDJSON_MEDIA_TYPE in accept
+
+
+def ndjson_response(
+    produce: Callable[..., AsyncIterator[bytes]], *args, primary: bool = False
+) -> StreamingResponse:
+    """
+    Stream the lines produced by ``produce(session, *args)``.
+
+    The session is opened inside the body iterator because request-scoped
+    dependencies are closed before a streaming body is sent. Streams are
+    reads, so they may be served by a read replica unless ``primary`` is set.
+    """
+    async def body() -> AsyncIterator[bytes]:
+        async with read_session(primary) as session:
+            async for line in produce(session, *args):
+                yield line
+
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE)
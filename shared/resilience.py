@@ -0,0 +1,122 @@
+"""
+Request deadlines and degraded-response tracking.
+
+A deadline is set once per request, from the X-Request-Deadline-Ms header
+(milliseconds left, set by the caller, capped at REQUEST_DEADLINE_MAX) or
+REQUEST_DEADLINE_DEFAULT at the edge, and is honoured by every hop:
+outbound calls through shared.http_clients carry the remaining budget on
+and time out when it runs out, and Postgres statements are bounded by it
+(see shared.db.database).
+
+Callers that fall back to partial data when an upstream fails (or its
+circuit breaker is open) call mark_degraded(), and the response then
+carries X-Degraded listing the upstreams that were left out.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional, Set
+
+from shared.config import (
+    DB_STATEMENT_TIMEOUT_FROM_DEADLINE,
+    REQUEST_DEADLINE_DEFAULT,
+    REQUEST_DEADLINE_MAX,
+)
+
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+DEGRADED_HEADER = "X-Degraded"
+
+# time.monotonic() at which the current request's budget runs out
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_degraded: ContextVar[Optional[Set[str]]] = ContextVar("degraded_upstreams", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current request's budget, or None without a deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def statement_timeout() -> Optional[float]:
+    """
+    Seconds a database statement may run within the current request's budget.
+
+    Returns:
+        The remaining budget, at least one millisecond, or None without a
+        deadline or when DB_STATEMENT_TIMEOUT_FROM_DEADLINE is off
+    """
+    left = remaining() if DB_STATEMENT_TIMEOUT_FROM_DEADLINE else None
+    return None if left is None else max(left, 0.001)
+
+
+def mark_degraded(upstream: str) -> None:
+    """Record that the current response is missing data from an upstream."""
+    degraded = _degraded.get()
+    if degraded is not None:
+        degraded.add(upstream)
+
+
+class RequestDeadlineMiddleware:
+    """
+    ASGI middleware establishing the request deadline and reporting degradation.
+
+    Requests whose deadline has already passed are answered 504 without
+    reaching the app. Budgets above ``maximum`` are cut down to it, so a
+    client cannot hold resources longer than the service allows.
+    """
+
+    def __init__(
+        self, app, default: float = REQUEST_DEADLINE_DEFAULT, maximum: float = REQUEST_DEADLINE_MAX
+    ):
+        self.app = app
+        self.default = default
+        self.maximum = maximum
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = self.default or None
+        header = DEADLINE_HEADER.lower().encode()
+        for name, value in scope["headers"]:
+            if name == header:
+                try:
+                    budget = int(value) / 1000
+                except ValueError:
+                    pass
+                else:
+                    if self.maximum > 0:
+                        budget = min(budget, self.maximum)
+                break
+
+        if budget is not None and budget <= 0:
+            await send({
+                "type": "http.response.start",
+                "status": 504,
+                "headers": [(b"content-type", b"application/json")],
+            })
+            await send({
+                "type": "http.response.body",
+                "body": b'{"detail":"Request deadline exceeded"}',
+            })
+            return
+
+        degraded: Set[str] = set()
+
+        async def send_with_degraded(message):
+            if message["type"] == "http.response.start" and degraded:
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (DEGRADED_HEADER.lower().encode(), ",".join(sorted(degraded)).encode()),
+                ]
+            await send(message)
+
+        deadline_token = _deadline.set(
+            None if budget is None else time.monotonic() + budget
+        )
+        degraded_token = _degraded.set(degraded)
+        try:
+            await self.app(scope, receive, send_with_degraded)
+        finally:
+            _degraded.reset(degraded_token)
+            _deadline.reset(deadline_token)
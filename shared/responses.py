@@ -0,0 +1,77 @@
+"""Single-pass JSON encoding and conditional GET for service responses."""
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from shared.config import HTTP_CACHE_CONTROL
+from shared.etag import content_etag, etag_matches, version_etag  # noqa: F401
+
+
+def _default(obj: Any) -> Any:
+    # Response models are flat and built with model_construct, so their
+    # __dict__ is exactly the field mapping orjson needs.
+    if isinstance(obj, BaseModel):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content, including response models, with orjson."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dumps_line(content: Any) -> bytes:
+    """Encode content as one NDJSON line."""
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+    )
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response encoded by orjson straight from response models.
+
+    Returning it from an endpoint bypasses FastAPI's response_model
+    validation and jsonable_encoder pass; response_model still documents
+    the schema in OpenAPI.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def conditional_response(
+    request: Request,
+    content: Any,
+    etag: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Answer a GET with 304 when the client's If-None-Match still matches.
+
+    Args:
+        request: The incoming request
+        content: Response body, encoded with orjson when needed
+        etag: Version-derived ETag; when omitted the body is encoded and hashed
+        headers: Extra headers, sent on both 200 and 304
+
+    Returns:
+        304 with no body, or 200 with the encoded content
+    """
+    body = None
+    if etag is None:
+        body = dumps(content)
+        etag = content_etag(body)
+    response_headers = {"ETag": etag, "Cache-Control": HTTP_CACHE_CONTROL, **(headers or {})}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=response_headers)
+    if body is None:
+        return FastJSONResponse(content, headers=response_headers)
+    return Response(body, media_type=FastJSONResponse.media_type, headers=response_headers)
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 
 
 class AlertResponse(BaseModel):
@@ -10,5 +11,15 @@ class AlertResponse(BaseModel):
     created_at: datetime
 
 
+class AlertPage(BaseModel):
+    """One keyset page of alerts; next_cursor is None on the last page."""
+    items: List[AlertResponse]
+    next_cursor: Optional[str] = None
+
+
 class AlertBatchRequest(BaseModel):
     robot_ids: list[str]
+    limit_per_robot: Optional[int] = Field(default=None, ge=1)
+    since: Optional[datetime] = None
+    # Continue after this keyset position in every robot's list
+    cursor: Optional[str] = None
@@ -7,3 +7,7 @@ class RobotResponse(BaseModel):
     model: str
     location: str
     status: str
+
+
+class RobotBatchRequest(BaseModel):
+    robot_ids: list[str]
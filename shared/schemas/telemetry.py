@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Dict, List, Optional
 
 
 class TelemetryResponse(BaseModel):
@@ -12,3 +13,29 @@ class TelemetryResponse(BaseModel):
 
 class TelemetryBatchRequest(BaseModel):
     robot_ids: list[str]
+
+
+class TelemetryIngestRecord(BaseModel):
+    robot_id: str
+    battery_level: float
+    cpu_usage: float
+    temperature: float
+    timestamp: Optional[datetime] = None
+
+
+class TelemetryIngestResponse(BaseModel):
+    accepted: int
+
+
+class TelemetrySeriesResponse(BaseModel):
+    """
+    Downsampled telemetry in column layout.
+
+    values[metric][agg][i] is the aggregate for the bucket starting at
+    timestamps[i]; buckets without data are omitted.
+    """
+    robot_id: str
+    bucket_seconds: int
+    timestamps: List[datetime]
+    counts: List[int]
+    values: Dict[str, Dict[str, List[float]]]
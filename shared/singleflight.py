@@ -0,0 +1,104 @@
+"""
+Single-flight coalescing of identical concurrent calls.
+
+The first caller for a key (the leader) starts the call; callers arriving
+with the same key while it is in flight wait for it and receive the same
+result or exception instead of issuing their own. The key is forgotten as
+soon as the call finishes, so nothing is cached beyond the in-flight window.
+
+Results are shared between callers and must be treated as read-only.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+from shared.config import SINGLE_FLIGHT_MAX_WAITERS
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "Calls by role: leader (made the call), coalesced (shared a leader's call) "
+    "or overflow (made its own call because the waiter cap was reached)",
+    ["group", "role"],
+)
+SINGLE_FLIGHT_IN_FLIGHT = Gauge(
+    "singleflight_in_flight", "Distinct keys with a call in flight", ["group"]
+)
+
+
+def request_key(
+    method: str, path: str, params: Optional[Iterable[Tuple[str, Any]]] = None
+) -> str:
+    """
+    Build a coalescing key from a request.
+
+    Query parameters are sorted and None values dropped, so the same
+    request written with a different parameter order gets the same key.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        params: Query parameters as (name, value) pairs
+
+    Returns:
+        "METHOD path?query"
+    """
+    query = sorted((str(k), str(v)) for k, v in params or () if v is not None)
+    encoded = "&".join(f"{k}={v}" for k, v in query)
+    return f"{method.upper()} {path}?{encoded}"
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one.
+
+    The call runs in its own task, so a caller that is cancelled (e.g. its
+    client disconnected) does not cancel the call for the others waiting on it.
+    """
+
+    def __init__(self, group: str, max_waiters: int = SINGLE_FLIGHT_MAX_WAITERS):
+        self.group = group
+        self.max_waiters = max_waiters
+        self._calls: Dict[Hashable, Tuple[asyncio.Task, int]] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return fn()'s result, sharing an identical call already in flight.
+
+        Args:
+            key: Identifies identical calls, e.g. from request_key()
+            fn: Makes the call; only invoked by the leader
+
+        Returns:
+            The call's result
+
+        Raises:
+            Whatever fn raises, to the leader and every waiter
+        """
+        call = self._calls.get(key)
+        if call is not None:
+            task, waiters = call
+            if waiters < self.max_waiters:
+                self._calls[key] = (task, waiters + 1)
+                SINGLE_FLIGHT_REQUESTS.labels(self.group, "coalesced").inc()
+                return await asyncio.shield(task)
+            SINGLE_FLIGHT_REQUESTS.labels(self.group, "overflow").inc()
+            return await fn()
+
+        task = asyncio.ensure_future(fn())
+        self._calls[key] = (task, 0)
+        SINGLE_FLIGHT_IN_FLIGHT.labels(self.group).inc()
+
+        def forget(_: asyncio.Task) -> None:
+            if self._calls.get(key, (None,))[0] is task:
+                del self._calls[key]
+            SINGLE_FLIGHT_IN_FLIGHT.labels(self.group).dec()
+            # Mark the exception retrieved in case every caller was cancelled
+            if not task.cancelled():
+                task.exception()
+
+        task.add_done_callback(forget)
+        SINGLE_FLIGHT_REQUESTS.labels(self.group, "leader").inc()
+        return await asyncio.shield(task)